@@ -0,0 +1,160 @@
+# bench_sysops_dashboard.py
+# Benchmarks build_sysops_dashboard.py: main() end-to-end, the w()/zip phases at
+# 1x/10x/100x the stock file count plus asset-sized files, and every zipfile
+# compression method/level and zip thread count. Results go to JSON; --baseline fails on regressions.
+#
+#   python bench_sysops_dashboard.py --out bench_baseline.json
+#   python bench_sysops_dashboard.py --baseline bench_baseline.json
+
+import os, io, sys, json, time, base64, random, zipfile, pathlib, tempfile, argparse, statistics, contextlib
+
+import build_sysops_dashboard as gen
+
+COMPRESSORS = (
+    [("stored", zipfile.ZIP_STORED, None)]
+    + [(f"deflated-{lvl}", zipfile.ZIP_DEFLATED, lvl) for lvl in range(1, 10)]
+    + [("lzma", zipfile.ZIP_LZMA, None), ("bzip2", zipfile.ZIP_BZIP2, None)]
+)
+
+@contextlib.contextmanager
+def scaled_registry(scale, assets=0, asset_bytes=0):
+    """Temporarily register scale-1 copies of every template (under bench/xN/) and
+    `assets` large base64 blobs that compress like minified/hashed assets."""
+    saved = dict(gen.TEMPLATES)
+    stock = list(saved.items())
+    for i in range(1, scale):
+        for rel, (source, exec) in stock:
+            gen.template(f"bench/x{i}/{rel}", source, exec=exec)
+    rnd = random.Random(0)
+    for i in range(assets):
+        blob = base64.b64encode(rnd.randbytes(asset_bytes * 3 // 4)).decode("ascii")
+        gen.template(f"bench/assets/asset-{i}.js", blob)
+    try:
+        yield len(gen.TEMPLATES) + 1  # + dist/healthz.json
+    finally:
+        gen.TEMPLATES.clear()
+        gen.TEMPLATES.update(saved)
+
+def timed_main(tmp, repeat, **kwargs):
+    """Run main() `repeat` times; return the median wall/phase timings and zip size."""
+    runs = []
+    for _ in range(repeat):
+        report = tmp / "report.json"
+        t = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            gen.main(root=tmp / "tree", zip_path=tmp / "bundle.zip", reproducible=True,
+                     report_path=report, **kwargs)
+        wall = time.perf_counter() - t
+        r = json.loads(report.read_text(encoding="utf-8"))
+        runs.append((wall, r))
+    phases = {k: statistics.median(r["phases_ms"][k] for _, r in runs) for k in runs[0][1]["phases_ms"]}
+    last = runs[-1][1]["totals"]
+    return {
+        "wall_ms": round(statistics.median(w for w, _ in runs) * 1000, 3),
+        "phases_ms": phases,
+        "write_ms": round(phases["mkdir"] + phases["write"] + phases["chmod"], 3),
+        "zip_ms": phases["zip"],
+        "bytes": last["bytes_emitted"],
+        "zip_bytes": last["zip_bytes"],
+    }
+
+def bench_scales(tmp, scales, repeat):
+    out = {}
+    for scale in scales:
+        with scaled_registry(scale) as files:
+            out[f"{scale}x"] = dict(files=files, **timed_main(tmp, repeat))
+            out[f"{scale}x-zip-only"] = dict(files=files, **timed_main(tmp, repeat, write_tree=False))
+        print(f"  {scale}x: {out[f'{scale}x']['wall_ms']} ms ({files} files)", file=sys.stderr)
+    return out
+
+def bench_assets(tmp, count, size, repeat):
+    with scaled_registry(1, assets=count, asset_bytes=size) as files:
+        r = dict(files=files, asset_bytes=size, **timed_main(tmp, repeat))
+    print(f"  assets {count}x{size // 1024}KiB: {r['wall_ms']} ms", file=sys.stderr)
+    return {f"assets-{count}x{size // 1024}k": r}
+
+def bench_compression(tmp, scale, assets, asset_size, repeat):
+    """Zip the same rendered entries with every method/level; time write_zip() only."""
+    with scaled_registry(scale, assets=assets, asset_bytes=asset_size):
+        values = gen.app_vars()
+        entries = [(rel, gen.render(src, values).encode("utf-8"), exec) for rel, (src, exec) in gen.TEMPLATES.items()]
+    raw = sum(len(e[1]) for e in entries)
+    out = {}
+    for name, method, level in COMPRESSORS:
+        times = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            gen.write_zip(entries, tmp / "c.zip", epoch=gen.ZIP_EPOCH_MIN,
+                          policy=gen.CompressionPolicy(method, level, stored_exts=()))
+            times.append(time.perf_counter() - t)
+        size = (tmp / "c.zip").stat().st_size
+        out[name] = {"zip_ms": round(statistics.median(times) * 1000, 3), "zip_bytes": size, "ratio": round(size / raw, 4)}
+        print(f"  {name}: {out[name]['zip_ms']} ms, {size} B", file=sys.stderr)
+    workers = {}
+    for n in sorted({1, os.cpu_count() or 1}):
+        times = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            gen.write_zip(entries, tmp / "c.zip", epoch=gen.ZIP_EPOCH_MIN, workers=n)
+            times.append(time.perf_counter() - t)
+        workers[f"{n}-threads"] = {"zip_ms": round(statistics.median(times) * 1000, 3)}
+        print(f"  deflated, {n} thread(s): {workers[f'{n}-threads']['zip_ms']} ms", file=sys.stderr)
+    return {"input_bytes": raw, "methods": out, "workers": workers}
+
+def compare(results, baseline, tolerance, slack_ms=2.0):
+    """Return human-readable regressions: timings beyond `tolerance` (and more than
+    `slack_ms` absolute, so sub-millisecond jitter is ignored), any size growth."""
+    bad = []
+    def walk(cur, base, path):
+        for k, b in base.items():
+            c = cur.get(k)
+            if isinstance(b, dict) and isinstance(c, dict):
+                walk(c, b, path + [k])
+            elif isinstance(b, (int, float)) and isinstance(c, (int, float)) and b:
+                name = "/".join(path + [k])
+                if k.endswith("_ms") and c > b * (1 + tolerance) and c - b > slack_ms:
+                    bad.append(f"{name}: {b} -> {c} ms (+{(c / b - 1) * 100:.0f}%)")
+                elif k.endswith("bytes") and c > b:
+                    bad.append(f"{name}: {b} -> {c} bytes")
+    walk(results, baseline, [])
+    return bad
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the SysOps bundle generator.")
+    ap.add_argument("--out", default="bench_results.json", help="where to write results (default: bench_results.json)")
+    ap.add_argument("--baseline", help="compare against this results file and exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed timing slowdown vs baseline (default: 0.25)")
+    ap.add_argument("--slack-ms", type=float, default=2.0, help="ignore timing deltas below this (default: 2.0)")
+    ap.add_argument("--scales", default="1,10,100", help="comma-separated bundle multipliers (default: 1,10,100)")
+    ap.add_argument("--repeat", type=int, default=5, help="runs per case; medians are reported (default: 5)")
+    ap.add_argument("--asset-size", type=int, default=4 << 20, help="bytes per synthetic asset (default: 4 MiB)")
+    ap.add_argument("--assets", type=int, default=4, help="number of synthetic assets (default: 4)")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="sysops-bench-") as d:
+        tmp = pathlib.Path(d)
+        print("end-to-end / phases:", file=sys.stderr)
+        cases = bench_scales(tmp, [int(s) for s in args.scales.split(",")], args.repeat)
+        cases.update(bench_assets(tmp, args.assets, args.asset_size, args.repeat))
+        print("compression:", file=sys.stderr)
+        compression = bench_compression(tmp, 10, 1, args.asset_size, args.repeat)
+    results = {
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "cases": cases,
+        "compression": compression,
+    }
+    pathlib.Path(args.out).write_text(json.dumps(results, indent=1), encoding="utf-8")
+    print(f"✅ results: {args.out}")
+
+    if args.baseline:
+        bad = compare(results, json.loads(pathlib.Path(args.baseline).read_text(encoding="utf-8")), args.tolerance, args.slack_ms)
+        for line in bad:
+            print(f"❌ {line}")
+        if bad:
+            return 1
+        print("✅ no regressions vs baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
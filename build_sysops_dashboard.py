@@ -2,37 +2,976 @@
 # Recreates the full SysOps Dashboard repo + a single ZIP for handoff.
 # Works offline. Outputs: ./sysops-dashboard-fullbundle.zip
 
-import os, zipfile, textwrap, datetime, pathlib, json
+import os, re, gzip, time, zlib, select, shutil, struct, fnmatch, zipfile, posixpath, subprocess, collections, threading, textwrap, datetime, pathlib, json, hashlib, argparse, concurrent.futures
+
+from content_types import content_type
+from stamp_build import git_head, stamp
 
 ROOT = pathlib.Path.cwd() / "sysops-dashboard"
 ZIP_PATH = pathlib.Path.cwd() / "sysops-dashboard-fullbundle.zip"
-
-def w(path, content, exec=False):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
-    if exec:
-        os.chmod(path, 0o755)
-
-def main():
-    if ROOT.exists():
-        # start fresh
-        import shutil
-        shutil.rmtree(ROOT)
-    ROOT.mkdir(parents=True, exist_ok=True)
-
-    # ---------- Top-level ----------
-    w(ROOT / "package.json", textwrap.dedent("""\
+MANIFEST = pathlib.Path.cwd() / "umbrella1_manifest.json"
+# vite dev/preview port when an app's "dashboard" is not its own port ("master")
+DEFAULT_DEV_PORT = 5174
+DEFAULT_VARS = {"name": "sysops", "host": "sysops.remimediaventures.com", "dev_port": DEFAULT_DEV_PORT, "api_port": 3000}
+
+# 1980-01-01, the earliest timestamp a ZIP entry can carry
+ZIP_EPOCH_MIN = 315532800
+
+# set by main(incremental=True); w() consults it to skip unchanged files
+_incr = None
+# set by main(store=...); w() links blobs from it instead of writing files
+_store = None
+_store_refs = {}
+
+class IncrementalState:
+    """Content-hash manifest kept beside the output tree (<root>.manifest.json)."""
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest_path = root.with_name(root.name + ".manifest.json")
+        self.prev = {}
+        if self.manifest_path.exists():
+            try:
+                self.prev = json.loads(self.manifest_path.read_text(encoding="utf-8")).get("files", {})
+            except ValueError:
+                self.prev = {}
+        self.seen = {}
+        self.counts = {"created": 0, "updated": 0, "unchanged": 0, "removed": 0}
+
+    def skip(self, path, data, exec):
+        """Record `path` as emitted; True when the file on disk is already current."""
+        rel = path.relative_to(self.root).as_posix()
+        entry = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data), "exec": bool(exec)}
+        self.seen[rel] = entry
+        prev = self.prev.get(rel)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self.counts["created"] += 1
+            return False
+        if (prev and prev["sha256"] == entry["sha256"] and prev["exec"] == entry["exec"]
+                and st.st_size == entry["size"] and st.st_mtime_ns == prev.get("mtime_ns")):
+            entry["mtime_ns"] = st.st_mtime_ns
+            self.counts["unchanged"] += 1
+            return True
+        self.counts["updated"] += 1
+        return False
+
+    def written(self, path):
+        self.seen[path.relative_to(self.root).as_posix()]["mtime_ns"] = path.stat().st_mtime_ns
+
+    def finish(self):
+        """Prune files emitted last run but not this one, then persist the manifest."""
+        for rel in sorted(set(self.prev) - set(self.seen)):
+            p = self.root / rel
+            if p.is_file():
+                p.unlink()
+                self.counts["removed"] += 1
+            d = p.parent
+            while d != self.root and d.is_dir() and not any(d.iterdir()):
+                d.rmdir()
+                d = d.parent
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"files": self.seen}, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+        return self.counts
+
+class BuildReport:
+    """Per-file and per-phase timings for one run, dumped as JSON or a Chrome trace."""
+
+    PHASES = ("render", "mkdir", "write", "chmod", "zip")
+
+    def __init__(self):
+        self.t0 = time.perf_counter_ns()
+        self.phase_ns = dict.fromkeys(self.PHASES, 0)
+        self.files = {}
+        self.events = []
+        self.policy = None
+        self.zip_wall_ns = 0
+
+    def file(self, rel):
+        return self.files.setdefault(rel, {"bytes": 0, "written": False})
+
+    def span(self, phase, rel, start_ns, end=None, tid=0):
+        """Charge end (default: now) - start_ns to `phase` (and `rel`); return the end time."""
+        end = end or time.perf_counter_ns()
+        self.phase_ns[phase] += end - start_ns
+        if rel is not None:
+            f = self.file(rel)
+            f[phase + "_us"] = f.get(phase + "_us", 0) + (end - start_ns) // 1000
+        self.events.append({"name": rel or phase, "cat": phase, "ph": "X", "pid": os.getpid(), "tid": tid,
+                            "ts": (start_ns - self.t0) / 1000, "dur": (end - start_ns) / 1000})
+        return end
+
+    def as_dict(self, zip_path=None):
+        zipped = [f for f in self.files.values() if "compressed" in f]
+        raw = sum(f["bytes"] for f in zipped)
+        packed = sum(f["compressed"] for f in zipped)
+        by_method = {}
+        for f in zipped:
+            m = by_method.setdefault(f["method"], {"entries": 0, "bytes": 0, "compressed": 0, "zip_ms": 0.0})
+            m["entries"] += 1
+            m["bytes"] += f["bytes"]
+            m["compressed"] += f["compressed"]
+            m["zip_ms"] += f.get("zip_us", 0) / 1000
+        for m in by_method.values():
+            m["ratio"] = round(m["compressed"] / m["bytes"], 4) if m["bytes"] else None
+            m["zip_ms"] = round(m["zip_ms"], 3)
+        return {
+            "wall_ms": round((time.perf_counter_ns() - self.t0) / 1e6, 3),
+            "phases_ms": {k: round(v / 1e6, 3) for k, v in self.phase_ns.items()},
+            # "zip" above sums per-entry time across compression threads; this is elapsed
+            "zip_wall_ms": round(self.zip_wall_ns / 1e6, 3),
+            "totals": {
+                "files": len(self.files),
+                "bytes_emitted": sum(f["bytes"] for f in self.files.values()),
+                "bytes_written": sum(f["bytes"] for f in self.files.values() if f["written"]),
+                "zip_bytes": zip_path.stat().st_size if zip_path and zip_path.exists() else None,
+                "compression_ratio": round(packed / raw, 4) if raw else None,
+            },
+            "compression": {"policy": self.policy, "by_method": by_method},
+            "files": self.files,
+        }
+
+    def dump(self, path, zip_path=None):
+        pathlib.Path(path).write_text(json.dumps(self.as_dict(zip_path), indent=1), encoding="utf-8")
+
+    def dump_trace(self, path):
+        pathlib.Path(path).write_text(json.dumps({"traceEvents": self.events}), encoding="utf-8")
+
+def source_date_epoch():
+    """SOURCE_DATE_EPOCH from the environment, clamped to what ZIP can store."""
+    return max(int(os.environ.get("SOURCE_DATE_EPOCH", ZIP_EPOCH_MIN)), ZIP_EPOCH_MIN)
+
+def fixed_clock(epoch):
+    """A clock that always answers `epoch` (naive UTC, like datetime.utcnow())."""
+    ts = datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).replace(tzinfo=None)
+    return lambda: ts
+
+def utcnow():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+class CompressionPolicy:
+    """Picks (method, level) per zip entry: STORED for already-compressed types and
+    tiny files, otherwise `method` at `level` (None = zlib/lzma default)."""
+
+    COMPRESSED_EXTS = frozenset((
+        ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".br", ".7z",
+        ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif",
+        ".woff", ".woff2", ".mp3", ".mp4", ".webm", ".pdf",
+    ))
+    METHOD_NAMES = {zipfile.ZIP_STORED: "stored", zipfile.ZIP_DEFLATED: "deflated",
+                    zipfile.ZIP_BZIP2: "bzip2", zipfile.ZIP_LZMA: "lzma"}
+
+    def __init__(self, method=zipfile.ZIP_DEFLATED, level=None, store_below=0, stored_exts=COMPRESSED_EXTS):
+        self.method = method
+        self.level = level
+        self.store_below = store_below
+        self.stored_exts = frozenset(stored_exts)
+
+    def choose(self, arc, size):
+        if size < self.store_below or os.path.splitext(arc)[1].lower() in self.stored_exts:
+            return zipfile.ZIP_STORED, None
+        return self.method, self.level
+
+    def as_dict(self):
+        return {"method": self.METHOD_NAMES[self.method], "level": self.level,
+                "store_below": self.store_below, "stored_exts": sorted(self.stored_exts)}
+
+# below this many input bytes thread start-up costs more than parallel compression saves
+PARALLEL_ZIP_MIN_BYTES = 1 << 20
+# ZIP record layouts (APPNOTE 4.3.7, 4.3.12, 4.3.16), as zipfile itself packs them
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_ZIP_VERSION = 20  # "2.0": deflate; what zipfile writes for stored/deflated members
+
+def _compress_entry(arc, data, method, level):
+    # runs on a worker thread: zlib releases the GIL while compressing
+    start = time.perf_counter_ns()
+    if method == zipfile.ZIP_DEFLATED:
+        # raw deflate stream, the same compressor ZipFile.writestr builds for this level
+        c = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, -15)
+        payload = c.compress(data) + c.flush()
+    else:
+        payload = data
+    return payload, zlib.crc32(data), start, time.perf_counter_ns(), threading.get_native_id()
+
+def _write_zip_parallel(plan, fp, date_time, workers, on_entry):
+    """Write (arc, data, exec, method, level) members to `fp` as zipfile would for
+    stored/deflated entries, compressing on `workers` threads. Members are appended
+    in `plan` order, so the bytes match ZipFile.writestr's."""
+    dostime = date_time[3] << 11 | date_time[4] << 5 | date_time[5] // 2
+    dosdate = (date_time[0] - 1980) << 9 | date_time[1] << 5 | date_time[2]
+    central = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(_compress_entry, arc, data, method, level) for arc, data, exec, method, level in plan]
+        for (arc, data, exec, method, _), job in zip(plan, jobs):
+            payload, crc, start, end, tid = job.result()
+            try:
+                name, flags = arc.encode("ascii"), 0
+            except UnicodeEncodeError:
+                name, flags = arc.encode("utf-8"), 0x800
+            offset = fp.tell()
+            fp.write(_LOCAL_HEADER.pack(b"PK\x03\x04", _ZIP_VERSION, 0, flags, method, dostime, dosdate,
+                                        crc, len(payload), len(data), len(name), 0))
+            fp.write(name)
+            fp.write(payload)
+            central.append(_CENTRAL_HEADER.pack(
+                b"PK\x01\x02", _ZIP_VERSION, 3, _ZIP_VERSION, 0, flags, method, dostime, dosdate,
+                crc, len(payload), len(data), len(name), 0, 0, 0, 0,
+                (0o100755 if exec else 0o100644) << 16, offset) + name)
+            on_entry(arc, method, len(payload), len(data), start, end, tid)
+    start_dir = fp.tell()
+    for record in central:
+        fp.write(record)
+    fp.write(_END_RECORD.pack(b"PK\x05\x06", 0, 0, len(central), len(central),
+                              fp.tell() - start_dir, start_dir, 0))
+
+def write_zip(entries, zip_path, epoch=None, report=None, policy=None, workers=None):
+    """Write (arcname, bytes, exec) entries to `zip_path` with 0644/0755 modes. With
+    `epoch`, entries are sorted and stamped with that time so equal inputs give
+    byte-identical zips. `policy` picks each entry's compression (default: deflate).
+
+    Stored/deflated bundles of PARALLEL_ZIP_MIN_BYTES or more are compressed on
+    `workers` threads (default: CPU count) and written by _write_zip_parallel; the
+    archive is byte-identical to the serial ZipFile.writestr path. LZMA/bzip2 and
+    ZIP64-sized bundles always take the serial path."""
+    policy = policy or CompressionPolicy()
+    if epoch is not None:
+        entries = sorted(entries, key=lambda e: e[0])
+        date_time = datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).timetuple()[:6]
+    else:
+        date_time = datetime.datetime.now().timetuple()[:6]
+    plan = [(arc, data, exec, *policy.choose(arc, len(data))) for arc, data, exec in entries]
+    workers = workers or os.cpu_count() or 1
+    total = sum(len(data) + 2 * len(arc) + 128 for arc, data, *_ in plan)
+    parallel = (workers > 1 and total >= PARALLEL_ZIP_MIN_BYTES
+                # no ZIP64 records or extra fields: headroom for deflate's worst-case growth
+                and total * 1.05 < zipfile.ZIP64_LIMIT and len(plan) < 0xFFFF
+                and all(m in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) for *_, m, _ in plan))
+
+    def on_entry(arc, method, compressed, size, start, end, tid):
+        if report is not None:
+            report.span("zip", arc, start, end, tid)
+            f = report.file(arc)
+            f["method"] = policy.METHOD_NAMES[method]
+            f["compressed"] = compressed
+            f["ratio"] = round(compressed / size, 4) if size else None
+
+    if zip_path.exists(): zip_path.unlink()
+    if parallel:
+        with open(zip_path, "wb") as fp:
+            _write_zip_parallel(plan, fp, date_time, workers, on_entry)
+    else:
+        tid = threading.get_native_id()
+        with zipfile.ZipFile(zip_path, "w", policy.method) as z:
+            for arc, data, exec, method, level in plan:
+                start = time.perf_counter_ns()
+                # fixed create_system and modes: nothing host-dependent ends up in the archive
+                zi = zipfile.ZipInfo(arc, date_time)
+                zi.create_system = 3
+                zi.external_attr = (0o100755 if exec else 0o100644) << 16
+                z.writestr(zi, data, compress_type=method, compresslevel=level)
+                on_entry(arc, zi.compress_type, zi.compress_size, zi.file_size, start, time.perf_counter_ns(), tid)
+    return hashlib.sha256(zip_path.read_bytes()).hexdigest()
+
+# ---------- delta artifacts ----------
+DELTA_MANIFEST = "DELTA.json"
+
+def bundle_index(entries):
+    """{arcname: {sha256, size, exec}} for (arcname, bytes, exec) entries."""
+    return {arc: {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data), "exec": bool(exec)}
+            for arc, data, exec in entries}
+
+def index_digest(index):
+    return hashlib.sha256(json.dumps(index, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+def read_entries(path):
+    """(arcname, bytes, exec) entries from a bundle zip or an unpacked tree."""
+    path = pathlib.Path(path)
+    if path.is_dir():
+        return [(p.relative_to(path).as_posix(), p.read_bytes(), bool(p.stat().st_mode & 0o111))
+                for p in sorted(path.rglob("*")) if p.is_file()]
+    with zipfile.ZipFile(path) as z:
+        return [(zi.filename, z.read(zi), bool((zi.external_attr >> 16) & 0o111))
+                for zi in z.infolist() if not zi.is_dir()]
+
+def read_index(path):
+    """Index of a previous build: its <bundle>.index.json, the bundle zip, or a tree."""
+    path = pathlib.Path(path)
+    if path.suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    return bundle_index(read_entries(path))
+
+def write_delta(base_index, entries, delta_path, epoch=None, policy=None):
+    """Zip only the entries that differ from `base_index`, plus a DELTA.json listing
+    added/changed/removed paths with hashes; returns that listing."""
+    index = bundle_index(entries)
+    delta = {
+        "format": 1,
+        "base": index_digest(base_index),
+        "target": index_digest(index),
+        "added": {a: e for a, e in index.items() if a not in base_index},
+        "changed": {a: dict(e, base_sha256=base_index[a]["sha256"]) for a, e in index.items()
+                    if a in base_index and base_index[a] != e},
+        "removed": {a: base_index[a]["sha256"] for a in sorted(set(base_index) - set(index))},
+    }
+    keep = set(delta["added"]) | set(delta["changed"])
+    payload = [(f"files/{arc}", data, exec) for arc, data, exec in entries if arc in keep]
+    payload.append((DELTA_MANIFEST, json.dumps(delta, indent=1, sort_keys=True).encode("utf-8"), False))
+    write_zip(payload, delta_path, epoch, policy=policy)
+    return delta
+
+def apply_delta(base, delta_path, out, epoch=None):
+    """Rebuild the full bundle from `base` (zip or tree) + a delta zip into `out`:
+    a directory, or a zip when `out` ends in .zip."""
+    entries = {arc: (data, exec) for arc, data, exec in read_entries(base)}
+    with zipfile.ZipFile(delta_path) as z:
+        delta = json.loads(z.read(DELTA_MANIFEST))
+        if index_digest(bundle_index((a, d, x) for a, (d, x) in entries.items())) != delta["base"]:
+            raise SystemExit(f"❌ {base} is not the base this delta was made against")
+        for arc in delta["removed"]:
+            entries.pop(arc, None)
+        for arc, meta in {**delta["added"], **delta["changed"]}.items():
+            entries[arc] = (z.read(f"files/{arc}"), meta["exec"])
+    result = [(arc, data, exec) for arc, (data, exec) in sorted(entries.items())]
+    if index_digest(bundle_index(result)) != delta["target"]:
+        raise SystemExit(f"❌ applying {delta_path} did not reproduce the target bundle")
+    out = pathlib.Path(out)
+    if out.suffix == ".zip":
+        write_zip(result, out, epoch)
+        return out
+    for arc, data, exec in result:
+        p = out / arc
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(data)
+        if exec:
+            os.chmod(p, 0o755)
+    return out
+
+# ---------- build stamping ----------
+# git_head()/stamp() live in stamp_build.py, which every bundle also ships as
+# ops/stamp_build.py for its npm postbuild; --stamp runs the same code here.
+
+# ---------- fingerprinting + precompression ----------
+# Post-build stage for a built dist/: content-hashes asset names (Vite's own [name]-[hash]
+# names are kept), rewrites references to renamed files, writes .gz (and .br/.zst when
+# brotli/zstandard are installed) siblings on a thread pool, and emits <dist>.cache.json
+# with the per-file cache policy the uploader applies. Run it after --stamp.
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# first match wins; mirrors ops/set_cache_headers.sh, but only hashed names are immutable
+CACHE_RULES = (
+    ("hashed", "public,max-age=31536000,immutable"),
+    ("*", "no-cache"),
+)
+# suffix and compressor per Content-Encoding; gzip with mtime=0 so reruns are byte-identical
+ENCODINGS = {"gzip": (".gz", lambda data: gzip.compress(data, 9, mtime=0))}
+if brotli is not None:
+    ENCODINGS["br"] = (".br", lambda data: brotli.compress(data, quality=11))
+if zstandard is not None:
+    ENCODINGS["zstd"] = (".zst", lambda data: zstandard.ZstdCompressor(level=19).compress(data))
+# files whose text may name other dist files
+REWRITE_EXTS = frozenset((".html", ".css", ".js", ".mjs", ".json", ".svg", ".webmanifest"))
+# served at fixed URLs, never renamed
+FIXED_NAMES = frozenset(("index.html", "healthz.json", "favicon.ico", "robots.txt"))
+# our own hash segment (".<8 hex>."); Vite's hashed outputs are only trusted when its
+# manifest lists them, since "-<base64url>." also matches names like Inter-SemiBold.woff2
+_HASHED = re.compile(r"\.[0-9a-f]{8}\.")
+VITE_MANIFESTS = (".vite/manifest.json", "manifest.json")
+
+def _is_hashed(rel, vite=frozenset()):
+    return rel in vite or bool(_HASHED.search(rel.rsplit("/", 1)[-1] + "."))
+
+def _vite_outputs(dist):
+    """(manifest path, files it names) from Vite's build manifest, if the build wrote one."""
+    for rel in VITE_MANIFESTS:
+        try:
+            doc = json.loads((dist / rel).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if not isinstance(doc, dict) or not all(isinstance(v, dict) and "file" in v for v in doc.values()):
+            continue  # some other manifest.json (e.g. a web app manifest)
+        out = set()
+        for chunk in doc.values():
+            out.add(chunk["file"])
+            out.update(chunk.get("css", ()))
+            out.update(chunk.get("assets", ()))
+        return rel, frozenset(out)
+    return None, frozenset()
+
+def _precompress(path, min_bytes, stored_exts):
+    # runs on a worker thread: zlib, brotli and zstd release the GIL while compressing
+    data = path.read_bytes()
+    out = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data), "encodings": {}}
+    skip = len(data) < min_bytes or path.suffix.lower() in stored_exts
+    for name, (suffix, compress) in ENCODINGS.items():
+        variant = path.with_name(path.name + suffix)
+        packed = None if skip else compress(data)
+        # a variant that saves under 5% costs the client a decode for nothing
+        if packed is None or len(packed) > len(data) * 0.95:
+            variant.unlink(missing_ok=True)
+            continue
+        variant.write_bytes(packed)
+        out["encodings"][name] = {"path": variant.name, "size": len(packed),
+                                  "sha256": hashlib.sha256(packed).hexdigest()}
+    return out
+
+def fingerprint(dist="dist", manifest=None, workers=None, min_bytes=1024):
+    """Fingerprint, cross-reference and precompress a built `dist` in place; write the
+    cache-policy manifest (default: <dist>.cache.json next to dist) and return it."""
+    dist = pathlib.Path(dist)
+    suffixes = tuple(suffix for suffix, _ in ENCODINGS.values())
+    files = sorted(p.relative_to(dist).as_posix() for p in dist.rglob("*")
+                   if p.is_file() and not (p.name.endswith(suffixes) and p.with_suffix("").is_file()))
+    vite_manifest, vite = _vite_outputs(dist)
+
+    # unhashed, renameable files, keyed by basename; names that occur twice stay put
+    # because a bare reference to them is ambiguous
+    names = collections.Counter(rel.rsplit("/", 1)[-1] for rel in files)
+    pending = {rel.rsplit("/", 1)[-1]: rel for rel in files
+               if rel not in FIXED_NAMES and rel != vite_manifest and not rel.endswith((".html", ".map"))
+               and not _is_hashed(rel, vite) and names[rel.rsplit("/", 1)[-1]] == 1}
+    texts = {rel: (dist / rel).read_text(encoding="utf-8", errors="surrogateescape")
+             for rel in files if pending and os.path.splitext(rel)[1] in REWRITE_EXTS}
+    def refs(text):
+        if not pending:
+            return set()
+        alt = "|".join(map(re.escape, sorted(pending, key=len, reverse=True)))
+        return set(re.findall(r"(?<![\w.-])(%s)(?![\w-]|\.\w)" % alt, text))
+    # a file that is already hashed can't change content under its name, so whatever it
+    # references keeps its name too
+    for rel, text in texts.items():
+        if _is_hashed(rel, vite) and rel not in pending.values():
+            for name in refs(text):
+                del pending[name]
+    deps = {rel: {pending[n] for n in refs(text)} - {rel} for rel, text in texts.items()}
+
+    # rename leaves first so every file is hashed after its references are rewritten;
+    # members of a reference cycle keep their names (and get no-cache)
+    renamed = {}
+    def rewrite(rel):
+        if deps.get(rel):
+            alt = "|".join(re.escape(pending_rel.rsplit("/", 1)[-1]) for pending_rel in deps[rel])
+            text = re.sub(r"(?<![\w.-])(%s)(?![\w-]|\.\w)" % alt,
+                          lambda m: renamed.get(pending[m.group(1)], pending[m.group(1)]).rsplit("/", 1)[-1],
+                          texts[rel])
+            (dist / rel).write_text(text, encoding="utf-8", errors="surrogateescape")
+    todo = set(pending.values())
+    while todo:
+        ready = sorted(rel for rel in todo if not (deps.get(rel, set()) & todo))
+        if not ready:
+            break
+        for rel in ready:
+            rewrite(rel)
+            path = dist / rel
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()[:8]
+            stem, ext = os.path.splitext(rel)
+            renamed[rel] = f"{stem}.{digest}{ext}"
+            os.replace(path, dist / renamed[rel])
+            for suffix in suffixes:
+                path.with_name(path.name + suffix).unlink(missing_ok=True)
+            todo.discard(rel)
+    for rel in sorted(todo) + sorted(rel for rel in texts if rel not in pending.values()):
+        rewrite(rel)
+
+    final = sorted(renamed.get(rel, rel) for rel in files)
+    stored_exts = CompressionPolicy.COMPRESSED_EXTS
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        results = pool.map(_precompress, [dist / rel for rel in final], [min_bytes] * len(final),
+                           [stored_exts] * len(final))
+        entries = {}
+        for rel, info in zip(final, results):
+            rule = next(r for r in CACHE_RULES if (r[0] == "hashed" and _is_hashed(rel, vite))
+                        or (r[0] != "hashed" and fnmatch.fnmatch(rel, r[0])))
+            entries[rel] = dict(info, content_type=content_type(rel), cache_control=rule[1])
+    doc = {"version": 1, "rules": [{"match": m, "cache_control": c} for m, c in CACHE_RULES],
+           "renamed": renamed, "files": entries}
+    manifest = pathlib.Path(manifest) if manifest else dist.with_name(dist.name + ".cache.json")
+    manifest.write_text(json.dumps(doc, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    return doc
+
+# ---------- content-addressed store ----------
+# Bundles for different apps share most of their files. With a store, w() writes each
+# distinct (content, mode) once as a read-only blob and links it into the app's tree;
+# refs/<tree>.json records what each tree uses, and gc() drops blobs no live tree refers to.
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+class BlobStore:
+    """<root>/objects/<2 hex>/<62 hex>[.x] blobs plus <root>/refs/*.json per materialized tree.
+    `link` is "hardlink" (default), "reflink" (copy-on-write clone, falls back to a copy) or "copy"."""
+
+    def __init__(self, root, link="hardlink"):
+        self.root = pathlib.Path(root)
+        self.link = link
+        self.objects = self.root / "objects"
+        self.refs = self.root / "refs"
+        self.counts = {"blobs_written": 0, "blobs_reused": 0, "bytes_written": 0}
+
+    def path(self, key):
+        return self.objects / key[:2] / key[2:]
+
+    def put(self, data, exec=False):
+        """Store `data` once; returns its key (sha256, with ".x" for executables)."""
+        key = hashlib.sha256(data).hexdigest() + (".x" if exec else "")
+        blob = self.path(key)
+        if blob.exists():
+            self.counts["blobs_reused"] += 1
+            return key
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        # unique temp name: several build processes may store the same blob at once
+        tmp = blob.with_name(f".{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.chmod(tmp, 0o555 if exec else 0o444)
+        os.replace(tmp, blob)
+        self.counts["blobs_written"] += 1
+        self.counts["bytes_written"] += len(data)
+        return key
+
+    def materialize(self, key, dest):
+        """Point `dest` at blob `key`, replacing whatever is there atomically."""
+        blob = self.path(key)
+        if self.link == "hardlink":
+            try:
+                # rename() between two links to one inode is a no-op that leaves tmp behind
+                if os.path.samefile(blob, dest):
+                    return
+            except FileNotFoundError:
+                pass
+        tmp = dest.with_name(f".{dest.name}.link.tmp")
+        tmp.unlink(missing_ok=True)
+        if self.link == "hardlink":
+            os.link(blob, tmp)
+        else:
+            with open(blob, "rb") as src, open(tmp, "wb") as dst:
+                try:
+                    if self.link != "reflink":
+                        raise OSError
+                    import fcntl
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                except (OSError, ImportError):
+                    dst.write(src.read())
+            # a private copy stays editable; only shared hardlinks are read-only
+            os.chmod(tmp, 0o755 if key.endswith(".x") else 0o644)
+        os.replace(tmp, dest)
+
+    def record(self, tree, files):
+        """Persist {relpath: key} as the reference set of the tree rooted at `tree`."""
+        tree = pathlib.Path(tree).resolve()
+        self.refs.mkdir(parents=True, exist_ok=True)
+        ref = self.refs / (hashlib.sha256(str(tree).encode("utf-8")).hexdigest()[:16] + ".json")
+        tmp = ref.with_name(f".{ref.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"tree": str(tree), "files": files}, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, ref)
+
+    def refcounts(self):
+        """{key: number of live trees using it}; ref files of deleted trees are dropped."""
+        counts = collections.Counter()
+        for ref in sorted(self.refs.glob("*.json")) if self.refs.is_dir() else ():
+            doc = json.loads(ref.read_text(encoding="utf-8"))
+            if not pathlib.Path(doc["tree"]).is_dir():
+                ref.unlink()
+                continue
+            counts.update(set(doc["files"].values()))
+        return counts
+
+    def blobs(self):
+        return {p.parent.name + p.name: p for p in self.objects.glob("??/*") if not p.name.startswith(".")}
+
+    def gc(self, dry_run=False):
+        """Delete unreferenced blobs (and stale temp files); returns (blobs removed, bytes freed)."""
+        live = self.refcounts()
+        removed = freed = 0
+        for key, blob in self.blobs().items():
+            if key not in live:
+                freed += blob.stat().st_size
+                removed += 1
+                if not dry_run:
+                    blob.unlink()
+        if not dry_run:
+            for tmp in self.objects.glob("??/.*.tmp"):
+                if time.time() - tmp.stat().st_mtime > 3600:
+                    tmp.unlink()
+            for d in self.objects.glob("??"):
+                if not any(d.iterdir()):
+                    d.rmdir()
+        return removed, freed
+
+    def stats(self):
+        live = self.refcounts()
+        sizes = {key: blob.stat().st_size for key, blob in self.blobs().items()}
+        return {"blobs": len(sizes), "blob_bytes": sum(sizes.values()),
+                "referenced_files": sum(live.values()),
+                "referenced_bytes": sum(sizes.get(k, 0) * n for k, n in live.items()),
+                "unreferenced": len(set(sizes) - set(live))}
+
+# ---------- pre-flight validation ----------
+# Cheap static checks over the emitted files, run before the ZIP is written so a broken
+# bundle fails here in milliseconds instead of minutes into `npm ci && vite build`.
+
+class ValidationError(Exception):
+    def __init__(self, problems):
+        # problems as the only arg, so the error survives the trip back from a pool worker
+        super().__init__(problems)
+        self.problems = problems
+
+    def __str__(self):
+        return f"{len(self.problems)} problem(s) in generated sources:\n" + "\n".join(self.problems)
+
+class _Unbalanced(Exception):
+    def __init__(self, pos, msg):
+        self.pos, self.msg = pos, msg
+
+_CLOSERS = {")": "(", "]": "[", "}": "{"}
+# a "/" or "<" after one of these starts a regex / JSX element rather than an operator
+_EXPR_START = set("(,=:[!&|?{};+-*%~^")
+_EXPR_KEYWORDS = ("return", "typeof", "case", "in", "of", "=>")
+
+def _prev_index(text, i):
+    j = i - 1
+    while j >= 0 and text[j] in " \t\r\n":
+        j -= 1
+    return j
+
+def _prev_significant(text, i):
+    j = _prev_index(text, i)
+    if j < 0:
+        return ""
+    if text[j].isalnum() or text[j] in "_$>":
+        k = j
+        while k >= 0 and (text[k].isalnum() or text[k] in "_$=>"):
+            k -= 1
+        return text[k + 1:j + 1]
+    if text[j] in "+-" and j > 0 and text[j - 1] == text[j]:
+        return text[j - 1:j + 1]
+    return text[j]
+
+def _expr_start(text, i, literal_ends=()):
+    """True when a "/" or "<" at `i` begins an operand (regex / JSX) rather than an
+    operator. Postfix ++/-- and a "}" in `literal_ends` (closing an object literal)
+    end an expression, like ")" and "]" do."""
+    if _prev_index(text, i) in literal_ends:
+        return False
+    prev = _prev_significant(text, i)
+    if prev in ("++", "--"):
+        return False
+    return prev == "" or prev in _EXPR_START or prev in _EXPR_KEYWORDS
+
+# "{" after one of these opens a block, not an object literal
+_BLOCK_AFTER = ("", "{", "}", ";", "=>")
+# TSX generic parameters on an arrow: <T,>(x: T) => x, <T extends U>(x: T) => x
+_TS_GENERIC = re.compile(r"<\s*[A-Za-z_$][\w$]*\s*(?:,|extends\b)")
+
+def _skip_generic(text, i):
+    """Index of the "(" after a TSX arrow's generic parameter list at `i`; None when
+    the "<" does not start one (then it is JSX)."""
+    if not _TS_GENERIC.match(text, i):
+        return None
+    depth = 0
+    for j in range(i, len(text)):
+        c = text[j]
+        if c == "<":
+            depth += 1
+        elif c == ">" and text[j - 1] != "=":
+            depth -= 1
+            if depth == 0:
+                k = j + 1
+                while k < len(text) and text[k] in " \t\r\n":
+                    k += 1
+                return k if text.startswith("(", k) else None
+        elif c == ";":
+            return None
+    return None
+
+def _skip_string(text, i):
+    q = text[i]
+    i += 1
+    while i < len(text):
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == q:
+            return i + 1
+        if c == "\n":
+            break
+        i += 1
+    raise _Unbalanced(i, f"unterminated string {q}")
+
+def _skip_regex(text, i):
+    i += 1
+    in_class = False
+    while i < len(text) and text[i] != "\n":
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            return i + 1
+        i += 1
+    raise _Unbalanced(i, "unterminated regex literal")
+
+def _scan_template(text, i, jsx):
+    i += 1
+    while i < len(text):
+        c = text[i]
+        if c == "\\":
+            i += 2
+        elif c == "`":
+            return i + 1
+        elif text.startswith("${", i):
+            i = _scan_js(text, i + 2, "}", jsx)
+        else:
+            i += 1
+    raise _Unbalanced(i, "unterminated template literal")
+
+def _scan_js(text, i, closer, jsx):
+    """Scan JS/TS from `i` up to the unmatched `closer` (None: end of text); returns the
+    index after it. Strings, comments, regexes, templates and JSX are skipped over."""
+    stack = []
+    literal_ends = set()
+    while i < len(text):
+        c = text[i]
+        if text.startswith("//", i):
+            i = text.find("\n", i)
+            i = len(text) if i < 0 else i
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            if j < 0:
+                raise _Unbalanced(i, "unterminated /* comment")
+            i = j + 2
+        elif c in "'\"":
+            i = _skip_string(text, i)
+        elif c == "`":
+            i = _scan_template(text, i, jsx)
+        elif c == "/" and _expr_start(text, i, literal_ends):
+            i = _skip_regex(text, i)
+        elif c == "<" and jsx and _expr_start(text, i, literal_ends) and i + 1 < len(text) and (text[i + 1].isalpha() or text[i + 1] == ">"):
+            end = _skip_generic(text, i)
+            i = _scan_jsx(text, i) if end is None else end
+        elif c in "([{":
+            stack.append((c, i))
+            i += 1
+        elif c in ")]}":
+            if not stack:
+                if c == closer:
+                    return i + 1
+                raise _Unbalanced(i, f"unexpected {c!r}")
+            opener, at = stack.pop()
+            if opener != _CLOSERS[c]:
+                raise _Unbalanced(i, f"{c!r} closes {opener!r} opened on line {text.count(chr(10), 0, at) + 1}")
+            if c == "}" and _expr_start(text, at) and _prev_significant(text, at) not in _BLOCK_AFTER:
+                literal_ends.add(i)
+            i += 1
+        else:
+            i += 1
+    if stack:
+        raise _Unbalanced(stack[-1][1], f"{stack[-1][0]!r} never closed")
+    if closer is not None:
+        raise _Unbalanced(i, f"missing {closer!r}")
+    return i
+
+_TAG_NAME = re.compile(r"[A-Za-z0-9_.:-]*")
+
+def _scan_jsx(text, i):
+    """Scan one JSX element (or fragment) starting at "<"; returns the index after it."""
+    start = i
+    name = _TAG_NAME.match(text, i + 1).group()
+    i += 1 + len(name)
+    while True:  # attributes
+        if i >= len(text):
+            raise _Unbalanced(start, f"<{name}> tag never closed")
+        c = text[i]
+        if text.startswith("/>", i):
+            return i + 2
+        if c == ">":
+            i += 1
+            break
+        if c in "'\"":
+            i = _skip_string(text, i)
+        elif c == "{":
+            i = _scan_js(text, i + 1, "}", True)
+        else:
+            i += 1
+    while i < len(text):  # children
+        c = text[i]
+        if c == "{":
+            i = _scan_js(text, i + 1, "}", True)
+        elif text.startswith("</", i):
+            close = _TAG_NAME.match(text, i + 2).group()
+            if close != name:
+                raise _Unbalanced(i, f"</{close}> closes <{name}> opened on line {text.count(chr(10), 0, start) + 1}")
+            j = text.find(">", i)
+            if j < 0:
+                raise _Unbalanced(i, f"</{close} never closed")
+            return j + 1
+        elif c == "<":
+            i = _scan_jsx(text, i)
+        else:
+            i += 1
+    raise _Unbalanced(start, f"<{name}> never closed")
+
+def check_balance(text, jsx=False):
+    """None when brackets (and, with `jsx`, JSX tags) balance; else "line N: problem"."""
+    try:
+        _scan_js(text, 0, None, jsx)
+    except _Unbalanced as e:
+        return f"line {text.count(chr(10), 0, e.pos) + 1}: {e.msg}"
+    return None
+
+_ENV_REF = re.compile(r"import\.meta\.env\.(VITE_\w+)")
+_ENV_DECL = re.compile(r"^\s*(VITE_\w+)\s*=", re.M)
+# headers[env.X_HEADER] = env.X_VALUE; anything else sends a value as a header name
+_HEADER_PAIR = re.compile(r"headers\[env\.(\w+)\]\s*=\s*env\.(\w+)")
+# commands the Makefile / package.json scripts run, and CloudFront fileb:// payloads
+_SCRIPT_REF = re.compile(r"(?:\b(?:bash|sh|node|python3?)\s+|fileb?://)((?:\./)?[\w./-]+\.(?:sh|js|mjs|py))")
+
+def _check_file(rel, data):
+    ext = os.path.splitext(rel)[1]
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        return [f"{rel}: not UTF-8 ({e})"]
+    problems = []
+    if ext == ".json":
+        try:
+            json.loads(text)
+        except ValueError as e:
+            problems.append(f"{rel}: invalid JSON: {e}")
+    elif ext == ".jsonl":
+        for n, line in enumerate(text.splitlines(), 1):
+            try:
+                line.strip() and json.loads(line)
+            except ValueError as e:
+                problems.append(f"{rel}:{n}: invalid JSON: {e}")
+    elif ext in (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"):
+        err = check_balance(text, jsx=ext in (".tsx", ".jsx"))
+        if err:
+            problems.append(f"{rel}: {err}")
+        for m in _HEADER_PAIR.finditer(text):
+            name, value = m.groups()
+            if not (name.endswith("_HEADER") and value == name[:-len("_HEADER")] + "_VALUE"):
+                problems.append(f"{rel}: line {text.count(chr(10), 0, m.start()) + 1}: "
+                                f"headers[env.{name}] = env.{value} (expected headers[env.X_HEADER] = env.X_VALUE)")
+    elif ext == ".sh" and shutil.which("bash"):
+        r = subprocess.run(["bash", "-n"], input=data, capture_output=True)
+        if r.returncode:
+            problems.append(f"{rel}: bash -n: {r.stderr.decode('utf-8', 'replace').strip()}")
+    return problems
+
+def validate(entries, workers=None, fail_fast=False):
+    """Problems found in (arcname, bytes, exec) entries; [] when the bundle looks buildable.
+    Per-file checks run on a thread pool; with `fail_fast` the first bad file stops the rest."""
+    files = {rel: data for rel, data, _ in entries}
+    problems = []
+
+    # cross-file: env vars the code reads must be declared, referenced scripts must exist
+    declared = set(_ENV_DECL.findall(files.get(".env.example", b"").decode("utf-8", "replace")))
+    for rel, data in sorted(files.items()):
+        if rel.endswith((".ts", ".tsx", ".js", ".jsx")):
+            for var in sorted(set(_ENV_REF.findall(data.decode("utf-8", "replace"))) - declared):
+                problems.append(f"{rel}: import.meta.env.{var} is not declared in .env.example")
+        if rel in ("Makefile", "package.json"):
+            for ref in sorted(set(_SCRIPT_REF.findall(data.decode("utf-8", "replace")))):
+                target = posixpath.normpath(posixpath.join(posixpath.dirname(rel), ref))
+                if target not in files:
+                    problems.append(f"{rel}: references {ref}, which is not in the bundle")
+    if problems and fail_fast:
+        return problems
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(_check_file, rel, data) for rel, data in sorted(files.items())]
+        for f in futures:
+            found = f.result()
+            problems += found
+            if found and fail_fast:
+                for rest in futures:
+                    rest.cancel()
+                break
+    return problems
+
+# polled endpoint -> (template variable, upstream URL, same-origin path on status_proxy.py)
+POLLED_ENDPOINTS = {
+    "STATUS_SUMMARY": ("status_summary_url", "https://status.remimediaventures.com/api/summary", "/ops/cache/status/summary"),
+    "SLO_STATUS": ("slo_status_url", "https://api.remimediaventures.com/_status", "/ops/cache/slo/status"),
+    "OPS_COST_MIN": ("cost_min_url", "https://ops.remimediaventures.com/cost/minute", "/ops/cache/cost/minute"),
+    "OPS_AI_SPEND24H": ("ai_spend24h_url", "https://ops.remimediaventures.com/ai/spend24h", "/ops/cache/ai/spend24h"),
+    "JIT_STATUS": ("jit_status_url", "https://@@{host}/ops/repo-access/status", "/ops/cache/jit/status"),
+}
+PROXY_SOURCE = pathlib.Path(__file__).with_name("status_proxy.py")
+STAMP_SOURCE = pathlib.Path(__file__).with_name("stamp_build.py")
+# bundle path -> sibling script shipped verbatim (executable)
+BUNDLED_SOURCES = {
+    "services/status-proxy/status_proxy.py": PROXY_SOURCE,
+    "ops/stamp_build.py": STAMP_SOURCE,
+}
+
+def app_vars(app=None, proxy=False):
+    """Template variables for one manifest app; no app gives the stock SysOps bundle.
+    With `proxy`, the polled endpoints point at the bundled status_proxy.py."""
+    if not app:
+        values = dict(DEFAULT_VARS)
+    else:
+        values = {
+            "name": app["app"],
+            "host": f"{app['app']}.remimediaventures.com",
+            "dev_port": app["dashboard"] if isinstance(app.get("dashboard"), int) else DEFAULT_DEV_PORT,
+            "api_port": app["api_port"],
+        }
+    for var, upstream, local in POLLED_ENDPOINTS.values():
+        values[var] = local if proxy else render(upstream, values)
+    return values
+
+# ---------- template registry ----------
+# Sources are registered once at import; compile_template() dedents them and splits out the
+# @@{var} placeholders, cached by source hash, so rendering a variant is a join.
+TEMPLATES = {}
+_compiled = {}
+_PLACEHOLDER = re.compile(r"@@\{(\w+)\}")
+
+def template(rel, source, exec=False):
+    TEMPLATES[rel] = (source, exec)
+
+def compile_template(source):
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    parts = _compiled.get(key)
+    if parts is None:
+        # even indexes are literal text, odd indexes are variable names
+        parts = _compiled[key] = tuple(_PLACEHOLDER.split(textwrap.dedent(source)))
+    return parts
+
+def render(source, values):
+    parts = compile_template(source)
+    if len(parts) == 1:
+        return parts[0]
+    return "".join(p if i % 2 == 0 else str(values[p]) for i, p in enumerate(parts))
+
+# ---------- Top-level ----------
+template("package.json", """\
     {
-      "name": "exoverse-sysops-dashboard",
+      "name": "exoverse-@@{name}-dashboard",
       "version": "1.0.0",
       "private": true,
       "type": "module",
       "scripts": {
         "dev": "vite",
         "build": "vite build",
-        "postbuild": "bash ops/write_health.sh dist && bash ops/inject_build_meta.sh dist",
-        "preview": "vite preview --port 5174"
+        "postbuild": "python3 ops/stamp_build.py dist",
+        "preview": "vite preview --port @@{dev_port}"
       },
       "dependencies": {
         "react": "^18.3.1",
@@ -50,14 +989,16 @@ def main():
         "@vitejs/plugin-react": "^4.3.1"
       }
     }
-    """))
+    """)
 
-    w(ROOT / ".env.example", textwrap.dedent("""\
-    # Public endpoints (read-only for ops UI)
-    VITE_STATUS_SUMMARY_URL=https://status.remimediaventures.com/api/summary
-    VITE_SLO_STATUS_URL=https://api.remimediaventures.com/_status
-    VITE_OPS_COST_MIN_URL=https://ops.remimediaventures.com/cost/minute
-    VITE_OPS_AI_SPEND24H_URL=https://ops.remimediaventures.com/ai/spend24h
+template(".env.example", """\
+    # Public endpoints (read-only for ops UI). Point these (and VITE_JIT_STATUS_URL) at
+    # /ops/cache/status/summary, /ops/cache/slo/status, /ops/cache/cost/minute,
+    # /ops/cache/ai/spend24h and /ops/cache/jit/status to poll through services/status-proxy
+    VITE_STATUS_SUMMARY_URL=@@{status_summary_url}
+    VITE_SLO_STATUS_URL=@@{slo_status_url}
+    VITE_OPS_COST_MIN_URL=@@{cost_min_url}
+    VITE_OPS_AI_SPEND24H_URL=@@{ai_spend24h_url}
 
     # Links (open in new tab)
     VITE_GRAFANA_URL=https://grafana.remimediaventures.com/d/overview
@@ -70,17 +1011,17 @@ def main():
     VITE_DAD_AGENT_STREAM=/ops/agent/stream
 
     # JIT / Bootstrap surfaces (SysOps service on your subdomain)
-    VITE_JIT_STATUS_URL=https://sysops.remimediaventures.com/ops/repo-access/status
-    VITE_JIT_REQUEST_URL=https://sysops.remimediaventures.com/ops/repo-access/request
+    VITE_JIT_STATUS_URL=@@{jit_status_url}
+    VITE_JIT_REQUEST_URL=https://@@{host}/ops/repo-access/request
 
     # Optional auth header names (if your gateway requires them)
     VITE_AUTH_HEADER=Authorization
     VITE_AUTH_VALUE=Bearer __INJECT_AT_EDGE__
     VITE_OWNER_HEADER=
     VITE_OWNER_VALUE=
-    """))
+    """)
 
-    w(ROOT / "index.html", textwrap.dedent("""\
+template("index.html", """\
     <!doctype html>
     <html lang="en">
       <head>
@@ -95,36 +1036,36 @@ def main():
         <script type="module" src="/src/main.tsx"></script>
       </body>
     </html>
-    """))
+    """)
 
-    w(ROOT / "vite.config.ts", textwrap.dedent("""\
+template("vite.config.ts", """\
     import { defineConfig } from "vite";
     import react from "@vitejs/plugin-react";
-    export default defineConfig({ plugins:[react()], server:{ port:5174 }, build:{ sourcemap:true }});
-    """))
-
-    w(ROOT / "tailwind.config.ts", 'import type { Config } from "tailwindcss";\nexport default { content:["./index.html","./src/**/*.{ts,tsx}"], theme:{ extend:{} }, plugins:[] } satisfies Config;\n')
-    w(ROOT / "postcss.config.js", 'export default { plugins: { tailwindcss: {}, autoprefixer: {} } };\n')
-    w(ROOT / "tsconfig.json", textwrap.dedent("""\
+    // /ops/cache/* is the shared status cache (services/status-proxy); `make status-proxy` runs it locally
+    export default defineConfig({ plugins:[react()], server:{ port:@@{dev_port},
+      proxy:{ "/ops/cache": process.env.STATUS_PROXY_URL || "http://127.0.0.1:8790" } }, build:{ sourcemap:true }});
+    """)
+
+template("tailwind.config.ts", 'import type { Config } from "tailwindcss";\nexport default { content:["./index.html","./src/**/*.{ts,tsx}"], theme:{ extend:{} }, plugins:[] } satisfies Config;\n')
+template("postcss.config.js", 'export default { plugins: { tailwindcss: {}, autoprefixer: {} } };\n')
+template("tsconfig.json", """\
     { "compilerOptions": { "target":"ES2020","lib":["ES2020","DOM"],"jsx":"react-jsx","module":"ESNext","moduleResolution":"Bundler","strict":true,"skipLibCheck":true}, "include":["src"] }
-    """))
-    w(ROOT / "tsconfig.node.json", '{ "compilerOptions":{ "composite":true,"module":"ESNext","moduleResolution":"Node" } }\n')
-    w(ROOT / ".gitignore", "node_modules\ndist\n.env\n.DS_Store\n*.log\n")
+    """)
+template("tsconfig.node.json", '{ "compilerOptions":{ "composite":true,"module":"ESNext","moduleResolution":"Node" } }\n')
+template(".gitignore", "node_modules\ndist\n.env\n.DS_Store\n*.log\n")
 
-    w(ROOT / "Makefile", textwrap.dedent("""\
-    .PHONY: deploy-all dash-invalidate cf-security-headers dash-rev-stamp dash-rev-verify
+template("Makefile", """\
+    .PHONY: deploy-all dash-invalidate cf-security-headers dash-rev-stamp dash-rev-verify status-proxy
 
     deploy-all:
     	npm ci
     	npm run build
-    	bash ops/write_health.sh dist
-    	bash ops/inject_build_meta.sh dist
     	aws s3 sync dist/ $${S3_BUCKET_URL:?}/ --delete
     	bash ops/set_cache_headers.sh
     	aws cloudfront create-invalidation --distribution-id $${CF_DISTRIBUTION_ID:?} --paths "/index.html" "/"
     	sleep 5
-    	curl -s $(shell echo $${PUBLIC_HOST:-https://sysops.remimediaventures.com})/healthz.json | jq .
-    	curl -sI $(shell echo $${PUBLIC_HOST:-https://sysops.remimediaventures.com})/ | sed -n 's/^x-amz-meta-build-rev:.*/&/p'
+    	curl -s $(shell echo $${PUBLIC_HOST:-https://@@{host}})/healthz.json | jq .
+    	curl -sI $(shell echo $${PUBLIC_HOST:-https://@@{host}})/ | sed -n 's/^x-amz-meta-build-rev:.*/&/p'
 
     dash-invalidate:
     	aws cloudfront create-invalidation --distribution-id $${CF_DISTRIBUTION_ID:?} --paths "/*"
@@ -140,12 +1081,16 @@ def main():
     	aws cloudfront create-invalidation --distribution-id $${CF_DISTRIBUTION_ID:?} --paths "/index.html"
 
     dash-rev-verify:
-    	curl -sI $(shell echo $${PUBLIC_HOST:-https://sysops.remimediaventures.com})/ | sed -n 's/^x-amz-meta-build-rev:.*/&/p'; \
-    	curl -s $(shell echo $${PUBLIC_HOST:-https://sysops.remimediaventures.com})/healthz.json | jq .
-    """))
+    	curl -sI $(shell echo $${PUBLIC_HOST:-https://@@{host}})/ | sed -n 's/^x-amz-meta-build-rev:.*/&/p'; \
+    	curl -s $(shell echo $${PUBLIC_HOST:-https://@@{host}})/healthz.json | jq .
+
+    status-proxy:
+    	set -a; [ -f services/status-proxy/.env ] && . services/status-proxy/.env; set +a; \
+    	python3 services/status-proxy/status_proxy.py --port $${STATUS_PROXY_PORT:-8790}
+    """)
 
-    # ---------- ops scripts ----------
-    w(ROOT / "ops/write_health.sh", textwrap.dedent("""\
+# ---------- ops scripts ----------
+template("ops/write_health.sh", """\
     #!/usr/bin/env bash
     set -euo pipefail
     DIR="${1:-dist}"; mkdir -p "$DIR"
@@ -156,9 +1101,9 @@ def main():
     {"status":"ok","ts":"${ts}","app":{"name":"SysOps Dashboard","version":""},"git":{"short":"${short}"}}
     JSON
     echo "✅ wrote ${DIR}/healthz.json"
-    """), exec=True)
+    """, exec=True)
 
-    w(ROOT / "ops/inject_build_meta.sh", textwrap.dedent("""\
+template("ops/inject_build_meta.sh", """\
     #!/usr/bin/env bash
     set -euo pipefail
     DIST="${1:-dist}"; HTML="${DIST}/index.html"; [[ -f "$HTML" ]] || exit 2
@@ -169,9 +1114,9 @@ def main():
     /<\/head>/ && !done { print "  <meta name=\\"build-rev\\" content=\\"" rev "\\">"; print "  <meta name=\\"build-ts\\" content=\\"" ts "\\">"; done=1 } { print }
     ' "$HTML" > "$tmp" && mv "$tmp" "$HTML"
     echo "✅ injected meta into ${HTML}"
-    """), exec=True)
+    """, exec=True)
 
-    w(ROOT / "ops/set_cache_headers.sh", textwrap.dedent("""\
+template("ops/set_cache_headers.sh", """\
     #!/usr/bin/env bash
     set -euo pipefail
     : "${BUCKET:=${S3_BUCKET_URL:?}}"
@@ -184,12 +1129,25 @@ def main():
       aws s3 cp "$DIST/$f" "$BUCKET/$f" --metadata-directive REPLACE --cache-control "no-cache" --content-type "$mime"
     done
     echo "✅ cache headers applied"
-    """), exec=True)
+    """, exec=True)
+
+template("ops/cf_function_security_headers.js", """\
+    // CloudFront Function (cloudfront-js-1.0), viewer-response: `make cf-security-headers`
+    function handler(event) {
+      var headers = event.response.headers;
+      headers["strict-transport-security"] = { value: "max-age=63072000; includeSubDomains" };
+      headers["x-content-type-options"] = { value: "nosniff" };
+      headers["x-frame-options"] = { value: "DENY" };
+      headers["referrer-policy"] = { value: "strict-origin-when-cross-origin" };
+      headers["permissions-policy"] = { value: "camera=(), microphone=(), geolocation=()" };
+      return event.response;
+    }
+    """)
 
-    # ---------- src ----------
-    w(ROOT / "src/index.css", "@tailwind base;\\n@tailwind components;\\n@tailwind utilities;\\n\\nhtml, body, #root { height: 100%; }\\n")
+# ---------- src ----------
+template("src/index.css", "@tailwind base;\\n@tailwind components;\\n@tailwind utilities;\\n\\nhtml, body, #root { height: 100%; }\\n")
 
-    w(ROOT / "src/main.tsx", textwrap.dedent("""\
+template("src/main.tsx", """\
     import React from "react";
     import ReactDOM from "react-dom/client";
     import { createBrowserRouter, RouterProvider } from "react-router-dom";
@@ -220,9 +1178,9 @@ def main():
     ReactDOM.createRoot(document.getElementById("root")!).render(
       <React.StrictMode><RouterProvider router={router} /></React.StrictMode>
     );
-    """))
+    """)
 
-    w(ROOT / "src/App.tsx", textwrap.dedent("""\
+template("src/App.tsx", """\
     import React from "react";
     import { Outlet, NavLink } from "react-router-dom";
 
@@ -262,9 +1220,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/lib/api.ts", textwrap.dedent("""\
+template("src/lib/api.ts", """\
     export const env = {
       STATUS_SUMMARY: import.meta.env.VITE_STATUS_SUMMARY_URL || "",
       SLO_STATUS: import.meta.env.VITE_SLO_STATUS_URL || "",
@@ -296,7 +1254,7 @@ def main():
     export async function postJSON(url: string, body: any) {
       const headers: Record<string, string> = { "content-type": "application/json" };
       if (env.AUTH_HEADER && env.AUTH_VALUE) headers[env.AUTH_HEADER] = env.AUTH_VALUE;
-      if (env.OWNER_HEADER && env.OWNER_VALUE) headers[env.OWNER_VALUE] = env.OWNER_VALUE;
+      if (env.OWNER_HEADER && env.OWNER_VALUE) headers[env.OWNER_HEADER] = env.OWNER_VALUE;
       const res = await fetch(url, { method: "POST", headers, body: JSON.stringify(body) });
       if (!res.ok) throw new Error(`POST ${url} -> ${res.status}`);
       return res.json();
@@ -337,12 +1295,12 @@ def main():
       if (!env.JIT_REQUEST_URL) throw new Error("JIT request endpoint not configured");
       return postJSON(env.JIT_REQUEST_URL, req);
     }
-    """))
+    """)
 
-    w(ROOT / "src/components/KPI.tsx", "import React from 'react';\nexport default function KPI({label,value,hint}:{label:string;value:React.ReactNode;hint?:string;}){return(<div className='rounded-2xl border p-3 bg-white'><div className='text-xs text-neutral-500'>{label}</div><div className='text-2xl font-semibold'>{value}</div>{hint?<div className='text-xs text-neutral-400 mt-1'>{hint}</div>:null}</div>);}\n")
-    w(ROOT / "src/components/StatusCard.tsx", "import React from 'react';\nexport default function StatusCard({title,children}:React.PropsWithChildren<{title:string}>){return(<div className='rounded-2xl border p-4 bg-white'><div className='font-semibold mb-2'>{title}</div>{children}</div>);}\n")
+template("src/components/KPI.tsx", "import React from 'react';\nexport default function KPI({label,value,hint}:{label:string;value:React.ReactNode;hint?:string;}){return(<div className='rounded-2xl border p-3 bg-white'><div className='text-xs text-neutral-500'>{label}</div><div className='text-2xl font-semibold'>{value}</div>{hint?<div className='text-xs text-neutral-400 mt-1'>{hint}</div>:null}</div>);}\n")
+template("src/components/StatusCard.tsx", "import React from 'react';\nexport default function StatusCard({title,children}:React.PropsWithChildren<{title:string}>){return(<div className='rounded-2xl border p-4 bg-white'><div className='font-semibold mb-2'>{title}</div>{children}</div>);}\n")
 
-    w(ROOT / "src/components/AgentChat.tsx", textwrap.dedent("""\
+template("src/components/AgentChat.tsx", """\
     import React, { useRef, useState } from "react";
     import { env, postJSON, sse } from "../lib/api";
 
@@ -408,9 +1366,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/components/BootstrapBanner.tsx", textwrap.dedent("""\
+template("src/components/BootstrapBanner.tsx", """\
     import React from "react";
     export default function BootstrapBanner({ expiresAt }: { expiresAt?: string }) {
       return (
@@ -423,9 +1381,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/components/JITRequest.tsx", textwrap.dedent("""\
+template("src/components/JITRequest.tsx", """\
     import React, { useState } from "react";
     import { requestJitAccess } from "../lib/api";
 
@@ -463,10 +1421,10 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    # pages
-    w(ROOT / "src/pages/overview.tsx", textwrap.dedent("""\
+# pages
+template("src/pages/overview.tsx", """\
     import React from "react";
     import KPI from "../components/KPI";
     import StatusCard from "../components/StatusCard";
@@ -539,9 +1497,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/pages/incidents.tsx", textwrap.dedent("""\
+template("src/pages/incidents.tsx", """\
     import React from "react";
     import StatusCard from "../components/StatusCard";
     import { env } from "../lib/api";
@@ -561,9 +1519,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/pages/infra.tsx", textwrap.dedent("""\
+template("src/pages/infra.tsx", """\
     import React from "react";
     import StatusCard from "../components/StatusCard";
     import { env } from "../lib/api";
@@ -579,9 +1537,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/pages/queues.tsx", textwrap.dedent("""\
+template("src/pages/queues.tsx", """\
     import React from "react";
     import StatusCard from "../components/StatusCard";
     import { env } from "../lib/api";
@@ -594,9 +1552,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/pages/cost.tsx", textwrap.dedent("""\
+template("src/pages/cost.tsx", """\
     import React from "react";
     import KPI from "../components/KPI";
     import StatusCard from "../components/StatusCard";
@@ -633,9 +1591,9 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    w(ROOT / "src/pages/ai.tsx", textwrap.dedent("""\
+template("src/pages/ai.tsx", """\
     import React from "react";
     import StatusCard from "../components/StatusCard";
     import { env } from "../lib/api";
@@ -649,10 +1607,10 @@ def main():
         </div>
       );
     }
-    """))
+    """)
 
-    # ---------- backend service sample ----------
-    w(ROOT / "services/sysops/repoAccess.js", textwrap.dedent("""\
+# ---------- backend service sample ----------
+template("services/sysops/repoAccess.js", """\
     import express from "express";
     import fetch from "node-fetch";
     const router = express.Router();
@@ -692,62 +1650,72 @@ def main():
     });
 
     export default router;
-    """))
+    """)
 
-    w(ROOT / "services/sysops/server.js", textwrap.dedent("""\
+template("services/sysops/server.js", """\
     import express from "express";
     import repoAccessRoutes from "./repoAccess.js";
     const app = express();
     app.use(express.json());
     app.use((req, _, next)=>{ req.user={ sub:"sysops-engineer-123", role:"ops" }; next(); });
     app.use(repoAccessRoutes);
-    app.get("/healthz.json", (req,res)=>res.json({ status:"ok", app:"SysOps Service", fqdn:"sysops.remimediaventures.com" }));
-    app.listen(process.env.PORT||3000, ()=>console.log("SysOps service running on :"+(process.env.PORT||3000)));
-    """))
+    app.get("/healthz.json", (req,res)=>res.json({ status:"ok", app:"SysOps Service", fqdn:"@@{host}" }));
+    app.listen(process.env.PORT||@@{api_port}, ()=>console.log("SysOps service running on :"+(process.env.PORT||@@{api_port})));
+    """)
 
-    # ---------- docs ----------
-    w(ROOT / "README_FIVERR.md", textwrap.dedent("""\
+# ---------- docs ----------
+template("README_FIVERR.md", """\
     # SysOps Dashboard (Exoverse / REMI Media Ventures)
 
     ## Quick Deploy (S3 + CloudFront)
     ```bash
     npm ci
     npm run build
-    export S3_BUCKET_URL=s3://sysops.remimediaventures.com
+    export S3_BUCKET_URL=s3://@@{host}
     export CF_DISTRIBUTION_ID=XXXXXX
     make deploy-all
     ```
 
     CloudFront: SPA errors 403/404 -> /index.html, TLS via ACM for *.remimediaventures.com
 
+    ## Status cache (/ops/cache)
+    Every open dashboard polls the status, SLO, JIT and cost endpoints. `services/status-proxy`
+    collapses those polls into about one upstream call per interval (per-endpoint TTL,
+    stale-while-revalidate, ETag/304).
+    - Run it: copy `services/status-proxy/.env.example` to `.env`, then `make status-proxy` (port 8790).
+    - Production: add a CloudFront behavior (or nginx location) for `/ops/cache/*` -> the proxy,
+      with caching disabled and `If-None-Match` forwarded; the proxy does the caching.
+    - Dev: `npm run dev` already forwards `/ops/cache` to it (`STATUS_PROXY_URL` overrides the target).
+    - Point the dashboard at it: set the polled `VITE_*_URL`s in `.env` to the `/ops/cache/*` paths
+      listed in `.env.example`.
+
     ## Modes
     - Bootstrap: `REPO_BOOTSTRAP=1 node services/sysops/server.js`
     - JIT:       `REPO_BOOTSTRAP=0 REPO_JIT_ENABLED=1 node services/sysops/server.js`
 
     See SECURITY_NOTES.md for safety overview.
-    """))
+    """)
 
-    w(ROOT / "SECURITY_NOTES.md", textwrap.dedent("""\
+template("SECURITY_NOTES.md", """\
     # Security Notes
     - Static UI; does not touch local Git or keys.
     - Repo access only via D.A.D. (Bootstrap or JIT with approval).
     - Hosting needs no repo handshake; JIT lanes require existing integration.
     - Safety: REPO_BOOTSTRAP=0 in prod; REPO_JIT_ENABLED=0 kills new grants.
-    """))
+    """)
 
-    w(ROOT / "FIVERR_QUICKSTART.txt", textwrap.dedent(f"""\
+template("FIVERR_QUICKSTART.txt", """\
     TONIGHT DEPLOY — 5 STEPS (SysOps Dashboard)
 
     1) Install deps & build
        npm ci
        npm run build
 
-    2) (Optional) postbuild helpers
-       bash ops/write_health.sh dist
-       bash ops/inject_build_meta.sh dist
+    2) postbuild (npm run build runs it: writes dist/healthz.json, stamps index.html)
+       python3 ops/stamp_build.py dist
 
     3) Upload to S3
-       export S3_BUCKET_URL=s3://sysops.remimediaventures.com
+       export S3_BUCKET_URL=s3://@@{host}
        aws s3 sync dist/ $S3_BUCKET_URL/ --delete
 
     4) CloudFront
@@ -756,29 +1724,407 @@ def main():
        (Ensure SPA errors 403/404 -> /index.html; ACM cert for *.remimediaventures.com)
 
     5) Verify
-       curl -s https://sysops.remimediaventures.com/healthz.json | jq .
-       curl -sI https://sysops.remimediaventures.com/ | sed -n 's/^x-amz-meta-build-rev:.*/&/p'
+       curl -s https://@@{host}/healthz.json | jq .
+       curl -sI https://@@{host}/ | sed -n 's/^x-amz-meta-build-rev:.*/&/p'
 
     Setup-only (optional):
     - REPO_BOOTSTRAP=1 node services/sysops/server.js
     After setup:
     - REPO_BOOTSTRAP=0 REPO_JIT_ENABLED=1 node services/sysops/server.js
-    """))
+    """)
 
-    # ---------- prebuilt dist (placeholder so it's viewable immediately) ----------
-    (ROOT / "dist").mkdir(parents=True, exist_ok=True)
-    w(ROOT / "dist/index.html", "<!doctype html><html><body><div id='root'>Prebuilt SysOps Dashboard</div></body></html>")
-    w(ROOT / "dist/healthz.json", json.dumps({"status":"ok","ts":datetime.datetime.utcnow().isoformat()+"Z"}))
+# ---------- prebuilt dist (placeholder so it's viewable immediately) ----------
+template("dist/index.html", "<!doctype html><html><body><div id='root'>Prebuilt SysOps Dashboard</div></body></html>")
 
-    # ---------- zip everything ----------
-    if ZIP_PATH.exists(): ZIP_PATH.unlink()
-    with zipfile.ZipFile(ZIP_PATH, "w", zipfile.ZIP_DEFLATED) as z:
-        for p in ROOT.rglob("*"):
-            if p.is_file():
-                z.write(p, p.relative_to(ROOT))
+# every w() call lands here as (arcname, bytes, exec); the zip is built from this
+# list, so nothing is read back from disk and --zip-only never touches the tree
+_entries = []
+_write_tree = True
+_root = ROOT
+_report = None
 
-    print(f"\\n✅ Done. Folder created: {ROOT}")
-    print(f"✅ Handoff ZIP: {ZIP_PATH}")
+def w(path, content, exec=False):
+    data = content.encode("utf-8")
+    rel = path.relative_to(_root).as_posix()
+    _entries.append((rel, data, exec))
+    _report.file(rel)["bytes"] = len(data)
+    if not _write_tree:
+        return
+    if _incr is not None and _incr.skip(path, data, exec):
+        if _store is not None:
+            _store_refs[rel] = _store.put(data, exec)
+        return
+    t = time.perf_counter_ns()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    t = _report.span("mkdir", rel, t)
+    if _store is not None:
+        # the blob carries the mode; chmod here would change every tree sharing it
+        _store_refs[rel] = key = _store.put(data, exec)
+        _store.materialize(key, path)
+        _report.span("write", rel, t)
+    else:
+        with open(path, "wb") as f:
+            f.write(data)
+        t = _report.span("write", rel, t)
+        if exec:
+            os.chmod(path, 0o755)
+            _report.span("chmod", rel, t)
+    _report.file(rel)["written"] = True
+    if _incr is not None:
+        _incr.written(path)
+
+def main(incremental=False, reproducible=False, clock=None, write_tree=True,
+         root=ROOT, zip_path=ZIP_PATH, app=None, report_path=None, trace_path=None, policy=None,
+         zip_workers=None, delta_from=None, with_proxy=False, store=None, link="hardlink", validate_sources=False):
+    global _incr, _store, _write_tree, _root, _report
+    _report = BuildReport()
+    _entries.clear()
+    _write_tree = write_tree
+    _root = root
+    epoch = source_date_epoch() if reproducible else None
+    if clock is None:
+        clock = fixed_clock(epoch) if reproducible else utcnow
+    if not write_tree:
+        # zip-only: templates go straight from memory into the ZIP
+        pass
+    elif incremental:
+        # keep the tree; w() rewrites only what changed and finish() prunes the rest
+        _incr = IncrementalState(root)
+    elif root.exists():
+        # start fresh
+        shutil.rmtree(root)
+    if write_tree:
+        root.mkdir(parents=True, exist_ok=True)
+        if store:
+            _store = BlobStore(store, link)
+            _store_refs.clear()
+
+    values = app_vars(app, proxy=with_proxy)
+    for rel, (source, exec) in TEMPLATES.items():
+        t = time.perf_counter_ns()
+        content = render(source, values)
+        _report.span("render", rel, t)
+        w(root / rel, content, exec=exec)
+    # the proxy keeps the real upstreams; with --with-proxy the dashboard only sees /ops/cache/*
+    upstreams = app_vars(app)
+    for rel, path in BUNDLED_SOURCES.items():
+        w(root / rel, path.read_text(encoding="utf-8"), exec=True)
+    w(root / "services/status-proxy/.env.example", "".join(
+        f"UPSTREAM_{name}_URL={upstreams[var]}\n" for name, (var, _, _) in POLLED_ENDPOINTS.items()))
+    w(root / "dist/healthz.json", json.dumps({"status":"ok","ts":clock().isoformat()+"Z"}))
+
+    if _incr is not None:
+        counts = _incr.finish()
+        _incr = None
+        print("♻️  Incremental: " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+    if _store is not None:
+        _store.record(root, dict(_store_refs))
+        print(f"🗄  Store: {_store.counts['blobs_written']} new blobs ({_store.counts['bytes_written']} bytes), "
+              f"{_store.counts['blobs_reused']} reused")
+        _store = None
+
+    if validate_sources:
+        problems = validate(_entries)
+        if problems:
+            raise ValidationError(problems)
+
+    # ---------- zip everything ----------
+    policy = policy or CompressionPolicy()
+    _report.policy = policy.as_dict()
+    t = time.perf_counter_ns()
+    digest = write_zip(_entries, zip_path, epoch, _report, policy, zip_workers)
+    _report.zip_wall_ns = time.perf_counter_ns() - t
+    # index of this bundle, so the next release can diff against it without the zip
+    index_path = zip_path.with_name(zip_path.stem + ".index.json")
+    index_path.write_text(json.dumps(bundle_index(_entries), indent=1, sort_keys=True), encoding="utf-8")
+    if delta_from:
+        delta_path = zip_path.with_name(zip_path.stem + ".delta.zip")
+        d = write_delta(read_index(delta_from), _entries, delta_path, epoch, policy)
+        print(f"✅ Delta ZIP: {delta_path} ({len(d['added'])} added, {len(d['changed'])} changed, "
+              f"{len(d['removed'])} removed, {delta_path.stat().st_size} bytes)")
+    if report_path:
+        _report.dump(report_path, zip_path)
+    if trace_path:
+        _report.dump_trace(trace_path)
+
+    if write_tree:
+        print(f"\\n✅ Done. Folder created: {root}")
+    print(f"✅ Handoff ZIP: {zip_path}")
+    if reproducible:
+        print(f"✅ SHA-256: {digest}")
+    return digest
+
+def _build_app(app, out_dir, opts):
+    # process-pool worker: one bundle per manifest app, isolated module state per process
+    root = out_dir / app["app"]
+    zip_path = out_dir / f"{app['app']}-fullbundle.zip"
+    digest = main(root=root, zip_path=zip_path, app=app, **opts)
+    return app["app"], zip_path, digest
+
+def build_manifest(manifest=MANIFEST, out_dir=None, jobs=None, **opts):
+    """Generate one bundle per app in the Umbrella manifest, concurrently."""
+    apps = sorted(json.loads(pathlib.Path(manifest).read_text(encoding="utf-8"))["apps"], key=lambda a: a["order"])
+    out_dir = pathlib.Path(out_dir) if out_dir else pathlib.Path.cwd() / "bundles"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(_build_app, apps, [out_dir] * len(apps), [opts] * len(apps)))
+    for name, zip_path, digest in results:
+        print(f"📦 {name}: {zip_path}" + (f" ({digest[:12]})" if opts.get("reproducible") else ""))
+    if opts.get("store") and opts.get("write_tree", True):
+        st = BlobStore(opts["store"]).stats()
+        print(f"🗄  {opts['store']}: {st['blobs']} blobs, {st['blob_bytes']} bytes on disk for "
+              f"{st['referenced_files']} files ({st['referenced_bytes']} bytes) across {len(results)} trees")
+    return results
+
+# ---------- watch mode ----------
+# Long-lived loop for template work: templates live in this file, so an edit re-executes
+# it in a scratch namespace, re-renders only the templates whose source (or variables)
+# changed, swaps those files in atomically and rebuilds the ZIP once edits go quiet.
+
+# inotify(7) masks: a save lands as a close-after-write, or as a rename over the file
+IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x8, 0x80, 0x100
+
+class FileWatcher:
+    """Waits for writes to `paths`: inotify on the parent directories where libc has it,
+    mtime polling every `poll` seconds elsewhere."""
+
+    def __init__(self, paths, poll=0.05):
+        self.paths = {pathlib.Path(p).resolve() for p in paths}
+        self.poll = poll
+        self.fd = None
+        try:
+            import ctypes, ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self.dirs = {}
+                for d in {p.parent for p in self.paths}:
+                    wd = libc.inotify_add_watch(fd, os.fsencode(d), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+                    self.dirs[wd] = d
+                self.fd = fd
+        except (OSError, AttributeError):
+            pass
+        self.mtimes = {p: self._mtime(p) for p in self.paths}
+
+    @staticmethod
+    def _mtime(p):
+        try:
+            return p.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _drain(self):
+        changed = set()
+        while select.select([self.fd], [], [], 0)[0]:
+            buf = os.read(self.fd, 65536)
+            i = 0
+            while i < len(buf):
+                wd, _, _, n = struct.unpack_from("iIII", buf, i)
+                name = buf[i + 16:i + 16 + n].rstrip(b"\0")
+                i += 16 + n
+                p = self.dirs.get(wd, pathlib.Path("/")) / os.fsdecode(name)
+                if p in self.paths:
+                    changed.add(p)
+        return changed
+
+    def wait(self, timeout=None):
+        """Set of paths written since the last call; empty after `timeout` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.fd is not None:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                if select.select([self.fd], [], [], remaining)[0]:
+                    # editors often write in several steps; let the burst settle
+                    time.sleep(0.01)
+                    changed = self._drain()
+                    if changed:
+                        return changed
+            else:
+                changed = set()
+                for p in self.paths:
+                    m = self._mtime(p)
+                    if m != self.mtimes[p]:
+                        self.mtimes[p] = m
+                        changed.add(p)
+                if changed:
+                    return changed
+                time.sleep(self.poll if deadline is None else min(self.poll, max(0, deadline - time.monotonic())))
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+def _write_atomic(path, data, exec=False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.watch.tmp")
+    tmp.write_bytes(data)
+    os.chmod(tmp, 0o755 if exec else 0o644)
+    os.replace(tmp, path)
+
+def watch(root=ROOT, zip_path=ZIP_PATH, app=None, debounce=0.5, reproducible=False, policy=None,
+          zip_workers=None, with_proxy=False, source=None, log=print):
+    """Build once (incrementally), then keep the tree in step with edits to `source`
+    (default: this file) until interrupted."""
+    import runpy
+    source = pathlib.Path(source or __file__).resolve()
+    main(incremental=True, reproducible=reproducible, root=root, zip_path=zip_path, app=app,
+         policy=policy, zip_workers=zip_workers, with_proxy=with_proxy)
+    entries = {rel: (data, exec) for rel, data, exec in _entries}
+    templates, values = dict(TEMPLATES), app_vars(app, proxy=with_proxy)
+    epoch = source_date_epoch() if reproducible else None
+    watcher = FileWatcher([source, *BUNDLED_SOURCES.values()])
+    log(f"👀 Watching {', '.join(str(p) for p in sorted(watcher.paths))} "
+        f"({'inotify' if watcher.fd is not None else 'polling'}); Ctrl-C to stop")
+    zip_due = None
+    try:
+        while True:
+            changed = watcher.wait(None if zip_due is None else max(0, zip_due - time.monotonic()))
+            if not changed:
+                digest = write_zip([(rel, *e) for rel, e in entries.items()], zip_path, epoch, policy=policy,
+                                   workers=zip_workers)
+                log(f"📦 {zip_path}" + (f" ({digest[:12]})" if reproducible else ""))
+                zip_due = None
+                continue
+            t = time.perf_counter()
+            outputs = {}
+            if source in changed:
+                try:
+                    ns = runpy.run_path(str(source), run_name="_watch")
+                    new_values = ns["app_vars"](app, proxy=with_proxy)
+                    new_templates = dict(ns["TEMPLATES"])
+                except Exception as e:
+                    # keep serving the last good tree while the file is mid-edit
+                    log(f"❌ {source.name}: {type(e).__name__}: {e}")
+                    continue
+                dirty = [rel for rel, entry in new_templates.items()
+                         if new_values != values or templates.get(rel) != entry]
+                for rel in dirty:
+                    src, exec = new_templates[rel]
+                    outputs[rel] = (ns["render"](src, new_values).encode("utf-8"), exec)
+                for rel in set(templates) - set(new_templates):
+                    (root / rel).unlink(missing_ok=True)
+                    entries.pop(rel, None)
+                    log(f"🗑  {rel}")
+                templates, values = new_templates, new_values
+            for rel, path in BUNDLED_SOURCES.items():
+                if path.resolve() in changed:
+                    outputs[rel] = (path.read_bytes(), True)
+            written = [rel for rel, e in outputs.items() if entries.get(rel) != e]
+            for rel in written:
+                _write_atomic(root / rel, *outputs[rel])
+                entries[rel] = outputs[rel]
+            if written:
+                zip_due = time.monotonic() + debounce
+                log(f"♻️  {', '.join(sorted(written))} ({(time.perf_counter() - t) * 1000:.1f} ms)")
+                # already on disk for the dev server; flag what a real build would trip over
+                for problem in validate([(rel, *e) for rel, e in entries.items()]):
+                    log(f"⚠️  {problem}")
+    except KeyboardInterrupt:
+        if zip_due is not None:
+            write_zip([(rel, *e) for rel, e in entries.items()], zip_path, epoch, policy=policy, workers=zip_workers)
+    return entries
 
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description="Generate the SysOps Dashboard tree and handoff ZIP.")
+    ap.add_argument("--incremental", action="store_true",
+                    help="keep the existing tree; rewrite only changed files and prune stale ones")
+    ap.add_argument("--reproducible", action="store_true",
+                    help="sorted entries, SOURCE_DATE_EPOCH timestamps and normalized modes for a byte-identical ZIP")
+    ap.add_argument("--zip-only", action="store_true",
+                    help="stream files straight into the ZIP without materializing the sysops-dashboard/ tree")
+    ap.add_argument("--level", type=int, choices=range(0, 10), metavar="0-9",
+                    help="deflate/lzma level for compressible entries (default: zlib default)")
+    ap.add_argument("--lzma", action="store_true", help="LZMA for compressible entries (max-shrink archival builds)")
+    ap.add_argument("--store-below", type=int, default=0, metavar="BYTES",
+                    help="store entries smaller than this uncompressed (default: 0)")
+    ap.add_argument("--zip-workers", type=int, metavar="N",
+                    help="threads compressing ZIP entries (default: CPU count)")
+    ap.add_argument("--watch", action="store_true",
+                    help="after building, rewrite only the outputs whose template changes on every save; ZIP is debounced")
+    ap.add_argument("--debounce", type=float, default=0.5, metavar="SECONDS",
+                    help="quiet time before --watch rebuilds the ZIP (default: 0.5)")
+    ap.add_argument("--with-proxy", action="store_true",
+                    help="point the polled VITE_* endpoints at the bundled status proxy (/ops/cache/*)")
+    ap.add_argument("--report", metavar="PATH",
+                    help="write a JSON report of per-file bytes/timings, phase totals and compression ratios")
+    ap.add_argument("--trace", metavar="PATH", help="write a Chrome trace (chrome://tracing, Perfetto) of the run")
+    ap.add_argument("--delta-from", metavar="PATH",
+                    help="also emit <bundle>.delta.zip against a previous bundle zip, tree or .index.json")
+    ap.add_argument("--apply-delta", nargs=3, metavar=("BASE", "DELTA", "OUT"),
+                    help="rebuild a full bundle (OUT dir, or .zip) from BASE + DELTA and exit")
+    ap.add_argument("--stamp", metavar="DIST",
+                    help="write DIST/healthz.json and inject build meta into HTML (the bundle's postbuild, ops/stamp_build.py) and exit")
+    ap.add_argument("--html", nargs="+", metavar="FILE", help="HTML files for --stamp (default: DIST/index.html)")
+    ap.add_argument("--fingerprint", metavar="DIST",
+                    help="content-hash asset names, precompress and write DIST.cache.json, then exit (after --stamp if both)")
+    ap.add_argument("--fingerprint-workers", type=int, metavar="N",
+                    help="threads precompressing --fingerprint output (default: CPU count)")
+    ap.add_argument("--cache-manifest", metavar="PATH", help="cache-policy manifest for --fingerprint (default: DIST.cache.json)")
+    ap.add_argument("--store", nargs="?", const=".blobstore", metavar="DIR",
+                    help="write each distinct file once into a content-addressed store and link it into the tree(s)")
+    ap.add_argument("--link", choices=("hardlink", "reflink", "copy"), default="hardlink",
+                    help="how --store materializes files (default: hardlink; read-only, shared)")
+    ap.add_argument("--store-gc", metavar="DIR", help="delete blobs no live tree references from a store and exit")
+    ap.add_argument("--no-validate", action="store_true",
+                    help="skip the pre-flight checks (JSON, bracket/JSX balance, env vars, script refs) before zipping")
+    ap.add_argument("--validate", metavar="PATH", help="run the pre-flight checks on an existing tree or bundle zip and exit")
+    ap.add_argument("--manifest", nargs="?", const=str(MANIFEST), metavar="PATH",
+                    help="build one bundle per app in an Umbrella manifest (default: umbrella1_manifest.json)")
+    ap.add_argument("--out", metavar="DIR", help="output directory for --manifest bundles (default: ./bundles)")
+    ap.add_argument("--jobs", type=int, help="worker processes for --manifest (default: CPU count)")
+    args = ap.parse_args()
+    if args.stamp or args.fingerprint:
+        if args.stamp:
+            now = None
+            if args.reproducible:
+                now = datetime.datetime.fromtimestamp(source_date_epoch(), datetime.timezone.utc)
+            for path in stamp(args.stamp, args.html, now):
+                print(f"✅ stamped {path}")
+        if args.fingerprint:
+            doc = fingerprint(args.fingerprint, args.cache_manifest, args.fingerprint_workers)
+            variants = sum(len(f["encodings"]) for f in doc["files"].values())
+            print(f"✅ fingerprinted {args.fingerprint}: {len(doc['files'])} files, {len(doc['renamed'])} renamed, "
+                  f"{variants} precompressed variants ({', '.join(ENCODINGS)})")
+        raise SystemExit(0)
+    if args.validate:
+        t = time.perf_counter()
+        problems = validate(read_entries(args.validate))
+        for line in problems:
+            print(f"❌ {line}")
+        print(f"{'❌' if problems else '✅'} {args.validate}: {len(problems)} problem(s) "
+              f"in {(time.perf_counter() - t) * 1000:.0f} ms")
+        raise SystemExit(1 if problems else 0)
+    if args.store_gc:
+        store = BlobStore(args.store_gc)
+        removed, freed = store.gc()
+        print(f"🧹 {args.store_gc}: removed {removed} blobs ({freed} bytes); " +
+              ", ".join(f"{k}={v}" for k, v in store.stats().items()))
+        raise SystemExit(0)
+    if args.apply_delta:
+        base, delta, out = args.apply_delta
+        out = apply_delta(base, delta, out, source_date_epoch() if args.reproducible else None)
+        print(f"✅ Rebuilt: {out}")
+        raise SystemExit(0)
+    if args.zip_only and (args.incremental or args.watch or args.store):
+        ap.error("--incremental/--watch/--store need the on-disk tree; drop --zip-only")
+    if args.watch and args.store:
+        ap.error("--watch writes private files, not store links; drop --store")
+    policy = CompressionPolicy(zipfile.ZIP_LZMA if args.lzma else zipfile.ZIP_DEFLATED, args.level, args.store_below)
+    opts = dict(incremental=args.incremental, reproducible=args.reproducible, write_tree=not args.zip_only,
+                policy=policy, zip_workers=args.zip_workers, with_proxy=args.with_proxy,
+                store=args.store, link=args.link, validate_sources=not args.no_validate)
+    if args.watch:
+        if args.manifest or args.report or args.trace or args.delta_from:
+            ap.error("--watch runs a single bundle without --report/--trace/--delta-from")
+        watch(debounce=args.debounce, reproducible=args.reproducible, policy=policy,
+              zip_workers=args.zip_workers, with_proxy=args.with_proxy)
+    elif args.manifest:
+        if args.report or args.trace or args.delta_from:
+            ap.error("--report/--trace/--delta-from apply to single-bundle runs")
+        try:
+            build_manifest(args.manifest, args.out, args.jobs, **opts)
+        except ValidationError as e:
+            raise SystemExit(f"❌ {e}")
+    else:
+        try:
+            main(report_path=args.report, trace_path=args.trace, delta_from=args.delta_from, **opts)
+        except ValidationError as e:
+            raise SystemExit(f"❌ {e}")
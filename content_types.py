@@ -0,0 +1,17 @@
+# content_types.py
+# Content-Type for a dist/ path, shared by build_sysops_dashboard.py --fingerprint (written
+# into <dist>.cache.json) and dist_upload.py (dists uploaded without a cache manifest), so
+# both agree on what a file is served as. Stdlib only.
+
+import mimetypes
+
+# served as-is regardless of what the platform's mime.types says
+FIXED = {".html": "text/html; charset=utf-8", ".map": "application/json"}
+
+def content_type(rel):
+    """Content-Type header for `rel`; text and JavaScript types carry charset=utf-8."""
+    for suffix, ctype in FIXED.items():
+        if rel.endswith(suffix):
+            return ctype
+    ctype = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+    return ctype + "; charset=utf-8" if ctype.startswith("text/") or ctype.endswith("javascript") else ctype
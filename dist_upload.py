@@ -0,0 +1,488 @@
+# dist_upload.py
+# Skip-unchanged uploader for a built dashboard dist/, replacing the `aws s3 sync` +
+# ops/set_cache_headers.sh loop in `make deploy-all`. Compares content hashes with a
+# manifest kept in the bucket, uploads only what changed over pooled keep-alive
+# connections (multipart for big files), sets Cache-Control/Content-Type/Content-Encoding
+# from <dist>.cache.json (build_sysops_dashboard.py --fingerprint), and invalidates only
+# the changed no-cache paths. SigV4 signing, stdlib only.
+#
+#   python dist_upload.py stub --port 8789                     # local S3 + CloudFront stand-in
+#   python dist_upload.py upload dist --bucket s3://sysops-dash --endpoint http://127.0.0.1:8789 \
+#       --distribution-id E123 --cloudfront-endpoint http://127.0.0.1:8789
+#   S3_BUCKET_URL=s3://sysops-dash CF_DISTRIBUTION_ID=E123 python dist_upload.py upload dist
+
+import os, sys, hmac, json, time, uuid, random, hashlib, pathlib, posixpath, argparse, datetime, threading
+import http.client, http.server, urllib.parse, concurrent.futures, xml.etree.ElementTree as ET
+
+from content_types import content_type
+
+REMOTE_MANIFEST = ".dist-manifest.json"
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+# objects at least this big go up as multipart, PART_SIZE per part (S3 minimum is 5 MiB)
+MULTIPART_MIN = 16 << 20
+PART_SIZE = 8 << 20
+# used when dist has no cache manifest; same split as ops/set_cache_headers.sh
+FALLBACK_RULES = (("assets/", "public,max-age=31536000,immutable"), ("", "no-cache"))
+S3_NS = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+CF_API = "/2020-05-31"
+
+# ---------- SigV4 ----------
+
+def _hmac(key, msg):
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+def _quote(s, safe="-_.~"):
+    return urllib.parse.quote(s, safe=safe)
+
+def sign(method, host, path, query, headers, payload_hash, service, region, creds, now=None):
+    """Add SigV4 `authorization` (and x-amz-date/-content-sha256/-security-token) to `headers`."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    amz_date, day = now.strftime("%Y%m%dT%H%M%SZ"), now.strftime("%Y%m%d")
+    headers.update({"host": host, "x-amz-date": amz_date, "x-amz-content-sha256": payload_hash})
+    if creds.get("token"):
+        headers["x-amz-security-token"] = creds["token"]
+    names = sorted(k.lower() for k in headers)
+    lower = {k.lower(): str(v).strip() for k, v in headers.items()}
+    canonical = "\n".join((
+        method, _quote(path, safe="/-_.~"),
+        "&".join(f"{_quote(k)}={_quote(v)}" for k, v in sorted(query.items())),
+        "".join(f"{n}:{lower[n]}\n" for n in names), ";".join(names), payload_hash))
+    scope = f"{day}/{region}/{service}/aws4_request"
+    to_sign = f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+    key = _hmac(("AWS4" + creds["secret"]).encode("utf-8"), day)
+    for part in (region, service, "aws4_request"):
+        key = _hmac(key, part)
+    signature = hmac.new(key, to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    headers["authorization"] = (f"AWS4-HMAC-SHA256 Credential={creds['key']}/{scope}, "
+                                f"SignedHeaders={';'.join(names)}, Signature={signature}")
+    return headers
+
+def env_creds(env=os.environ):
+    return {"key": env.get("AWS_ACCESS_KEY_ID", "local"), "secret": env.get("AWS_SECRET_ACCESS_KEY", "local"),
+            "token": env.get("AWS_SESSION_TOKEN")}
+
+# ---------- pooled, signed HTTP client ----------
+
+class Client:
+    """One keep-alive connection per worker thread; signed requests with jittered retries."""
+
+    def __init__(self, endpoint, service, region, creds, timeout=30.0, retries=4, backoff=0.25):
+        u = urllib.parse.urlsplit(endpoint)
+        self.scheme, self.host, self.port = u.scheme, u.hostname, u.port
+        self.netloc = u.netloc
+        self.service, self.region, self.creds = service, region, creds
+        self.timeout, self.retries, self.backoff = timeout, retries, backoff
+        self.local = threading.local()
+        self.requests = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def _conn(self):
+        c = getattr(self.local, "conn", None)
+        if c is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            c = self.local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return c
+
+    def _drop(self):
+        c = getattr(self.local, "conn", None)
+        if c is not None:
+            c.close()
+            self.local.conn = None
+
+    def request(self, method, path, query=None, body=b"", headers=None, ok=(200,)):
+        """(status, headers, body); raises after retries on anything outside `ok`."""
+        query = query or {}
+        payload_hash = hashlib.sha256(body).hexdigest()
+        url = _quote(path, safe="/-_.~") + ("?" + "&".join(
+            f"{_quote(k)}={_quote(v)}" if v != "" else _quote(k) for k, v in sorted(query.items())) if query else "")
+        for attempt in range(self.retries + 1):
+            h = sign(method, self.netloc, path, query, dict(headers or {}), payload_hash,
+                     self.service, self.region, self.creds)
+            h["content-length"] = str(len(body))
+            try:
+                c = self._conn()
+                c.request(method, url, body=body, headers=h)
+                r = c.getresponse()
+                data = r.read()
+                with self.lock:
+                    self.requests += 1
+                    self.bytes += len(body)
+                if r.will_close:
+                    self._drop()
+                if r.status in ok:
+                    return r.status, {k.lower(): v for k, v in r.getheaders()}, data
+                if r.status not in RETRY_STATUS or attempt == self.retries:
+                    raise RuntimeError(f"{method} {path} -> {r.status}: {data[:200]!r}")
+            except (OSError, http.client.HTTPException):
+                self._drop()
+                if attempt == self.retries:
+                    raise
+            time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+# ---------- S3 / CloudFront operations ----------
+
+class Bucket:
+    """Path-style access to s3://<name>/<prefix> through `client`."""
+
+    def __init__(self, client, url):
+        u = urllib.parse.urlsplit(url)
+        self.client, self.name, self.prefix = client, u.netloc, u.path.strip("/")
+
+    def path(self, rel=""):
+        return "/" + "/".join(p for p in (self.name, self.prefix, rel) if p)
+
+    def get(self, rel):
+        status, _, data = self.client.request("GET", self.path(rel), ok=(200, 404))
+        return data if status == 200 else None
+
+    def put(self, rel, body, headers):
+        return self.client.request("PUT", self.path(rel), body=body, headers=headers)[1].get("etag")
+
+    def delete(self, rel):
+        self.client.request("DELETE", self.path(rel), ok=(200, 204, 404))
+
+    def list(self):
+        """{relative key: ETag} for everything under the prefix."""
+        out, token = {}, None
+        prefix = self.prefix + "/" if self.prefix else ""
+        while True:
+            q = {"list-type": "2", "prefix": prefix}
+            if token:
+                q["continuation-token"] = token
+            _, _, data = self.client.request("GET", "/" + self.name, q)
+            root = ET.fromstring(data)
+            for c in root.iter(S3_NS + "Contents"):
+                out[c.find(S3_NS + "Key").text[len(prefix):]] = c.find(S3_NS + "ETag").text.strip('"')
+            token = root.findtext(S3_NS + "NextContinuationToken")
+            if root.findtext(S3_NS + "IsTruncated") != "true" or not token:
+                return out
+
+    def put_multipart(self, rel, path, size, headers, workers=4):
+        _, _, data = self.client.request("POST", self.path(rel), {"uploads": ""}, headers=headers)
+        upload_id = ET.fromstring(data).findtext(S3_NS + "UploadId")
+        def part(n):
+            with open(path, "rb") as f:
+                f.seek((n - 1) * PART_SIZE)
+                chunk = f.read(PART_SIZE)
+            _, h, _ = self.client.request("PUT", self.path(rel), {"partNumber": str(n), "uploadId": upload_id}, chunk)
+            return n, h.get("etag")
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(part, range(1, -(-size // PART_SIZE) + 1)))
+        except Exception:
+            self.client.request("DELETE", self.path(rel), {"uploadId": upload_id}, ok=(200, 204, 404))
+            raise
+        body = ("<CompleteMultipartUpload>" + "".join(
+            f"<Part><PartNumber>{n}</PartNumber><ETag>{etag}</ETag></Part>" for n, etag in parts)
+            + "</CompleteMultipartUpload>").encode("utf-8")
+        _, _, data = self.client.request("POST", self.path(rel), {"uploadId": upload_id}, body)
+        return ET.fromstring(data).findtext(S3_NS + "ETag")
+
+def invalidate(client, distribution_id, paths):
+    """CloudFront CreateInvalidation for `paths`; returns the invalidation id."""
+    items = "".join(f"<Path>{_quote(p, safe='/-_.~*')}</Path>" for p in paths)
+    body = (f'<InvalidationBatch xmlns="http://cloudfront.amazonaws.com/doc{CF_API}/">'
+            f"<Paths><Quantity>{len(paths)}</Quantity><Items>{items}</Items></Paths>"
+            f"<CallerReference>dist-upload-{uuid.uuid4().hex}</CallerReference></InvalidationBatch>").encode("utf-8")
+    _, _, data = client.request("POST", f"{CF_API}/distribution/{distribution_id}/invalidation", body=body,
+                                headers={"content-type": "text/xml"}, ok=(200, 201))
+    return ET.fromstring(data).findtext("{http://cloudfront.amazonaws.com/doc%s/}Id" % CF_API)
+
+# ---------- local plan ----------
+
+class StaleManifest(Exception):
+    """dist/ no longer matches its cache manifest; rerun --fingerprint before uploading."""
+
+def local_objects(dist, cache_manifest=None, encoding="gzip"):
+    """[{key, path, size, sha256, headers}] for dist. With a cache manifest the stored
+    `encoding` variant (if any) is uploaded in place of the file, with Content-Encoding.
+    Hashes always come from the bytes on disk; a file that no longer matches the manifest
+    (edited after --fingerprint, so its variants are stale too) raises StaleManifest."""
+    dist = pathlib.Path(dist)
+    cache_manifest = pathlib.Path(cache_manifest) if cache_manifest else dist.with_name(dist.name + ".cache.json")
+    objects = []
+    if cache_manifest.is_file():
+        files = json.loads(cache_manifest.read_text(encoding="utf-8"))["files"]
+        known = set(files) | {posixpath.join(posixpath.dirname(rel), v["path"])
+                              for rel, f in files.items() for v in f["encodings"].values()}
+        extra = sorted(rel for rel in (p.relative_to(dist).as_posix() for p in dist.rglob("*") if p.is_file())
+                       if rel not in known)
+        if extra:
+            raise StaleManifest(f"{extra[0]} is in {dist} but not in {cache_manifest}; rerun --fingerprint")
+        for rel, f in sorted(files.items()):
+            headers = {"cache-control": f["cache_control"], "content-type": f["content_type"]}
+            path = dist / rel
+            try:
+                digest = _digest(path, "sha256")
+            except FileNotFoundError:
+                raise StaleManifest(f"{rel} is in {cache_manifest} but not in {dist}") from None
+            if digest != f["sha256"]:
+                raise StaleManifest(f"{rel} changed after {cache_manifest} was written; rerun --fingerprint")
+            variant = f["encodings"].get(encoding)
+            if variant:
+                path = path.with_name(variant["path"])
+                digest = _digest(path, "sha256")
+                headers["content-encoding"] = encoding
+            objects.append({"key": rel, "path": path, "size": path.stat().st_size, "sha256": digest,
+                            "headers": headers})
+        return objects
+    for p in sorted(dist.rglob("*")):
+        rel = p.relative_to(dist).as_posix()
+        if not p.is_file() or (p.suffix in (".gz", ".br", ".zst") and p.with_suffix("").is_file()):
+            continue
+        cache = next(c for prefix, c in FALLBACK_RULES if rel.startswith(prefix))
+        objects.append({"key": rel, "path": p, "size": p.stat().st_size, "sha256": _digest(p, "sha256"),
+                        "headers": {"cache-control": cache, "content-type": content_type(rel)}})
+    return objects
+
+def fingerprint(obj):
+    """What the remote manifest remembers: body hash plus the headers we set."""
+    return hashlib.sha256((obj["sha256"] + json.dumps(obj["headers"], sort_keys=True)).encode("utf-8")).hexdigest()
+
+def _digest(path, algorithm):
+    h = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def invalidation_paths(keys):
+    paths = set()
+    for key in keys:
+        paths.add("/" + key)
+        if key == "index.html" or key.endswith("/index.html"):
+            paths.add("/" + key[:-len("index.html")])
+    return sorted(paths)
+
+# ---------- upload ----------
+
+def upload(dist, bucket, distribution_id=None, cf_client=None, workers=8, cache_manifest=None,
+           encoding="gzip", delete=False, force=False, dry_run=False, log=print):
+    """Upload what changed in `dist` to `bucket` (a Bucket), then invalidate changed
+    no-cache paths. Immutable objects go first so index.html never points at a missing asset."""
+    t0 = time.perf_counter()
+    objects = local_objects(dist, cache_manifest, encoding)
+    raw = bucket.get(REMOTE_MANIFEST)
+    remote = json.loads(raw) if raw else {}
+    etags = None
+    if raw is None:
+        # first run against an existing bucket: single-part ETags are MD5s of the body
+        etags = bucket.list()
+        if not force:
+            remote = {o["key"]: fingerprint(o) for o in objects
+                      if etags.get(o["key"]) == _digest(o["path"], "md5") and "content-encoding" not in o["headers"]}
+    # --force re-sends everything but still reads the remote side, so --delete finds stale keys
+    todo = objects if force else [o for o in objects if remote.get(o["key"]) != fingerprint(o)]
+    stale = sorted(set(remote if etags is None else etags) - {o["key"] for o in objects} - {REMOTE_MANIFEST})
+
+    def send(o):
+        if o["size"] >= MULTIPART_MIN:
+            bucket.put_multipart(o["key"], o["path"], o["size"], o["headers"])
+        else:
+            bucket.put(o["key"], o["path"].read_bytes(), o["headers"])
+        return o
+
+    done, failed = {}, []
+    if not dry_run:
+        first = [o for o in todo if "immutable" in o["headers"]["cache-control"]]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            for wave in (first, [o for o in todo if o not in first]):
+                if failed:
+                    # an asset is missing: publishing index.html now would point at it
+                    log(f"❌ {len(failed)} immutable upload(s) failed; not uploading no-cache objects")
+                    break
+                for f in concurrent.futures.as_completed([pool.submit(send, o) for o in wave]):
+                    try:
+                        o = f.result()
+                        done[o["key"]] = fingerprint(o)
+                    except Exception as e:
+                        failed.append(str(e))
+        if delete and not failed:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(bucket.delete, stale))
+        # keep entries for what's still there; failures stay out so the next run retries them
+        current = {o["key"] for o in objects}
+        manifest = {k: v for k, v in remote.items() if k in current or (k in stale and not delete)}
+        manifest.update(done)
+        bucket.put(REMOTE_MANIFEST, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"),
+                   {"content-type": "application/json", "cache-control": "no-cache"})
+
+    changed = [o["key"] for o in todo if "immutable" not in o["headers"]["cache-control"]
+               and (dry_run or o["key"] in done)]
+    paths = invalidation_paths(changed + (stale if delete else []))
+    invalidation = None
+    if paths and distribution_id and cf_client and not dry_run and not failed:
+        invalidation = invalidate(cf_client, distribution_id, paths)
+    for err in failed:
+        log(f"❌ {err}")
+    summary = {"objects": len(objects), "uploaded": len(done), "skipped": len(objects) - len(todo),
+               "failed": len(failed), "deleted": len(stale) if delete and not dry_run and not failed else 0,
+               "bytes": sum(o["size"] for o in todo if o["key"] in done),
+               "invalidated": paths, "invalidation": invalidation,
+               "requests": bucket.client.requests, "seconds": round(time.perf_counter() - t0, 3)}
+    if dry_run:
+        log("would upload: " + ", ".join(o["key"] for o in todo))
+    log("== Done == " + ", ".join(f"{k}={v}" for k, v in summary.items()))
+    return summary
+
+# ---------- local S3 + CloudFront stand-in ----------
+
+class StubS3(http.server.ThreadingHTTPServer):
+    """Path-style S3 subset (PUT/GET/HEAD/DELETE object, ListObjectsV2, multipart) and
+    CloudFront CreateInvalidation, in memory. Signatures are not checked."""
+
+    daemon_threads = True
+
+    def __init__(self, addr):
+        super().__init__(addr, StubHandler)
+        self.objects = {}          # "bucket/key" -> (bytes, headers)
+        self.uploads = {}          # upload id -> (bucket/key, headers, {part: bytes})
+        self.invalidations = []
+        self.requests = 0
+        self.lock = threading.Lock()
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    STORED = ("cache-control", "content-type", "content-encoding")
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, code, body=b"", headers=()):
+        self.send_response(code)
+        for k, v in headers:
+            self.send_header(k, v)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _xml(self, code, body):
+        self._reply(code, body.encode("utf-8"), [("content-type", "application/xml")])
+
+    def _target(self):
+        u = urllib.parse.urlsplit(self.path)
+        with self.server.lock:
+            self.server.requests += 1
+        return urllib.parse.unquote(u.path.lstrip("/")), dict(urllib.parse.parse_qsl(u.query, keep_blank_values=True))
+
+    def do_GET(self):
+        key, q = self._target()
+        if key == "_stub/state":
+            with self.server.lock:
+                doc = {"requests": self.server.requests, "invalidations": self.server.invalidations,
+                       "objects": {k: {"size": len(v[0]), **v[1]} for k, v in self.server.objects.items()}}
+            return self._reply(200, json.dumps(doc).encode("utf-8"), [("content-type", "application/json")])
+        if q.get("list-type") == "2":
+            prefix = key + "/" + q.get("prefix", "")
+            with self.server.lock:
+                keys = sorted(k for k in self.server.objects if k.startswith(prefix))
+                items = "".join(f"<Contents><Key>{k.split('/', 1)[1]}</Key><ETag>&quot;{self.server.objects[k][1]['etag']}"
+                                f"&quot;</ETag><Size>{len(self.server.objects[k][0])}</Size></Contents>" for k in keys)
+            return self._xml(200, f'<ListBucketResult xmlns="{S3_NS[1:-1]}"><IsTruncated>false</IsTruncated>'
+                                  f"{items}</ListBucketResult>")
+        with self.server.lock:
+            obj = self.server.objects.get(key)
+        if obj is None:
+            return self._xml(404, "<Error><Code>NoSuchKey</Code></Error>")
+        self._reply(200, obj[0], [(k, v) for k, v in obj[1].items() if k in self.STORED + ("etag",)])
+
+    do_HEAD = do_GET
+
+    def do_PUT(self):
+        key, q = self._target()
+        body = self.rfile.read(int(self.headers.get("content-length") or 0))
+        etag = hashlib.md5(body).hexdigest()
+        with self.server.lock:
+            if "uploadId" in q:
+                self.server.uploads[q["uploadId"]][2][int(q["partNumber"])] = body
+            else:
+                meta = {k: self.headers[k] for k in self.STORED if self.headers.get(k)}
+                self.server.objects[key] = (body, dict(meta, etag=etag))
+        self._reply(200, headers=[("etag", f'"{etag}"')])
+
+    def do_POST(self):
+        key, q = self._target()
+        body = self.rfile.read(int(self.headers.get("content-length") or 0))
+        if key.startswith(CF_API.lstrip("/") + "/distribution/"):
+            paths = [p.text for p in ET.fromstring(body).iter() if p.tag.endswith("}Path")]
+            with self.server.lock:
+                self.server.invalidations.append({"distribution": key.split("/")[2], "paths": paths})
+                inv = f"I{len(self.server.invalidations)}"
+            return self._xml(201, f'<Invalidation xmlns="http://cloudfront.amazonaws.com/doc{CF_API}/">'
+                                  f"<Id>{inv}</Id><Status>InProgress</Status></Invalidation>")
+        if "uploads" in q:
+            upload_id = uuid.uuid4().hex
+            meta = {k: self.headers[k] for k in self.STORED if self.headers.get(k)}
+            with self.server.lock:
+                self.server.uploads[upload_id] = (key, meta, {})
+            return self._xml(200, f'<InitiateMultipartUploadResult xmlns="{S3_NS[1:-1]}">'
+                                  f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>")
+        if "uploadId" in q:
+            with self.server.lock:
+                dest, meta, parts = self.server.uploads.pop(q["uploadId"])
+                data = b"".join(parts[n] for n in sorted(parts))
+                etag = hashlib.md5(b"".join(hashlib.md5(parts[n]).digest() for n in sorted(parts))).hexdigest()
+                etag += f"-{len(parts)}"
+                self.server.objects[dest] = (data, dict(meta, etag=etag))
+            return self._xml(200, f'<CompleteMultipartUploadResult xmlns="{S3_NS[1:-1]}">'
+                                  f"<ETag>&quot;{etag}&quot;</ETag></CompleteMultipartUploadResult>")
+        self._xml(400, "<Error><Code>InvalidRequest</Code></Error>")
+
+    def do_DELETE(self):
+        key, q = self._target()
+        with self.server.lock:
+            if "uploadId" in q:
+                self.server.uploads.pop(q["uploadId"], None)
+            else:
+                self.server.objects.pop(key, None)
+        self._reply(204)
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Upload a built dashboard dist/ to S3, skipping unchanged objects.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    u = sub.add_parser("upload", help="upload dist/ and invalidate what changed")
+    u.add_argument("dist", nargs="?", default="dist")
+    u.add_argument("--bucket", default=os.environ.get("S3_BUCKET_URL"), help="s3://bucket[/prefix] (default: $S3_BUCKET_URL)")
+    u.add_argument("--endpoint", default=os.environ.get("AWS_ENDPOINT_URL"),
+                   help="S3 endpoint, path-style (default: $AWS_ENDPOINT_URL or https://s3.<region>.amazonaws.com)")
+    u.add_argument("--region", default=os.environ.get("AWS_REGION", os.environ.get("AWS_DEFAULT_REGION", "us-east-1")))
+    u.add_argument("--distribution-id", default=os.environ.get("CF_DISTRIBUTION_ID"),
+                   help="CloudFront distribution to invalidate (default: $CF_DISTRIBUTION_ID)")
+    u.add_argument("--cloudfront-endpoint", default="https://cloudfront.amazonaws.com")
+    u.add_argument("--cache-manifest", help="from build_sysops_dashboard.py --fingerprint (default: <dist>.cache.json)")
+    u.add_argument("--encoding", default="gzip", choices=("gzip", "br", "zstd", "none"),
+                   help="precompressed variant uploaded in place of each file (default: gzip)")
+    u.add_argument("--workers", type=int, default=8, help="concurrent uploads (default: 8)")
+    u.add_argument("--delete", action="store_true", help="delete remote objects no longer in dist/")
+    u.add_argument("--force", action="store_true", help="ignore the remote manifest and upload everything")
+    u.add_argument("--dry-run", action="store_true", help="only report what would be uploaded/invalidated")
+    s = sub.add_parser("stub", help="run a local S3 + CloudFront stand-in")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8789)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stub":
+        srv = StubS3((args.host, args.port))
+        print(f"✅ stub S3/CloudFront on http://{args.host}:{srv.server_address[1]}", flush=True)
+        srv.serve_forever()
+        return 0
+    if not args.bucket:
+        ap.error("--bucket or $S3_BUCKET_URL is required")
+    creds = env_creds()
+    endpoint = args.endpoint or f"https://s3.{args.region}.amazonaws.com"
+    bucket = Bucket(Client(endpoint, "s3", args.region, creds), args.bucket)
+    cf = Client(args.cloudfront_endpoint, "cloudfront", "us-east-1", creds) if args.distribution_id else None
+    try:
+        summary = upload(args.dist, bucket, args.distribution_id, cf, args.workers, args.cache_manifest,
+                         args.encoding, args.delete, args.force, args.dry_run)
+    except StaleManifest as e:
+        print(f"❌ {e}")
+        return 1
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# fleet_health.py
+# Concurrent /healthz.json poller for the Umbrella-1 fleet: every app in
+# umbrella1_manifest.json plus the apps/* and services/* of a handoff bundle.
+# One asyncio loop, keep-alive connections reused across rounds, per-target
+# timeouts, jittered intervals and latency histograms, aggregated into a single
+# status document the dashboard can read. Stdlib only.
+#
+#   python fleet_health.py stub                          # local stubs on the manifest ports
+#   python fleet_health.py poll --once                   # one round, print the document
+#   python fleet_health.py poll --out dist/fleet.json    # keep polling every 15s
+
+import os, ssl, sys, json, time, random, bisect, asyncio, fnmatch, pathlib, zipfile, argparse, datetime, urllib.parse
+
+MANIFEST = pathlib.Path.cwd() / "umbrella1_manifest.json"
+# latency histogram upper bounds in ms; the last bucket is everything slower
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# ---------- targets ----------
+
+def manifest_targets(manifest=MANIFEST, host="127.0.0.1"):
+    apps = json.loads(pathlib.Path(manifest).read_text(encoding="utf-8"))["apps"]
+    return [{"name": a["app"], "url": f"http://{host}:{a['api_port']}/healthz.json"}
+            for a in sorted(apps, key=lambda a: a["order"])]
+
+def handoff_targets(src, url_template):
+    """apps/<name>/ and services/<name>/ in a handoff dir or zip, mapped through
+    `url_template` ({kind} is app|service, {name} the directory)."""
+    src = pathlib.Path(src)
+    if src.is_dir():
+        names = [p.relative_to(src).as_posix() for p in src.rglob("healthz.json")]
+    else:
+        with zipfile.ZipFile(src) as z:
+            names = [n for n in z.namelist() if n.endswith("/healthz.json")]
+    out = []
+    for n in sorted(names):
+        for kind, pattern in (("app", "*apps/*/healthz.json"), ("service", "*services/*/healthz.json")):
+            if fnmatch.fnmatch(n, pattern) or fnmatch.fnmatch("/" + n, pattern):
+                name = n.split("/")[-2]
+                out.append({"name": f"{kind}:{name}", "url": url_template.format(kind=kind, name=name)})
+    return out
+
+# ---------- minimal pooled async HTTP/1.1 client ----------
+
+class Pool:
+    """Idle keep-alive connections per (scheme, host, port)."""
+
+    def __init__(self):
+        self.idle = {}
+        self.ssl = ssl.create_default_context()
+
+    async def get(self, url, timeout):
+        u = urllib.parse.urlsplit(url)
+        key = (u.scheme, u.hostname, u.port or (443 if u.scheme == "https" else 80))
+        path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+        conns = self.idle.setdefault(key, [])
+        reused = bool(conns)
+        reader, writer = conns.pop() if conns else await asyncio.wait_for(
+            asyncio.open_connection(key[1], key[2], ssl=self.ssl if u.scheme == "https" else None), timeout)
+        try:
+            return await asyncio.wait_for(self._roundtrip(key, path, reader, writer), timeout)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # TimeoutError is an OSError on 3.11+, so only connection resets qualify here;
+            # retrying a timeout would double the per-target deadline
+            writer.close()
+            if not reused:
+                raise
+        except BaseException:
+            writer.close()
+            raise
+        # a reused connection the server had already closed: retry once on a fresh one
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(key[1], key[2], ssl=self.ssl if u.scheme == "https" else None), timeout)
+        try:
+            return await asyncio.wait_for(self._roundtrip(key, path, reader, writer), timeout)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _roundtrip(self, key, path, reader, writer):
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {key[1]}\r\nAccept: application/json\r\n"
+                     f"User-Agent: fleet-health\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed")
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ValueError(f"malformed status line {status_line[:80]!r}")
+        code = int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if code in (204, 304) or 100 <= code < 200:
+            body = b""  # bodiless by definition, whatever the headers say
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                body += await reader.readexactly(size)
+                await reader.readline()
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self.idle.setdefault(key, []).append((reader, writer))
+        return code, body
+
+    def close(self):
+        for conns in self.idle.values():
+            for _, w in conns:
+                w.close()
+        self.idle.clear()
+
+# ---------- poller ----------
+
+class Target:
+    def __init__(self, name, url):
+        self.name, self.url = name, url
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.checks = self.failures = 0
+        self.state = {"status": "unknown"}
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def quantile(self, q):
+        n = sum(self.counts)
+        if not n:
+            return None
+        rank, seen = q * n, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else float("inf")
+
+    def as_dict(self):
+        return dict(self.state, url=self.url, checks=self.checks, failures=self.failures,
+                    p50_ms=self.quantile(0.5), p95_ms=self.quantile(0.95),
+                    histogram={"le_ms": list(BUCKETS_MS) + ["inf"], "counts": self.counts})
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+async def probe(pool, t, timeout):
+    t.checks += 1
+    start = time.perf_counter()
+    try:
+        code, body = await pool.get(t.url, timeout)
+    except asyncio.TimeoutError:
+        code, body, err = None, b"", f"timeout after {timeout}s"
+    except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+        code, body, err = None, b"", f"{type(e).__name__}: {e}"
+    else:
+        err = None
+    ms = (time.perf_counter() - start) * 1000
+    doc = None
+    if code is not None:
+        t.observe(ms)
+        try:
+            doc = json.loads(body)
+        except ValueError:
+            pass
+    if code is not None and 200 <= code < 300:
+        ok = not isinstance(doc, dict) or doc.get("status", "ok") == "ok"
+        status = "up" if ok else "degraded"
+    else:
+        status = "down"
+        t.failures += 1
+    t.state = {"status": status, "code": code, "latency_ms": round(ms, 2), "checked_at": _now(),
+               "error": err, "health": doc if isinstance(doc, dict) else None,
+               "last_ok": _now() if status == "up" else t.state.get("last_ok")}
+
+def document(targets, started):
+    docs = {t.name: t.as_dict() for t in targets}
+    summary = {"total": len(targets)}
+    for d in docs.values():
+        summary[d["status"]] = summary.get(d["status"], 0) + 1
+    return {"generated_at": _now(), "since": started, "summary": summary, "targets": docs}
+
+def write_atomic(path, doc):
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(doc, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+async def poll(targets, interval=15.0, jitter=0.2, timeout=3.0, rounds=None, out=None, write_every=5.0):
+    """Probe every target concurrently; each target then repeats on its own jittered
+    interval. Returns the final status document after `rounds` (None = forever)."""
+    pool = Pool()
+    ts = [Target(t["name"], t["url"]) for t in targets]
+    started = _now()
+
+    async def loop(t):
+        n = 0
+        while rounds is None or n < rounds:
+            await probe(pool, t, timeout)
+            n += 1
+            if rounds is None or n < rounds:
+                await asyncio.sleep(interval * random.uniform(1 - jitter, 1 + jitter))
+
+    async def writer():
+        while True:
+            await asyncio.sleep(write_every)
+            write_atomic(out, document(ts, started))
+
+    w = asyncio.create_task(writer()) if out else None
+    try:
+        await asyncio.gather(*(loop(t) for t in ts))
+    finally:
+        if w:
+            w.cancel()
+        pool.close()
+    doc = document(ts, started)
+    if out:
+        write_atomic(out, doc)
+    return doc
+
+# ---------- local stubs ----------
+
+async def serve_stubs(ports, host="127.0.0.1", delay_ms=0.0, down=()):
+    """One keep-alive healthz server per port; ports in `down` answer 503."""
+    async def handle(reader, writer, port):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                if delay_ms:
+                    await asyncio.sleep(delay_ms / 1000)
+                code = 503 if port in down else 200
+                body = json.dumps({"status": "ok" if code == 200 else "down", "port": port,
+                                   "ts": int(time.time())}).encode("utf-8")
+                writer.write(b"HTTP/1.1 %d %s\r\ncontent-type: application/json\r\ncontent-length: %d\r\n\r\n"
+                             % (code, b"OK" if code == 200 else b"Service Unavailable", len(body)) + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    servers = [await asyncio.start_server(lambda r, w, p=p: handle(r, w, p), host, p) for p in ports]
+    return servers
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Poll /healthz.json across the Umbrella-1 fleet.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("poll", help="poll targets and write the aggregated status document")
+    p.add_argument("--manifest", default=str(MANIFEST), help="Umbrella manifest (default: %(default)s)")
+    p.add_argument("--host", default="127.0.0.1", help="host serving the manifest api_ports (default: %(default)s)")
+    p.add_argument("--handoff", help="also poll apps/* and services/* of this handoff dir or zip")
+    p.add_argument("--handoff-url", default="https://{name}.remimediaventures.com/healthz.json",
+                   help="URL template for --handoff targets (default: %(default)s)")
+    p.add_argument("--targets", help='extra targets: JSON file of [{"name": ..., "url": ...}]')
+    p.add_argument("--interval", type=float, default=15.0, help="seconds between probes per target (default: 15)")
+    p.add_argument("--jitter", type=float, default=0.2, help="± fraction of the interval (default: 0.2)")
+    p.add_argument("--timeout", type=float, default=3.0, help="per-probe timeout in seconds (default: 3)")
+    p.add_argument("--rounds", type=int, help="stop after N probes per target (default: forever)")
+    p.add_argument("--once", action="store_true", help="same as --rounds 1")
+    p.add_argument("--out", help="status document path, rewritten atomically while polling")
+    s = sub.add_parser("stub", help="serve stub /healthz.json endpoints for local testing")
+    s.add_argument("--manifest", default=str(MANIFEST), help="bind every api_port in this manifest")
+    s.add_argument("--count", type=int, help="instead bind COUNT ports starting at --base-port")
+    s.add_argument("--base-port", type=int, default=9100)
+    s.add_argument("--delay-ms", type=float, default=0.0, help="response delay per request")
+    s.add_argument("--down", type=int, nargs="*", default=[], help="ports that answer 503")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stub":
+        if args.count:
+            ports = list(range(args.base_port, args.base_port + args.count))
+        else:
+            ports = [a["api_port"] for a in json.loads(pathlib.Path(args.manifest).read_text(encoding="utf-8"))["apps"]]
+        async def run():
+            await serve_stubs(ports, delay_ms=args.delay_ms, down=set(args.down))
+            print(f"✅ {len(ports)} stub healthz servers on ports {ports[0]}–{ports[-1]}", flush=True)
+            await asyncio.Event().wait()
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    targets = manifest_targets(args.manifest, args.host) if args.manifest else []
+    if args.handoff:
+        targets += handoff_targets(args.handoff, args.handoff_url)
+    if args.targets:
+        targets += json.loads(pathlib.Path(args.targets).read_text(encoding="utf-8"))
+    rounds = 1 if args.once else args.rounds
+    doc = asyncio.run(poll(targets, args.interval, args.jitter, args.timeout, rounds, args.out))
+    if rounds is not None and not args.out:
+        print(json.dumps(doc, indent=1))
+    s = doc["summary"]
+    print("✅ " + ", ".join(f"{k}={v}" for k, v in s.items()), file=sys.stderr)
+    return 0 if s.get("up", 0) == s["total"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
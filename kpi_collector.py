@@ -0,0 +1,302 @@
+# kpi_collector.py
+# History for the KPIs the Overview and Cost pages show only as latest values
+# (slo.p95_ms, slo.success_rate, cost.per_minute_usd, spend.usd_24h, spend.tokens_24h).
+# Samples the endpoints and keeps each metric in fixed-size array-backed rings at 1s, 1m
+# and 1h resolution (count/sum/min/max per slot, no per-sample objects), so memory is
+# fixed at start-up and range queries are answered from memory. Stdlib only.
+#
+#   python kpi_collector.py stub --port 8794                 # local stand-in endpoints
+#   UPSTREAM_SLO_STATUS_URL=http://127.0.0.1:8794/slo python kpi_collector.py serve --port 8793
+#   curl 'http://127.0.0.1:8793/kpi/range?metric=slo.p95_ms&from=-3600'
+#   python kpi_collector.py bench
+
+import os, sys, json, math, time, array, random, argparse, threading, http.server, urllib.parse, urllib.request
+
+# endpoint -> (upstream env var, default upstream); same variables as status_proxy.py
+ENDPOINTS = {
+    "slo": ("UPSTREAM_SLO_STATUS_URL", "https://api.remimediaventures.com/_status"),
+    "cost": ("UPSTREAM_OPS_COST_MIN_URL", "https://ops.remimediaventures.com/cost/minute"),
+    "spend": ("UPSTREAM_OPS_AI_SPEND24H_URL", "https://ops.remimediaventures.com/ai/spend24h"),
+}
+# metric -> (endpoint, JSON path), the fields the dashboard pages read
+METRICS = {
+    "slo.p95_ms": ("slo", ("slo", "p95_ms")),
+    "slo.success_rate": ("slo", ("slo", "success_rate")),
+    "cost.per_minute_usd": ("cost", ("cost", "per_minute_usd")),
+    "spend.usd_24h": ("spend", ("spend", "usd_24h")),
+    "spend.tokens_24h": ("spend", ("spend", "tokens_24h")),
+}
+# (seconds per slot, slots): 1s for an hour, 1m for two days, 1h for 30 days
+RESOLUTIONS = ((1, 3600), (60, 2880), (3600, 720))
+
+# ---------- storage ----------
+
+class Ring:
+    """`slots` buckets of `step` seconds in parallel arrays. A bucket is live only while
+    its stored slot number matches, so old data ages out without a sweep."""
+
+    __slots__ = ("step", "size", "slot", "count", "sum", "min", "max")
+
+    def __init__(self, step, size):
+        self.step, self.size = step, size
+        self.slot = array.array("q", [-1]) * size
+        self.count = array.array("L", [0]) * size
+        self.sum = array.array("d", [0.0]) * size
+        self.min = array.array("d", [0.0]) * size
+        self.max = array.array("d", [0.0]) * size
+
+    def add(self, t, v):
+        n = int(t // self.step)
+        i = n % self.size
+        if self.slot[i] != n:
+            self.slot[i], self.count[i], self.sum[i], self.min[i], self.max[i] = n, 1, v, v, v
+            return
+        self.count[i] += 1
+        self.sum[i] += v
+        if v < self.min[i]:
+            self.min[i] = v
+        if v > self.max[i]:
+            self.max[i] = v
+
+    def range(self, start, end):
+        """[t, mean, min, max, count] per live bucket in [start, end], oldest first."""
+        first = max(int(start // self.step), int(end // self.step) - self.size + 1)
+        slot, count, sum_, min_, max_ = self.slot, self.count, self.sum, self.min, self.max
+        out = []
+        for n in range(first, int(end // self.step) + 1):
+            i = n % self.size
+            if slot[i] == n:
+                out.append([n * self.step, sum_[i] / count[i], min_[i], max_[i], count[i]])
+        return out
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.slot, self.count, self.sum, self.min, self.max))
+
+class Series:
+    """One metric at every resolution in RESOLUTIONS."""
+
+    def __init__(self, resolutions=RESOLUTIONS):
+        self.rings = [Ring(step, size) for step, size in resolutions]
+        self.lock = threading.Lock()
+        self.last = None  # (t, v)
+
+    def add(self, t, v):
+        with self.lock:
+            for r in self.rings:
+                r.add(t, v)
+            self.last = (t, v)
+
+    def pick(self, start, end, max_points):
+        """Finest ring that still holds `start` and needs at most `max_points` buckets."""
+        for r in self.rings:
+            if (end - start) / r.step <= max_points and end - start <= r.step * r.size:
+                return r
+        return self.rings[-1]
+
+    def range(self, start, end, step=None, max_points=1000):
+        ring = next((r for r in self.rings if r.step == step), None) if step else None
+        ring = ring or self.pick(start, end, max_points)
+        with self.lock:
+            return ring.step, ring.range(start, end)
+
+class Store:
+    def __init__(self, metrics=METRICS, resolutions=RESOLUTIONS):
+        self.series = {name: Series(resolutions) for name in metrics}
+        self.stats = {"samples": 0, "polls": 0, "errors": 0}
+
+    def record(self, endpoint, doc, t=None):
+        """Add every metric of `endpoint` present in `doc` (a decoded response)."""
+        t = time.time() if t is None else t
+        for name, (ep, path) in METRICS.items():
+            if ep != endpoint or name not in self.series:
+                continue
+            v = doc
+            for p in path:
+                v = v.get(p) if isinstance(v, dict) else None
+            if isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v):
+                self.series[name].add(t, float(v))
+                self.stats["samples"] += 1
+
+    def latest(self):
+        """Latest values nested like the upstream documents, e.g. {"slo": {"p95_ms": ...}}."""
+        out = {}
+        for name, s in self.series.items():
+            if s.last is not None:
+                ep, path = METRICS[name]
+                out.setdefault(path[0], {})[path[1]] = s.last[1]
+                out.setdefault("ts", {})[name] = s.last[0]
+        return out
+
+    def nbytes(self):
+        return sum(r.nbytes() for s in self.series.values() for r in s.rings)
+
+# ---------- sampling ----------
+
+def sampler(store, endpoint, url, interval, stop, timeout=10.0, headers=None):
+    """Poll `url` every `interval` seconds (jittered) until `stop` is set."""
+    req = urllib.request.Request(url, headers={"accept": "application/json", **(headers or {})})
+    while not stop.is_set():
+        t = time.time()
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                store.record(endpoint, json.loads(r.read()), t)
+            store.stats["polls"] += 1
+        except Exception:
+            store.stats["errors"] += 1
+        stop.wait(max(0.0, interval * (0.9 + 0.2 * random.random()) - (time.time() - t)))
+
+# ---------- HTTP API ----------
+
+class KPIServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, store, cors_origin=None):
+        super().__init__(addr, KPIHandler)
+        self.store, self.cors_origin = store, cors_origin
+
+class KPIHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, doc):
+        body = json.dumps(doc, separators=(",", ":")).encode("utf-8")
+        self.send_response(code)
+        self.send_header("content-type", "application/json")
+        self.send_header("cache-control", "no-cache")
+        if self.server.cors_origin:
+            self.send_header("access-control-allow-origin", self.server.cors_origin)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        u = urllib.parse.urlsplit(self.path)
+        q = dict(urllib.parse.parse_qsl(u.query))
+        store = self.server.store
+        if u.path == "/kpi/latest":
+            return self._send(200, store.latest())
+        if u.path == "/kpi/series":
+            return self._send(200, {name: {"resolutions": [[r.step, r.size] for r in s.rings], "last": s.last}
+                                    for name, s in store.series.items()})
+        if u.path == "/kpi/_stats":
+            return self._send(200, dict(store.stats, bytes=store.nbytes()))
+        if u.path != "/kpi/range":
+            return self._send(404, {"error": "not found"})
+        series = store.series.get(q.get("metric"))
+        if series is None:
+            return self._send(400, {"error": "unknown metric", "metrics": sorted(store.series)})
+        try:
+            now = time.time()
+            # negative from/to are relative to now
+            start, end = float(q.get("from", -3600)), float(q.get("to", 0))
+            start, end = (now + start if start <= 0 else start), (now + end if end <= 0 else end)
+            step = int(q["step"]) if q.get("step") else None
+            max_points = int(q.get("points", 1000))
+        except ValueError:
+            return self._send(400, {"error": "from/to/step/points must be numbers"})
+        t = time.perf_counter()
+        step, points = series.range(start, end, step, max_points)
+        self._send(200, {"metric": q["metric"], "step": step, "points": points,
+                         "query_us": round((time.perf_counter() - t) * 1e6, 1)})
+
+# ---------- local stand-in endpoints ----------
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Random-walk values shaped like the real /_status, cost/minute and ai/spend24h."""
+
+    protocol_version = "HTTP/1.1"
+    state = {"p95": 180.0, "ok": 0.995, "cpm": 0.42, "usd": 310.0, "tok": 2.1e7}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        s, path = self.state, urllib.parse.urlsplit(self.path).path
+        walk = lambda k, scale, lo, hi: s.__setitem__(k, min(hi, max(lo, s[k] * (1 + random.gauss(0, scale)))))
+        if path == "/slo":
+            walk("p95", 0.05, 20, 5000)
+            walk("ok", 0.001, 0.9, 1.0)
+            doc = {"slo": {"p95_ms": round(s["p95"], 1), "success_rate": round(s["ok"], 4)}}
+        elif path == "/cost":
+            walk("cpm", 0.02, 0.01, 100)
+            doc = {"cost": {"per_minute_usd": round(s["cpm"], 4)}}
+        elif path == "/spend":
+            walk("usd", 0.01, 1, 1e6)
+            walk("tok", 0.01, 1e3, 1e12)
+            doc = {"spend": {"usd_24h": round(s["usd"], 2), "tokens_24h": int(s["tok"])}}
+        else:
+            doc = {"error": "not found"}
+        body = json.dumps(doc).encode("utf-8")
+        self.send_response(404 if "error" in doc else 200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+# ---------- CLI ----------
+
+def bench(days=2, queries=20000):
+    """Fill `days` of one-per-second samples, then time typical dashboard range queries."""
+    store = Store()
+    s = store.series["slo.p95_ms"]
+    now = time.time()
+    t = time.perf_counter()
+    for i in range(int(days * 86400)):
+        s.add(now - days * 86400 + i, 100 + (i % 97))
+    fill = time.perf_counter() - t
+    out = {"samples": int(days * 86400), "fill_s": round(fill, 3), "bytes": store.nbytes()}
+    for label, span in (("5m", 300), ("1h", 3600), ("24h", 86400), ("7d", 7 * 86400)):
+        n = max(1, queries // 10)
+        t = time.perf_counter()
+        for _ in range(n):
+            step, points = s.range(now - span, now)
+        out[label] = {"step": step, "points": len(points), "us": round((time.perf_counter() - t) / n * 1e6, 1)}
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Ring-buffer KPI history for the SysOps dashboard.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="sample the KPI endpoints and serve /kpi/*")
+    s.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    s.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8793)))
+    s.add_argument("--interval", type=float, default=5.0, help="seconds between polls per endpoint (default: 5)")
+    s.add_argument("--timeout", type=float, default=10.0, help="upstream timeout in seconds (default: 10)")
+    s.add_argument("--cors-origin", default=os.environ.get("KPI_CORS_ORIGIN"))
+    t = sub.add_parser("stub", help="run local stand-in /slo, /cost and /spend endpoints")
+    t.add_argument("--host", default="127.0.0.1")
+    t.add_argument("--port", type=int, default=8794)
+    b = sub.add_parser("bench", help="time ring fills and range queries")
+    b.add_argument("--days", type=float, default=2.0, help="days of 1/s samples to load (default: 2)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "bench":
+        print(json.dumps(bench(args.days), indent=1))
+        return 0
+    if args.cmd == "stub":
+        srv = http.server.ThreadingHTTPServer((args.host, args.port), StubHandler)
+        srv.daemon_threads = True
+        print(f"✅ stub KPI endpoints on http://{args.host}:{srv.server_address[1]}/{{slo,cost,spend}}", flush=True)
+        srv.serve_forever()
+        return 0
+
+    store = Store()
+    headers = {}
+    if os.environ.get("PROXY_AUTH_HEADER") and os.environ.get("PROXY_AUTH_VALUE"):
+        headers[os.environ["PROXY_AUTH_HEADER"]] = os.environ["PROXY_AUTH_VALUE"]
+    stop = threading.Event()
+    for endpoint, (var, default) in ENDPOINTS.items():
+        threading.Thread(target=sampler, args=(store, endpoint, os.environ.get(var, default), args.interval, stop,
+                                               args.timeout, headers), daemon=True).start()
+    srv = KPIServer((args.host, args.port), store, args.cors_origin)
+    print(f"✅ KPI collector on http://{args.host}:{srv.server_address[1]}/kpi/ ({store.nbytes()} bytes of rings)",
+          flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        stop.set()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
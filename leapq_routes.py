@@ -0,0 +1,219 @@
+# leapq_routes.py
+# Local evaluator for the LeapQ route rules in ops/routes/*.jsonl (umbrella1_handoff_v2).
+# Rules are compiled once into a method + path-segment trie; $request.body.*, $query.*
+# and $actor.* substitutions become accessor functions; static bodies are pre-serialized.
+#
+#   python leapq_routes.py resolve umbrella1_handoff_v2.zip POST /api/sysops/upload --body '{"file_ref":"f1"}'
+#   python leapq_routes.py bench umbrella1_handoff_v2.zip
+
+import re, sys, json, time, fnmatch, pathlib, zipfile, argparse, urllib.parse
+
+# $request.body.a.b | $query.x | $actor.x | $params.x  (path params captured by :name segments)
+_EXPR = re.compile(r"\$(request\.body|query|actor|params)((?:\.\w+)+)")
+_SCOPES = {"request.body": "body", "query": "query", "actor": "actor", "params": "params"}
+
+def compile_expr(scope, dotted):
+    """Accessor for `$<scope><dotted>` over a request context dict; missing -> None."""
+    key, path = _SCOPES[scope], tuple(dotted.lstrip(".").split("."))
+    def get(ctx):
+        v = ctx.get(key)
+        for p in path:
+            if not isinstance(v, dict):
+                return None
+            v = v.get(p)
+        return v
+    return get
+
+def compile_value(value):
+    """Compile a body_map value: a lone $expr keeps the raw type, mixed text becomes a string."""
+    if not isinstance(value, str) or "$" not in value:
+        return lambda ctx: value
+    m = _EXPR.fullmatch(value)
+    if m:
+        return compile_expr(*m.groups())
+    return compile_template(value, quote=False)
+
+def compile_template(text, quote=True):
+    """Compile a string with embedded $exprs into a renderer; values are URL-quoted for paths."""
+    parts = _EXPR.split(text)
+    if len(parts) == 1:
+        return lambda ctx: text
+    # split() yields literal, scope, dotted, literal, scope, dotted, ..., literal
+    pieces = []
+    for i in range(0, len(parts), 3):
+        if parts[i]:
+            pieces.append(parts[i])
+        if i + 2 < len(parts):
+            pieces.append(compile_expr(parts[i + 1], parts[i + 2]))
+    def fmt(v):
+        if v is None:
+            return ""
+        v = v if isinstance(v, str) else json.dumps(v)
+        return urllib.parse.quote(v, safe="") if quote else v
+    def render(ctx):
+        return "".join(p if isinstance(p, str) else fmt(p(ctx)) for p in pieces)
+    return render
+
+class Route:
+    """One compiled rule: kind is invoke | proxy | static."""
+
+    __slots__ = ("rule", "source", "method", "endpoint", "kind", "service", "path", "body_map", "code", "payload")
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.source = rule.get("source", "")
+        self.method = rule["when"]["method"].upper()
+        self.endpoint = rule["when"]["endpoint"]
+        (self.kind, then), = rule["then"].items()
+        self.service = then.get("service")
+        self.path = compile_template(then["path"]) if "path" in then else None
+        self.body_map = {k: compile_value(v) for k, v in then.get("body_map", {}).items()}
+        self.code = then.get("code", 200)
+        self.payload = json.dumps(then["body"], separators=(",", ":")).encode("utf-8") if "body" in then else None
+
+    def apply(self, ctx):
+        if self.kind == "static":
+            return {"kind": "static", "code": self.code, "body": self.payload}
+        out = {"kind": self.kind, "service": self.service, "path": self.path(ctx) if self.path else None}
+        if self.body_map:
+            out["body"] = {k: f(ctx) for k, f in self.body_map.items()}
+        return out
+
+class _Node:
+    __slots__ = ("children", "param", "routes")
+
+    def __init__(self):
+        self.children = {}
+        self.param = None      # (name, _Node) for a ":name" segment
+        self.routes = None     # {source: Route}, insertion order = load order
+
+class RouteTable:
+    """method -> path-segment trie of compiled routes. Later rules with the same
+    source/method/endpoint replace earlier ones, like the upsert endpoint does."""
+
+    def __init__(self):
+        self.roots = {}
+        self.count = 0
+
+    def add(self, rule):
+        r = Route(rule)
+        node = self.roots.setdefault(r.method, _Node())
+        for seg in r.endpoint.strip("/").split("/"):
+            if seg.startswith(":"):
+                if node.param is None:
+                    node.param = (seg[1:], _Node())
+                node = node.param[1]
+            else:
+                node = node.children.setdefault(seg, _Node())
+        if node.routes is None:
+            node.routes = {}
+        if r.source not in node.routes:
+            self.count += 1
+        node.routes[r.source] = r
+        return r
+
+    def match(self, method, path, source=None):
+        """(Route, params) for a request path (no query string), or (None, {}). Static
+        segments win over :params, but a static branch that dead-ends falls back to the
+        param branch at the same level."""
+        node = self.roots.get(method.upper())
+        if node is None:
+            return None, {}
+        params = {}
+        route = self._walk(node, path.strip("/").split("/"), 0, params, source)
+        return (route, params) if route is not None else (None, {})
+
+    def _walk(self, node, segs, i, params, source):
+        if i == len(segs):
+            if not node.routes:
+                return None
+            return node.routes.get(source) if source is not None else next(iter(node.routes.values()))
+        child = node.children.get(segs[i])
+        if child is not None:
+            route = self._walk(child, segs, i + 1, params, source)
+            if route is not None:
+                return route
+        if node.param is not None:
+            name, child = node.param
+            route = self._walk(child, segs, i + 1, params, source)
+            if route is not None:
+                params[name] = segs[i]
+                return route
+        return None
+
+    def resolve(self, method, url, body=None, actor=None, source=None):
+        """Resolve a request to {kind, ...}; None when no rule matches. Without `source`
+        the rule from the earliest-loaded file wins."""
+        path, _, qs = url.partition("?")
+        route, params = self.match(method, path, source)
+        if route is None:
+            return None
+        query = dict(urllib.parse.parse_qsl(qs)) if qs else {}
+        return route.apply({"body": body, "query": query, "actor": actor or {}, "params": params})
+
+def load(src):
+    """RouteTable from a handoff dir/zip (ops/routes/*.jsonl) or a single .jsonl file."""
+    src = pathlib.Path(src)
+    if src.suffix == ".jsonl":
+        files = [src.read_text(encoding="utf-8")]
+    elif src.is_dir():
+        files = [p.read_text(encoding="utf-8") for p in sorted(src.glob("**/ops/routes/*.jsonl"))
+                 or sorted(src.glob("*.jsonl"))]
+    else:
+        with zipfile.ZipFile(src) as z:
+            files = [z.read(n).decode("utf-8") for n in sorted(z.namelist())
+                     if fnmatch.fnmatch(n, "*ops/routes/*.jsonl")]
+    table = RouteTable()
+    for text in files:
+        for line in text.splitlines():
+            if line.strip():
+                table.add(json.loads(line))
+    return table
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Resolve requests against compiled LeapQ route rules.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("resolve", help="resolve one request and print the result")
+    r.add_argument("src")
+    r.add_argument("method")
+    r.add_argument("url")
+    r.add_argument("--body", help="JSON request body")
+    r.add_argument("--actor", help='JSON actor, e.g. {"email": "ops@example.com"}')
+    r.add_argument("--source", help="restrict to rules from this source (master, sysops, ...)")
+    b = sub.add_parser("bench", help="measure resolutions/sec over every loaded rule")
+    b.add_argument("src")
+    b.add_argument("-n", type=int, default=200000, help="resolutions (default: 200000)")
+    args = ap.parse_args(argv)
+
+    table = load(args.src)
+    if args.cmd == "resolve":
+        out = table.resolve(args.method, args.url, json.loads(args.body) if args.body else None,
+                            json.loads(args.actor) if args.actor else None, args.source)
+        if out and isinstance(out.get("body"), bytes):
+            out["body"] = json.loads(out["body"])
+        print(json.dumps(out, indent=1))
+        return 0 if out else 1
+    reqs = []
+    for method, root in table.roots.items():
+        stack = [("", root)]
+        while stack:
+            prefix, node = stack.pop()
+            if node.routes:
+                reqs.append((method, prefix + "?scope=api&lines=50"))
+            stack += [(f"{prefix}/{seg}", child) for seg, child in node.children.items()]
+            if node.param:
+                stack.append((f"{prefix}/x", node.param[1]))
+    if not reqs:
+        print(f"❌ no rules loaded from {args.src}")
+        return 1
+    body, actor = {"text": "hi", "file_ref": "f"}, {"email": "ops@example.com"}
+    t = time.perf_counter()
+    for i in range(args.n):
+        m, u = reqs[i % len(reqs)]
+        table.resolve(m, u, body, actor)
+    dt = time.perf_counter() - t
+    print(f"✅ {table.count} rules, {args.n} resolutions in {dt:.3f}s ({args.n / dt if dt else 0:,.0f}/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,537 @@
+# load_sysops_dashboard.py
+# Load generator for the backends behind the SysOps dashboard. Each virtual client
+# replays one open dashboard: Overview fetches status summary, SLO and JIT status in
+# sequence on mount and every 30s, Cost fetches cost/minute and AI spend every 60s,
+# and AgentChat holds an SSE stream open. Requests carry the headers getJSON sends
+# (content-type, VITE_AUTH_*, VITE_OWNER_*) and revalidate with If-None-Match like
+# fetch's cache: "no-cache". Latencies go into slo_engine.py sketches. Stdlib only.
+#
+#   python load_sysops_dashboard.py stub --port 8796                        # local stand-ins
+#   python load_sysops_dashboard.py run --clients 500 --duration 120 --speed 10
+#   python load_sysops_dashboard.py run --env-file sysops-dashboard/.env --base https://sysops.example.com
+#   python load_sysops_dashboard.py run --out load.json --baseline load_baseline.json
+#
+# Endpoint URLs come from VITE_* variables (environment, then --env-file); relative ones
+# resolve against --base. Unset ones default to the status_proxy.py paths.
+
+import os, ssl, sys, json, time, random, asyncio, hashlib, pathlib, argparse, urllib.parse
+
+from slo_engine import Sketch, bucket
+
+# page -> (interval seconds, [(name, VITE_ variable, default path)]); fetched in order,
+# each awaited before the next, as the React effects do
+PAGES = {
+    "overview": (30, [
+        ("status_summary", "VITE_STATUS_SUMMARY_URL", "/ops/cache/status/summary"),
+        ("slo_status", "VITE_SLO_STATUS_URL", "/ops/cache/slo/status"),
+        ("jit_status", "VITE_JIT_STATUS_URL", "/ops/cache/jit/status"),
+    ]),
+    "cost": (60, [
+        ("cost_min", "VITE_OPS_COST_MIN_URL", "/ops/cache/cost/minute"),
+        ("ai_spend24h", "VITE_OPS_AI_SPEND24H_URL", "/ops/cache/ai/spend24h"),
+    ]),
+}
+STREAM = ("agent_stream", "VITE_DAD_AGENT_STREAM", "/ops/agent/stream")
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# ---------- config ----------
+
+def read_env_file(path):
+    env = {}
+    for line in pathlib.Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            k, _, v = line.partition("=")
+            env[k.strip()] = v.strip()
+    return env
+
+def resolve(env, base):
+    """{name: absolute URL} for every polled endpoint and the stream, plus request headers."""
+    def url(var, default):
+        return urllib.parse.urljoin(base, env.get(var) or default)
+    urls = {name: url(var, default) for _, eps in PAGES.values() for name, var, default in eps}
+    urls[STREAM[0]] = url(STREAM[1], STREAM[2])
+    headers = {"content-type": "application/json"}
+    for h, v in (("VITE_AUTH_HEADER", "VITE_AUTH_VALUE"), ("VITE_OWNER_HEADER", "VITE_OWNER_VALUE")):
+        if env.get(h) and env.get(v):
+            headers[env[h]] = env[v]
+    return urls, headers
+
+# ---------- HTTP client ----------
+
+async def _read_head(reader):
+    status = await reader.readline()
+    if not status:
+        raise ConnectionResetError("server closed the connection")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            parts = status.split()
+            if len(parts) < 2 or not parts[1].isdigit():
+                raise ValueError(f"malformed status line {status[:80]!r}")
+            return int(parts[1]), headers
+        k, _, v = line.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+
+async def _body_chunks(reader, code, headers):
+    """Yield the body as it arrives, undoing chunked transfer-encoding."""
+    if code in (204, 304) or 100 <= code < 200:
+        return  # bodiless by definition, whatever the headers say
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return
+            yield await reader.readexactly(size)
+            await reader.readline()
+    elif "content-length" in headers:
+        yield await reader.readexactly(int(headers["content-length"]))
+    else:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            yield data
+
+async def _read_body(reader, code, headers):
+    return b"".join([chunk async for chunk in _body_chunks(reader, code, headers)])
+
+async def _open(u, timeout):
+    port = u.port or (443 if u.scheme == "https" else 80)
+    return await asyncio.wait_for(asyncio.open_connection(
+        u.hostname, port, ssl=ssl.create_default_context() if u.scheme == "https" else None), timeout)
+
+def _request(u, headers):
+    path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+    extra = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return f"GET {path} HTTP/1.1\r\nHost: {u.netloc}\r\n{extra}\r\n".encode("latin-1")
+
+class Session:
+    """One keep-alive connection per origin, like a browser tab's pool for sequential fetches."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.conns = {}
+
+    async def get(self, url, headers):
+        u = urllib.parse.urlsplit(url)
+        key = (u.scheme, u.netloc)
+        for attempt in (0, 1):
+            conn = self.conns.pop(key, None)
+            fresh = conn is None
+            if fresh:
+                conn = await _open(u, self.timeout)
+            reader, writer = conn
+            try:
+                writer.write(_request(u, headers))
+                await writer.drain()
+                code, head = await asyncio.wait_for(_read_head(reader), self.timeout)
+                body = await asyncio.wait_for(_read_body(reader, code, head), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if fresh or attempt:
+                    raise
+                continue  # the server closed an idle keep-alive connection; retry on a new one
+            except BaseException:
+                writer.close()
+                raise
+            if head.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self.conns[key] = conn
+            return code, head, body
+
+    def close(self):
+        for _, writer in self.conns.values():
+            writer.close()
+        self.conns.clear()
+
+# ---------- stats ----------
+
+class Endpoint:
+    """Request counts and a latency sketch for one endpoint."""
+
+    def __init__(self):
+        self.latency = Sketch()
+        self.errors = {}
+        self.not_modified = 0
+        self.max_ms = 0.0
+
+    def record(self, ms, error=None):
+        s = self.latency
+        s.counts[bucket(ms)] += 1
+        s.n += 1
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if error:
+            s.errors += 1
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def summary(self, elapsed):
+        s = self.latency
+        doc = {"requests": s.n, "rps": round(s.n / elapsed, 2) if elapsed else 0.0,
+               "error_rate": round(s.errors / s.n, 5) if s.n else 0.0}
+        for q in QUANTILES:
+            v = s.quantile(q)
+            doc[f"p{round(q * 100)}_ms"] = round(v, 2) if v is not None else None
+        doc["max_ms"] = round(self.max_ms, 2)
+        if self.not_modified:
+            doc["not_modified"] = self.not_modified
+        if self.errors:
+            doc["errors"] = dict(sorted(self.errors.items(), key=lambda kv: -kv[1]))
+        return doc
+
+class Stats:
+    def __init__(self):
+        self.endpoints = {}
+        self.stream_open = Endpoint()   # time to response headers
+        self.stream_lag = Endpoint()    # event ts -> received, when events carry a ts
+        self.streams = {"opened": 0, "failed": 0, "dropped": 0, "events": 0, "open_now": 0}
+        self.started = time.monotonic()
+
+    def endpoint(self, name):
+        e = self.endpoints.get(name)
+        if e is None:
+            e = self.endpoints[name] = Endpoint()
+        return e
+
+    def report(self):
+        elapsed = time.monotonic() - self.started
+        polls = Endpoint()
+        for e in self.endpoints.values():
+            polls.latency.merge({i: c for i, c in enumerate(e.latency.counts) if c})
+            polls.latency.n += e.latency.n
+            polls.latency.errors += e.latency.errors
+            polls.max_ms = max(polls.max_ms, e.max_ms)
+        stream = dict(self.streams, events_per_s=round(self.streams["events"] / elapsed, 2) if elapsed else 0.0,
+                      open=self.stream_open.summary(elapsed))
+        if self.stream_lag.latency.n:
+            stream["lag"] = self.stream_lag.summary(elapsed)
+        return {"elapsed_s": round(elapsed, 2),
+                "polls": polls.summary(elapsed),
+                "endpoints": {name: e.summary(elapsed) for name, e in sorted(self.endpoints.items())},
+                "stream": stream}
+
+# ---------- virtual clients ----------
+
+def _error_kind(exc):
+    return "timeout" if isinstance(exc, asyncio.TimeoutError) else type(exc).__name__
+
+async def poll_page(stats, eps, interval, headers, timeout, jitter, rnd):
+    session, etags = Session(timeout), {}
+    try:
+        while True:
+            for name, url in eps:
+                h = dict(headers)
+                if url in etags:
+                    h["if-none-match"] = etags[url]
+                t = time.perf_counter()
+                try:
+                    code, head, _ = await session.get(url, h)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                    stats.endpoint(name).record((time.perf_counter() - t) * 1000, _error_kind(e))
+                    continue  # getJSON throws; the page's try/catch swallows it and moves on
+                ep = stats.endpoint(name)
+                ep.record((time.perf_counter() - t) * 1000, str(code) if code >= 400 else None)
+                if code == 304:
+                    ep.not_modified += 1
+                elif code == 200 and "etag" in head:
+                    etags[url] = head["etag"]
+            await asyncio.sleep(interval * (1 + rnd.uniform(-jitter, jitter)))
+    finally:
+        session.close()
+
+async def hold_stream(stats, url, headers, timeout, rnd):
+    """One AgentChat stream; reconnects with backoff when it fails or the server ends it."""
+    u = urllib.parse.urlsplit(url)
+    h = dict(headers, accept="text/event-stream")
+    backoff = 1.0
+    while True:
+        t = time.perf_counter()
+        writer = None
+        try:
+            reader, writer = await _open(u, timeout)
+            writer.write(_request(u, h))
+            await writer.drain()
+            code, head = await asyncio.wait_for(_read_head(reader), timeout)
+            stats.stream_open.record((time.perf_counter() - t) * 1000, str(code) if code != 200 else None)
+            if code != 200:
+                stats.streams["failed"] += 1
+            else:
+                stats.streams["opened"] += 1
+                stats.streams["open_now"] += 1
+                backoff = 1.0
+                try:
+                    buf = b""
+                    # chunk-size lines would otherwise land inside event blocks
+                    async for data in _body_chunks(reader, code, head):
+                        buf = (buf + data).replace(b"\r\n", b"\n")
+                        *blocks, buf = buf.split(b"\n\n")
+                        now = time.time()
+                        for b in blocks:
+                            if b.startswith(b":") or not b.strip():
+                                continue  # comment / heartbeat
+                            stats.streams["events"] += 1
+                            for line in b.split(b"\n"):
+                                if line.startswith(b"data:") and b'"ts"' in line:
+                                    try:
+                                        ts = json.loads(line[5:]).get("ts")
+                                    except ValueError:
+                                        break
+                                    if isinstance(ts, (int, float)):
+                                        stats.stream_lag.record(max(0.0, (now - ts) * 1000))
+                                    break
+                finally:
+                    stats.streams["open_now"] -= 1
+                stats.streams["dropped"] += 1
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            stats.stream_open.record((time.perf_counter() - t) * 1000, _error_kind(e))
+            stats.streams["failed"] += 1
+        finally:
+            if writer is not None:
+                writer.close()
+        await asyncio.sleep(backoff * (1 + rnd.random()))
+        backoff = min(backoff * 2, 30.0)
+
+async def dashboard(stats, urls, headers, args, rnd):
+    """One open dashboard: both pages poll from mount, AgentChat streams if enabled."""
+    tasks = [asyncio.create_task(poll_page(stats, [(name, urls[name]) for name, _, _ in eps],
+                                           interval / args.speed, headers, args.timeout, args.jitter, rnd))
+             for interval, eps in PAGES.values()]
+    if args.streams:
+        tasks.append(asyncio.create_task(hold_stream(stats, urls[STREAM[0]], headers, args.timeout, rnd)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+
+async def run(args, urls, headers):
+    stats = Stats()
+    rnd = random.Random(args.seed)
+    tasks = []
+
+    async def start(i, delay):
+        await asyncio.sleep(delay)
+        await dashboard(stats, urls, headers, args, random.Random(rnd.random()))
+
+    for i in range(args.clients):
+        # dashboards open spread over the ramp, so polls don't arrive in lockstep
+        tasks.append(asyncio.create_task(start(i, rnd.uniform(0, args.ramp))))
+
+    async def progress():
+        while True:
+            await asyncio.sleep(args.report_every)
+            r = stats.report()
+            p = r["polls"]
+            print(f"  {r['elapsed_s']:7.1f}s  {p['rps']:8.1f} req/s  err {p['error_rate'] * 100:5.2f}%  "
+                  f"p95 {p['p95_ms']} ms  streams {r['stream']['open_now']}", file=sys.stderr, flush=True)
+
+    reporter = asyncio.create_task(progress()) if args.report_every else None
+    await asyncio.sleep(args.duration)
+    report = stats.report()
+    for t in tasks + ([reporter] if reporter else []):
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return report
+
+# ---------- stand-in endpoints ----------
+
+STUB_BODIES = {
+    "status/summary": lambda rnd: {"active": {"count": rnd.choice([0, 0, 0, 1, 2])}},
+    "slo/status": lambda rnd: {"slo": {"p95_ms": round(rnd.uniform(120, 260), 1),
+                                       "success_rate": round(rnd.uniform(0.995, 1.0), 4)}},
+    "jit/status": lambda rnd: {"active": None, "grant": {"mode": "jit"}},
+    "cost/minute": lambda rnd: {"cost": {"per_minute_usd": round(rnd.uniform(0.2, 0.6), 3),
+                                         "margin_ratio": round(rnd.uniform(1.4, 2.2), 2)}},
+    "ai/spend24h": lambda rnd: {"spend": {"usd_24h": round(rnd.uniform(50, 90), 2),
+                                          "tokens_24h": rnd.randint(3_000_000, 6_000_000)}},
+}
+
+async def stub_server(host, port, latency_ms, error_rate, rate, refresh, require_header=None):
+    """Stand-ins for every polled endpoint (by path suffix, so both /ops/cache/* and
+    upstream-style paths work) and the agent stream. Bodies change every `refresh`
+    seconds and carry ETags, so If-None-Match gets 304s in between."""
+    rnd = random.Random(1)
+    cache = {}
+
+    def body_for(key):
+        epoch = int(time.time() // refresh)
+        hit = cache.get(key)
+        if hit is None or hit[0] != epoch:
+            body = json.dumps(STUB_BODIES[key](rnd)).encode("utf-8")
+            hit = cache[key] = (epoch, body, '"%s"' % hashlib.sha1(body).hexdigest()[:16])
+        return hit[1], hit[2]
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    return
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = line.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                path = urllib.parse.urlsplit(request.split()[1].decode("latin-1")).path
+                if latency_ms:
+                    await asyncio.sleep(rnd.lognormvariate(0, 0.5) * latency_ms / 1000)
+                if require_header and require_header.lower() not in headers:
+                    writer.write(b"HTTP/1.1 401 Unauthorized\r\ncontent-length: 0\r\n\r\n")
+                    continue
+                if error_rate and rnd.random() < error_rate:
+                    writer.write(b"HTTP/1.1 503 Service Unavailable\r\ncontent-length: 0\r\n\r\n")
+                    continue
+                if path.endswith(STREAM[2].rsplit("/", 1)[-1]):
+                    writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ncache-control: no-cache\r\n"
+                                 b"transfer-encoding: chunked\r\n\r\n")
+                    seq = 0
+                    while True:
+                        seq += 1
+                        ev = f"event: token\ndata: {json.dumps({'seq': seq, 'ts': time.time()})}\n\n".encode("utf-8")
+                        writer.write(b"%x\r\n%s\r\n" % (len(ev), ev))
+                        await writer.drain()
+                        await asyncio.sleep(1 / rate)
+                key = next((k for k in STUB_BODIES if path.endswith(k)), None)
+                if key is None:
+                    writer.write(b"HTTP/1.1 404 Not Found\r\ncontent-length: 0\r\n\r\n")
+                    continue
+                body, etag = body_for(key)
+                if headers.get("if-none-match") == etag:
+                    writer.write(b"HTTP/1.1 304 Not Modified\r\netag: %s\r\ncontent-length: 0\r\n\r\n"
+                                 % etag.encode("ascii"))
+                    continue
+                writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncache-control: no-cache\r\n"
+                             b"etag: %s\r\ncontent-length: %d\r\n\r\n%s" % (etag.encode("ascii"), len(body), body))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, IndexError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port, backlog=4096)
+
+# ---------- report ----------
+
+def print_report(report, out=sys.stdout):
+    cols = ["requests", "rps", "error_rate"] + [f"p{round(q * 100)}_ms" for q in QUANTILES] + ["max_ms"]
+    print(f"{'endpoint':<16}" + "".join(f"{c:>12}" for c in cols), file=out)
+    rows = list(report["endpoints"].items()) + [("all polls", report["polls"]),
+                                                ("stream open", report["stream"]["open"])]
+    if "lag" in report["stream"]:
+        rows.append(("stream lag", report["stream"]["lag"]))
+    for name, doc in rows:
+        cells = []
+        for c in cols:
+            v = doc.get(c)
+            cells.append("—" if v is None else f"{v * 100:.2f}%" if c == "error_rate" else str(v))
+        print(f"{name:<16}" + "".join(f"{c:>12}" for c in cells), file=out)
+        for kind, n in doc.get("errors", {}).items():
+            print(f"{'':<16}  {kind}: {n}", file=out)
+    s = report["stream"]
+    print(f"streams: {s['opened']} opened, {s['failed']} failed, {s['dropped']} dropped, "
+          f"{s['open_now']} open at end, {s['events']} events ({s['events_per_s']}/s)", file=out)
+
+def compare(report, baseline, tolerance, slack_ms=2.0):
+    """Human-readable regressions: latency percentiles beyond `tolerance` (and more than
+    `slack_ms` absolute), error rates above the baseline's by more than 0.1 points."""
+    bad = []
+    def check(name, cur, base):
+        for k, b in base.items():
+            c = cur.get(k)
+            if not isinstance(b, (int, float)) or not isinstance(c, (int, float)):
+                continue
+            if k.endswith("_ms") and k.startswith("p") and b and c > b * (1 + tolerance) and c - b > slack_ms:
+                bad.append(f"{name}/{k}: {b} -> {c} ms (+{(c / b - 1) * 100:.0f}%)")
+            elif k == "error_rate" and c > b + 0.001:
+                bad.append(f"{name}/{k}: {b * 100:.2f}% -> {c * 100:.2f}%")
+    check("polls", report["polls"], baseline.get("polls", {}))
+    for name, base in baseline.get("endpoints", {}).items():
+        check(name, report["endpoints"].get(name, {}), base)
+    check("stream/open", report["stream"]["open"], baseline.get("stream", {}).get("open", {}))
+    return bad
+
+# ---------- CLI ----------
+
+def _raise_nofile(need):
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < need:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (need if hard == resource.RLIM_INFINITY else min(need, hard), hard))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load-test the SysOps dashboard backends with simulated dashboards.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="simulate N open dashboards")
+    r.add_argument("--clients", type=int, default=100, help="open dashboards to simulate (default: 100)")
+    r.add_argument("--duration", type=float, default=60.0, help="seconds to run (default: 60)")
+    r.add_argument("--ramp", type=float, default=30.0, help="dashboards open uniformly over this many seconds (default: 30)")
+    r.add_argument("--speed", type=float, default=1.0,
+                   help="divide the 30s/60s poll intervals by this to compress time (default: 1)")
+    r.add_argument("--jitter", type=float, default=0.1, help="± fraction applied to each poll interval (default: 0.1)")
+    r.add_argument("--no-streams", dest="streams", action="store_false", help="skip the AgentChat SSE streams")
+    r.add_argument("--base", default="http://127.0.0.1:8796", help="origin for relative endpoint URLs (default: %(default)s)")
+    r.add_argument("--env-file", help="dashboard .env to take VITE_* endpoint URLs and auth headers from")
+    r.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds (default: 10)")
+    r.add_argument("--seed", type=int, default=0)
+    r.add_argument("--report-every", type=float, default=10.0, help="progress line interval, 0 to disable (default: 10)")
+    r.add_argument("--out", help="write the JSON report here")
+    r.add_argument("--baseline", help="compare against this report and exit 1 on regressions")
+    r.add_argument("--tolerance", type=float, default=0.25, help="allowed latency growth vs baseline (default: 0.25)")
+    s = sub.add_parser("stub", help="serve local stand-ins for every endpoint")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8796)
+    s.add_argument("--latency-ms", type=float, default=0.0, help="median added latency per response (default: 0)")
+    s.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503 (default: 0)")
+    s.add_argument("--rate", type=float, default=2.0, help="stream events per second per client (default: 2)")
+    s.add_argument("--refresh", type=float, default=15.0, help="seconds between body changes (default: 15)")
+    s.add_argument("--require-header", metavar="NAME", help="answer 401 when this request header is missing")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stub":
+        _raise_nofile(65536)
+        async def serve():
+            await stub_server(args.host, args.port, args.latency_ms, args.error_rate, args.rate, args.refresh,
+                              args.require_header)
+            print(f"✅ stand-in endpoints on http://{args.host}:{args.port}/", flush=True)
+            await asyncio.Event().wait()
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    env = read_env_file(args.env_file) if args.env_file else {}
+    env.update({k: v for k, v in os.environ.items() if k.startswith("VITE_")})
+    urls, headers = resolve(env, args.base)
+    _raise_nofile(args.clients * 4 + 256)
+    print(f"📦 {args.clients} dashboards for {args.duration:g}s (speed ×{args.speed:g}, "
+          f"streams {'on' if args.streams else 'off'}) against {urllib.parse.urljoin(args.base, '/')}",
+          file=sys.stderr, flush=True)
+    report = asyncio.run(run(args, urls, headers))
+    report["config"] = {"clients": args.clients, "duration_s": args.duration, "speed": args.speed,
+                        "jitter": args.jitter, "streams": args.streams, "urls": urls,
+                        "headers": sorted(headers)}
+    print_report(report)
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=1), encoding="utf-8")
+        print(f"✅ report: {args.out}")
+    if args.baseline:
+        bad = compare(report, json.loads(pathlib.Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+        for line in bad:
+            print(f"❌ {line}")
+        if bad:
+            return 1
+        print("✅ no regressions vs baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# piggyback.py
+# Python replacement for ops/piggyback.local.sh in umbrella1_handoff_v2.zip: upserts
+# handshakes and LeapQ routes into D.A.D. over pooled keep-alive connections, with
+# bounded concurrency, retries and skip-if-unchanged. Stdlib only.
+#
+#   python piggyback.py publish umbrella1_handoff_v2.zip          # or an unpacked dir
+#   python piggyback.py stub --port 8788                          # local stand-in D.A.D.
+#   DAD_BASE_URL=http://127.0.0.1:8788 python piggyback.py publish umbrella1_handoff_v2
+
+import os, sys, json, time, random, hashlib, zipfile, fnmatch, pathlib, argparse, threading
+import http.client, http.server, urllib.parse, concurrent.futures
+
+DEFAULT_BASE_URL = "https://dad.remimediaventures.com"
+HANDSHAKE_PATH = "/api/handshakes/upsert"
+ROUTES_PATH = "/api/leapq/routes"
+STATE_PATH = pathlib.Path.cwd() / ".piggyback-state.json"
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# ---------- bundle reading ----------
+
+def read_bundle(src):
+    """(relpath, bytes) for ops/handshakes/*.json and ops/routes/*.jsonl in a handoff
+    dir or zip, sorted like the shell globs."""
+    src = pathlib.Path(src)
+    if src.is_dir():
+        files = [(p.relative_to(src).as_posix(), p.read_bytes()) for p in src.rglob("*") if p.is_file()]
+    else:
+        with zipfile.ZipFile(src) as z:
+            files = [(n, z.read(n)) for n in z.namelist() if not n.endswith("/")]
+    def pick(pattern):
+        return sorted((rel, data) for rel, data in files
+                      if fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(rel, "*/" + pattern))
+    return pick("ops/handshakes/*.json"), pick("ops/routes/*.jsonl")
+
+def route_key(route):
+    w = route.get("when", {})
+    return f"route:{route.get('source', '')}:{w.get('method', '')} {w.get('endpoint', '')}"
+
+def plan(handshakes, routes):
+    """Items to publish as (key, path, body bytes); one per handshake, one per route line."""
+    items = []
+    for rel, data in handshakes:
+        doc = json.loads(data)
+        items.append((f"handshake:{doc.get('id', rel)}", HANDSHAKE_PATH, data))
+    for rel, data in routes:
+        for line in data.decode("utf-8").splitlines():
+            line = line.strip()
+            if line:
+                items.append((route_key(json.loads(line)), ROUTES_PATH, line.encode("utf-8")))
+    return items
+
+# ---------- pooled HTTP client ----------
+
+class Client:
+    """One keep-alive connection per worker thread; retries with jittered backoff."""
+
+    def __init__(self, base_url, timeout=10.0, retries=4, backoff=0.25, headers=None):
+        u = urllib.parse.urlsplit(base_url)
+        self.scheme, self.host, self.port = u.scheme, u.hostname, u.port
+        self.prefix = u.path.rstrip("/")
+        self.timeout, self.retries, self.backoff = timeout, retries, backoff
+        self.headers = {"content-type": "application/json", **(headers or {})}
+        self.local = threading.local()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def _conn(self):
+        c = getattr(self.local, "conn", None)
+        if c is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            c = self.local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return c
+
+    def _drop(self):
+        c = getattr(self.local, "conn", None)
+        if c is not None:
+            c.close()
+            self.local.conn = None
+
+    def post(self, path, body):
+        for attempt in range(self.retries + 1):
+            try:
+                c = self._conn()
+                c.request("POST", self.prefix + path, body=body, headers=self.headers)
+                r = c.getresponse()
+                data = r.read()
+                with self.lock:
+                    self.requests += 1
+                if r.will_close:
+                    self._drop()
+                if r.status < 400:
+                    return r.status, data
+                if r.status not in RETRY_STATUS or attempt == self.retries:
+                    raise RuntimeError(f"POST {path} -> {r.status}: {data[:200]!r}")
+            except (OSError, http.client.HTTPException):
+                self._drop()
+                if attempt == self.retries:
+                    raise
+            time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+# ---------- publish ----------
+
+def load_state(path):
+    try:
+        return json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_state(path, state):
+    tmp = pathlib.Path(str(path) + ".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def publish(src, base_url, workers=8, batch=1, state_path=STATE_PATH, force=False, client=None, log=print):
+    """Upsert everything in `src` not already published unchanged to `base_url`.
+    With `batch` > 1, route lines go out as JSON arrays of up to `batch` routes."""
+    t0 = time.perf_counter()
+    client = client or Client(base_url)
+    state = load_state(state_path) if state_path else {}
+    seen = state.setdefault(base_url, {})
+    items = plan(*read_bundle(src))
+    todo = [it for it in items if force or seen.get(it[0]) != hashlib.sha256(it[2]).hexdigest()]
+
+    # handshakes always go one per request; routes are grouped when batching is allowed
+    jobs = [[it] for it in todo if it[1] != ROUTES_PATH or batch <= 1]
+    routes = [it for it in todo if it[1] == ROUTES_PATH and batch > 1]
+    jobs += [routes[i:i + batch] for i in range(0, len(routes), batch)]
+
+    def send(group):
+        if len(group) == 1:
+            client.post(group[0][1], group[0][2])
+        else:
+            client.post(group[0][1], b"[" + b",".join(it[2] for it in group) + b"]")
+        return group
+
+    ok, failed = 0, []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(send, g): g for g in jobs}
+        for f in concurrent.futures.as_completed(futures):
+            group = futures[f]
+            try:
+                f.result()
+            except Exception as e:
+                failed += [(it[0], str(e)) for it in group]
+                continue
+            for key, _, body in group:
+                seen[key] = hashlib.sha256(body).hexdigest()
+                ok += 1
+    if state_path:
+        save_state(state_path, state)
+    summary = {"items": len(items), "published": ok, "skipped": len(items) - len(todo),
+               "failed": len(failed), "requests": client.requests,
+               "seconds": round(time.perf_counter() - t0, 3)}
+    for key, err in failed:
+        log(f"❌ {key}: {err}")
+    log("== Done == " + ", ".join(f"{k}={v}" for k, v in summary.items()))
+    return summary
+
+# ---------- local stand-in D.A.D. ----------
+
+class StubDAD(http.server.ThreadingHTTPServer):
+    """Accepts handshake/route upserts (single objects or arrays) over keep-alive HTTP/1.1.
+    `flaky` is the probability of answering 503, to exercise retries."""
+
+    daemon_threads = True
+
+    def __init__(self, addr, flaky=0.0):
+        super().__init__(addr, StubHandler)
+        self.flaky = flaky
+        self.handshakes, self.routes = {}, {}
+        self.requests = 0
+        self.lock = threading.Lock()
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, code, doc):
+        body = json.dumps(doc).encode("utf-8")
+        self.send_response(code)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/_stub/state":
+            with self.server.lock:
+                return self._reply(200, {"requests": self.server.requests,
+                                         "handshakes": self.server.handshakes, "routes": self.server.routes})
+        self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("content-length") or 0))
+        with self.server.lock:
+            self.server.requests += 1
+        if random.random() < self.server.flaky:
+            return self._reply(503, {"error": "flaky"})
+        try:
+            doc = json.loads(body)
+        except ValueError:
+            return self._reply(400, {"error": "invalid json"})
+        docs = doc if isinstance(doc, list) else [doc]
+        with self.server.lock:
+            if self.path == HANDSHAKE_PATH:
+                for d in docs:
+                    self.server.handshakes[d["id"]] = d
+            elif self.path == ROUTES_PATH:
+                for d in docs:
+                    self.server.routes[route_key(d)] = d
+            else:
+                return self._reply(404, {"error": "not found"})
+        self._reply(200, {"upserted": len(docs)})
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Upsert Umbrella handshakes and LeapQ routes into D.A.D.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("publish", help="publish a handoff bundle (dir or zip)")
+    p.add_argument("src", nargs="?", default="umbrella1_handoff_v2.zip")
+    p.add_argument("--base-url", default=os.environ.get("DAD_BASE_URL", DEFAULT_BASE_URL),
+                   help="D.A.D. base URL (default: $DAD_BASE_URL or %(default)s)")
+    p.add_argument("--workers", type=int, default=8, help="concurrent connections (default: 8)")
+    p.add_argument("--batch", type=int, default=1,
+                   help="routes per request as a JSON array, if the endpoint accepts arrays (default: 1)")
+    p.add_argument("--retries", type=int, default=4, help="retries per request (default: 4)")
+    p.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds (default: 10)")
+    p.add_argument("--state", default=str(STATE_PATH), help="skip-if-unchanged state file (default: %(default)s)")
+    p.add_argument("--force", action="store_true", help="publish everything, ignoring the state file")
+    s = sub.add_parser("stub", help="run a local stand-in D.A.D. server")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8788)
+    s.add_argument("--flaky", type=float, default=0.0, help="probability of a 503 per request (default: 0)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stub":
+        srv = StubDAD((args.host, args.port), args.flaky)
+        print(f"✅ stub D.A.D. on http://{args.host}:{srv.server_address[1]}")
+        srv.serve_forever()
+        return 0
+    client = Client(args.base_url, timeout=args.timeout, retries=args.retries)
+    summary = publish(args.src, args.base_url, args.workers, args.batch, args.state, args.force, client)
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,459 @@
+# slo_engine.py
+# Streaming SLO engine: tails JSONL request logs and serves what the Overview page reads
+# from VITE_SLO_STATUS_URL, {"slo": {"p95_ms": ..., "success_rate": ...}}, per app in
+# umbrella1_manifest.json and for the whole fleet. Latencies go into fixed-layout
+# log-linear histograms (HDR-style, <1% relative error) that merge by addition, kept per
+# time slot so a sliding window is a running total plus expiry. Memory is bounded by
+# apps x slots x buckets, not by traffic. Stdlib only.
+#
+#   python slo_engine.py gen --lines 1000000 > requests.log           # synthetic log
+#   python slo_engine.py serve requests.log --port 8795               # tail + serve
+#   curl 'http://127.0.0.1:8795/_status?app=sysops'
+#   python slo_engine.py replay shard-*.log --jobs 4                  # per-shard windows, merged
+#
+# Log lines are JSON objects; the first present of each field is used:
+#   time: ts | time | timestamp (epoch seconds or ISO 8601)   app: app | service
+#   latency: latency_ms | duration_ms | ms                    status: status | code
+
+import os, sys, json, math, time, array, random, pathlib, argparse, datetime, threading, http.server
+import urllib.parse, concurrent.futures
+
+MANIFEST = pathlib.Path.cwd() / "umbrella1_manifest.json"
+FLEET = "*"
+OTHER = ""
+# 2**SUB_BITS buckets per power of two: bucket width is at most 1/64 of its lower bound
+SUB_BITS = 6
+MIN_EXP, MAX_EXP = -10, 31           # ~1 us .. ~24 days in ms
+BUCKETS = (MAX_EXP - MIN_EXP + 1) << SUB_BITS
+READ_CHUNK = 1 << 20
+
+# ---------- sketch ----------
+
+def bucket(v):
+    """Bucket index of a latency in ms; values outside the range land in the end buckets."""
+    if v <= 0:
+        return 0
+    m, e = math.frexp(v)  # v = m * 2**e, 0.5 <= m < 1
+    if e < MIN_EXP:
+        return 0
+    if e > MAX_EXP:
+        return BUCKETS - 1
+    return ((e - MIN_EXP) << SUB_BITS) + int((m - 0.5) * (2 << SUB_BITS))
+
+def bucket_value(i):
+    """Midpoint of bucket `i` in ms."""
+    e, j = divmod(i, 1 << SUB_BITS)
+    return math.ldexp(0.5 + (j + 0.5) / (2 << SUB_BITS), e + MIN_EXP)
+
+class Sketch:
+    """Log-linear latency histogram plus request/error counts. Two sketches merge exactly
+    by adding counts, so shards and time slots combine without losing accuracy."""
+
+    __slots__ = ("counts", "n", "errors")
+
+    def __init__(self):
+        self.counts = array.array("Q", bytes(8 * BUCKETS))
+        self.n = 0
+        self.errors = 0
+
+    def merge(self, buckets, sign=1):
+        """Add (or with sign=-1, remove) sparse {bucket: count} counts."""
+        counts = self.counts
+        for i, c in buckets.items():
+            counts[i] += sign * c
+
+    def quantile(self, q):
+        if self.n == 0:
+            return None
+        rank = max(1, math.ceil(q * self.n))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                return bucket_value(i)
+        return None
+
+# ---------- sliding window ----------
+
+class Window:
+    """`slots` sub-sketches of `slot_s` seconds; `total` is always their sum. Slots are
+    sparse {bucket: count} dicts, so quiet apps cost almost nothing."""
+
+    def __init__(self, window_s=300, slot_s=10):
+        self.slot_s = slot_s
+        self.size = max(1, window_s // slot_s)
+        self.ring = [None] * self.size     # (slot number, {bucket: count}, n, errors)
+        self.total = Sketch()
+        self.head = None                   # newest slot number seen
+
+    def _expire(self, slot_no):
+        # drop every slot that falls out of the window ending at slot_no
+        if self.head is not None and slot_no - self.head >= self.size:
+            stale = [r for r in self.ring if r is not None]
+        else:
+            stale = [r for r in self.ring if r is not None and r[0] <= slot_no - self.size]
+        for r in stale:
+            self.total.merge(r[1], -1)
+            self.total.n -= r[2]
+            self.total.errors -= r[3]
+            self.ring[r[0] % self.size] = None
+        if self.head is None or slot_no > self.head:
+            self.head = slot_no
+
+    def advance(self, t):
+        slot_no = int(t // self.slot_s)
+        if self.head is None or slot_no > self.head:
+            self._expire(slot_no)
+
+    def add(self, slot_no, buckets, n, errors):
+        """Fold one slot's worth of counts in; False when the slot is older than the window."""
+        if self.head is not None and slot_no <= self.head - self.size:
+            return False
+        if self.head is None or slot_no > self.head:
+            self._expire(slot_no)
+        i = slot_no % self.size
+        r = self.ring[i]
+        if r is None or r[0] != slot_no:
+            r = self.ring[i] = [slot_no, {}, 0, 0]
+        slot = r[1]
+        for b, c in buckets.items():
+            slot[b] = slot.get(b, 0) + c
+        r[2] += n
+        r[3] += errors
+        self.total.merge(buckets)
+        self.total.n += n
+        self.total.errors += errors
+        return True
+
+    def slots(self):
+        return [(r[0], dict(r[1]), r[2], r[3]) for r in self.ring if r is not None]
+
+# ---------- engine ----------
+
+def _ts(v):
+    if isinstance(v, (int, float)):
+        return v / 1000.0 if v > 1e11 else float(v)  # epoch ms or s
+    return datetime.datetime.fromisoformat(v.replace("Z", "+00:00")).timestamp()
+
+class Engine:
+    """Per-app and fleet-wide windows fed from parsed log records."""
+
+    def __init__(self, apps=(), window_s=300, slot_s=10, error_status=500, event_time=False):
+        self.apps = set(apps)
+        self.window_s, self.slot_s = window_s, slot_s
+        self.error_status = error_status
+        self.event_time = event_time
+        self.windows = {FLEET: Window(window_s, slot_s)}
+        self.lock = threading.Lock()
+        self.stats = {"lines": 0, "bad": 0, "late": 0, "unknown_app": 0}
+        self.max_ts = 0.0
+
+    def window(self, app):
+        w = self.windows.get(app)
+        if w is None:
+            w = self.windows[app] = Window(self.window_s, self.slot_s)
+        return w
+
+    def feed(self, lines):
+        """Account a batch of raw JSONL lines (bytes or str)."""
+        if not lines:
+            return
+        try:
+            blob = b",".join(lines)
+        except TypeError:  # str lines (tests, callers decoding themselves); bytes stay copy-free
+            blob = b",".join(l.encode("utf-8") if isinstance(l, str) else l for l in lines)
+        try:
+            # one C-level parse for the whole batch; fall back per line when one is bad
+            records = json.loads(b"[" + blob + b"]")
+        except ValueError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    self.stats["bad"] += 1
+        # aggregate the batch into per-(app, slot) deltas first: a batch spans a handful of
+        # slots, so the windows see a few dict merges instead of one update per line
+        err_status, slot_s = self.error_status, self.slot_s
+        agg = {}
+        bad = 0
+        max_ts = self.max_ts
+        for r in records:
+            try:
+                g = r.get
+                t = g("ts") or g("time") or g("timestamp")
+                t = t if type(t) is float and t < 1e11 else _ts(t)
+                ms = g("latency_ms")
+                if ms is None:
+                    ms = g("duration_ms", g("ms"))
+                b = bucket(float(ms))
+                error = int(g("status", g("code", 200))) >= err_status
+                app = g("app") or g("service")
+            except (AttributeError, TypeError, ValueError):
+                bad += 1
+                continue
+            if t > max_ts:
+                max_ts = t
+            key = (app, int(t // slot_s))
+            a = agg.get(key)
+            if a is None:
+                a = agg[key] = [{}, 0, 0]
+            h = a[0]
+            h[b] = h.get(b, 0) + 1
+            a[1] += 1
+            a[2] += error
+        with self.lock:
+            self.max_ts = max_ts
+            self.stats["bad"] += bad
+            self._absorb(agg)
+            self.stats["lines"] += len(lines)
+
+    def _absorb(self, agg):
+        # agg: {(app, slot number): [{bucket: count}, n, errors]}; caller holds the lock
+        fleet = {}
+        for (app, slot_no), (h, n, errors) in agg.items():
+            if app not in self.apps:
+                # apps outside the manifest share one window so they still count toward
+                # the fleet (and survive shard merges) without growing memory per name
+                if app and app != OTHER:
+                    self.stats["unknown_app"] += n
+                app = OTHER
+            if not self.window(app).add(slot_no, h, n, errors):
+                continue
+            f = fleet.get(slot_no)
+            if f is None:
+                fleet[slot_no] = [dict(h), n, errors]
+            else:
+                for b, c in h.items():
+                    f[0][b] = f[0].get(b, 0) + c
+                f[1] += n
+                f[2] += errors
+        w = self.windows[FLEET]
+        for slot_no in sorted(fleet):
+            h, n, errors = fleet[slot_no]
+            if not w.add(slot_no, h, n, errors):
+                self.stats["late"] += n
+
+    def merge_slots(self, shard):
+        """Fold another engine's `export()` in. Slots line up by absolute time, so shards
+        cut by host or by time merge into the same window a single engine would hold."""
+        agg = {}
+        for app, slots in shard.items():
+            if app == FLEET:
+                continue  # rebuilt from the per-app slots
+            for slot_no, h, n, errors in slots:
+                agg[(app, slot_no)] = [{int(b): c for b, c in h.items()}, n, errors]
+        with self.lock:
+            self._absorb(agg)
+
+    def export(self):
+        """{app: [(slot number, {bucket: count}, n, errors), ...]} for every live slot."""
+        with self.lock:
+            for w in self.windows.values():
+                w.advance(self.now())
+            return {app: [(no, {str(b): c for b, c in h.items()}, n, e) for no, h, n, e in w.slots()]
+                    for app, w in self.windows.items()}
+
+    def now(self):
+        return self.max_ts if self.event_time else time.time()
+
+    def status(self, app=FLEET):
+        """{"slo": {"p95_ms", "success_rate"}} over the current window; None for unknown apps."""
+        if app != FLEET and app not in self.apps:
+            return None
+        with self.lock:
+            w = self.window(app)
+            w.advance(self.now())
+            s = w.total
+            p95 = s.quantile(0.95)
+            return {"slo": {"p95_ms": round(p95, 1) if p95 is not None else None,
+                            "success_rate": round(1 - s.errors / s.n, 5) if s.n else None}}
+
+def manifest_apps(manifest=MANIFEST):
+    try:
+        return [a["app"] for a in json.loads(pathlib.Path(manifest).read_text(encoding="utf-8"))["apps"]]
+    except (OSError, ValueError, KeyError):
+        return []
+
+# ---------- log input ----------
+
+def read_lines(path, follow=False, stop=None, batch=4096, poll=0.2):
+    """Yield batches of complete lines from `path`; with `follow`, keep tailing across
+    truncation and rotation (a new file at the same path) like `tail -F`."""
+    f, ino, rest = None, None, b""
+    while True:
+        if f is None:
+            try:
+                f = open(path, "rb")
+                ino = os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                if not follow or (stop and stop.is_set()):
+                    return
+                time.sleep(poll)
+                continue
+        chunk = f.read(READ_CHUNK)
+        if chunk:
+            lines = (rest + chunk).split(b"\n")
+            rest = lines.pop()
+            lines = [l for l in lines if l.strip()]
+            for i in range(0, len(lines), batch):
+                yield lines[i:i + batch]
+            continue
+        if not follow or (stop and stop.is_set()):
+            if rest.strip():
+                yield [rest]
+            f.close()
+            return
+        try:
+            st = os.stat(path)
+            if st.st_ino != ino or st.st_size < f.tell():
+                f.close()
+                f, rest = None, b""
+                continue
+        except FileNotFoundError:
+            pass
+        time.sleep(poll)
+
+def _replay_shard(path, apps, window_s, slot_s, error_status):
+    # process-pool worker: one shard in, its live window slots out
+    engine = Engine(apps, window_s, slot_s, error_status, event_time=True)
+    for lines in read_lines(path):
+        engine.feed(lines)
+    return engine.stats, engine.max_ts, engine.export()
+
+def replay(paths, apps, window_s=300, slot_s=10, error_status=500, jobs=None):
+    """Per-shard engines on a process pool, merged into one engine whose window ends at
+    the newest timestamp across all shards."""
+    engine = Engine(apps, window_s, slot_s, error_status, event_time=True)
+    n = len(paths)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        for shard_stats, max_ts, shard in pool.map(_replay_shard, paths, [apps] * n, [window_s] * n,
+                                                   [slot_s] * n, [error_status] * n):
+            for k, v in shard_stats.items():
+                engine.stats[k] += v
+            engine.max_ts = max(engine.max_ts, max_ts)
+            engine.merge_slots(shard)
+    out = {}
+    for app in [FLEET] + sorted(apps):
+        out[app] = dict(engine.status(app), requests=engine.windows[app].total.n if app in engine.windows else 0)
+    return out, engine.stats
+
+# ---------- HTTP ----------
+
+class SLOServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, engine, cors_origin=None):
+        super().__init__(addr, SLOHandler)
+        self.engine, self.cors_origin = engine, cors_origin
+        self.started = time.monotonic()
+
+class SLOHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, doc):
+        body = json.dumps(doc, separators=(",", ":")).encode("utf-8")
+        self.send_response(code)
+        self.send_header("content-type", "application/json")
+        self.send_header("cache-control", "no-cache")
+        if self.server.cors_origin:
+            self.send_header("access-control-allow-origin", self.server.cors_origin)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        u = urllib.parse.urlsplit(self.path)
+        q = dict(urllib.parse.parse_qsl(u.query))
+        engine = self.server.engine
+        parts = u.path.strip("/").split("/")
+        if u.path in ("/_status", "/slo/status") or (len(parts) == 3 and parts[0] == "apps" and parts[2] == "_status"):
+            app = parts[1] if parts[0] == "apps" else q.get("app", FLEET)
+            doc = engine.status(app)
+            return self._send(200, doc) if doc else self._send(404, {"error": f"unknown app {app!r}"})
+        if u.path == "/slo/slots":
+            return self._send(200, engine.export())
+        if u.path == "/slo/_stats":
+            up = time.monotonic() - self.server.started
+            with engine.lock:
+                doc = dict(engine.stats, lines_per_s=round(engine.stats["lines"] / up, 1) if up else None,
+                           apps=sorted(engine.apps), window_s=engine.window_s)
+            return self._send(200, doc)
+        self._send(404, {"error": "not found"})
+
+# ---------- synthetic logs ----------
+
+def generate(out, lines, apps, rate=1000.0, start=None, error_rate=0.003):
+    """Write `lines` plausible request records spread at `rate` lines/s of log time."""
+    start = time.time() - lines / rate if start is None else start
+    rnd = random.Random(7)
+    apps = list(apps) or ["sysops"]
+    buf = []
+    for i in range(lines):
+        ms = rnd.lognormvariate(4.3, 0.6)  # median ~75 ms with a long tail
+        status = 500 if rnd.random() < error_rate else 200
+        buf.append('{"ts":%.3f,"app":"%s","method":"GET","path":"/api/x","status":%d,"latency_ms":%.2f}\n'
+                   % (start + i / rate, apps[i % len(apps)], status, ms))
+        if len(buf) >= 10000:
+            out.write("".join(buf))
+            buf.clear()
+    out.write("".join(buf))
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Streaming p95/success-rate SLO engine over JSONL request logs.")
+    ap.add_argument("--manifest", default=str(MANIFEST), help="apps to track (default: %(default)s)")
+    ap.add_argument("--window", type=int, default=300, help="sliding window in seconds (default: 300)")
+    ap.add_argument("--slot", type=int, default=10, help="window granularity in seconds (default: 10)")
+    ap.add_argument("--error-status", type=int, default=500, help="statuses >= this count as failures (default: 500)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="tail logs and serve /_status")
+    s.add_argument("logs", nargs="+")
+    s.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    s.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8795)))
+    s.add_argument("--event-time", action="store_true",
+                   help="end the window at the newest log timestamp instead of the wall clock (replaying old logs)")
+    s.add_argument("--cors-origin", default=os.environ.get("SLO_CORS_ORIGIN"))
+    r = sub.add_parser("replay", help="run one engine per log shard and merge their windows")
+    r.add_argument("logs", nargs="+")
+    r.add_argument("--jobs", type=int, help="worker processes (default: CPU count)")
+    g = sub.add_parser("gen", help="write a synthetic request log to stdout")
+    g.add_argument("--lines", type=int, default=100000)
+    g.add_argument("--rate", type=float, default=1000.0, help="log lines per second of log time (default: 1000)")
+    args = ap.parse_args(argv)
+    apps = manifest_apps(args.manifest)
+
+    if args.cmd == "gen":
+        generate(sys.stdout, args.lines, apps, args.rate)
+        return 0
+    if args.cmd == "replay":
+        t = time.perf_counter()
+        out, stats = replay(args.logs, apps, args.window, args.slot, args.error_status, args.jobs)
+        dt = time.perf_counter() - t
+        print(json.dumps(out, indent=1))
+        print(f"✅ {stats['lines']} lines from {len(args.logs)} shard(s) in {dt:.2f}s "
+              f"({stats['lines'] / dt:,.0f} lines/s); bad={stats['bad']} late={stats['late']}", file=sys.stderr)
+        return 0
+
+    engine = Engine(apps, args.window, args.slot, args.error_status, args.event_time)
+    stop = threading.Event()
+    def tail(path):
+        for lines in read_lines(path, follow=True, stop=stop):
+            engine.feed(lines)
+    for path in args.logs:
+        threading.Thread(target=tail, args=(path,), daemon=True).start()
+    srv = SLOServer((args.host, args.port), engine, args.cors_origin)
+    print(f"✅ SLO engine on http://{args.host}:{srv.server_address[1]}/_status ({len(apps)} apps, "
+          f"{args.window}s window)", flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        stop.set()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
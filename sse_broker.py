@@ -0,0 +1,275 @@
+# sse_broker.py
+# Fan-out broker for the D.A.D. agent stream: one upstream SSE connection per channel,
+# shared by every AgentChat subscriber. Per-client bounded buffers (slow consumers are
+# dropped, never allowed to stall the channel) and a replay ring so late joiners, or
+# reconnects sending Last-Event-ID, catch up. Stdlib only.
+#
+#   python sse_broker.py fake-upstream --port 8792               # local stand-in stream
+#   python sse_broker.py serve --upstream http://127.0.0.1:8792/stream --port 8791
+#   curl -N http://127.0.0.1:8791/ops/agent/stream?channel=incident-42
+
+import ssl, sys, socket, json, time, asyncio, argparse, collections, urllib.parse
+
+STREAM_PATH = "/ops/agent/stream"
+SNDBUF = 64 * 1024
+
+# ---------- upstream ----------
+
+async def _read_head(reader):
+    status = await reader.readline()
+    if not status:
+        raise ConnectionResetError("upstream closed before responding")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            parts = status.split()
+            if len(parts) < 2 or not parts[1].isdigit():
+                # ValueError keeps the pump on its backoff-and-reconnect path
+                raise ValueError(f"malformed upstream status line {status[:80]!r}")
+            return int(parts[1]), headers
+        k, _, v = line.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+
+async def _body_chunks(reader, headers):
+    """Yield raw body bytes, undoing chunked transfer-encoding when present."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                return
+            yield await reader.readexactly(size)
+            await reader.readline()
+    while True:
+        data = await reader.read(65536)
+        if not data:
+            return
+        yield data
+
+async def upstream_events(url, headers=None, timeout=10.0):
+    """Yield SSE event blocks (text between blank lines, without the separator)."""
+    u = urllib.parse.urlsplit(url)
+    port = u.port or (443 if u.scheme == "https" else 80)
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(
+        u.hostname, port, ssl=ssl.create_default_context() if u.scheme == "https" else None), timeout)
+    try:
+        path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+        extra = "".join(f"{k}: {v}\r\n" for k, v in (headers or {}).items())
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {u.hostname}\r\nAccept: text/event-stream\r\n"
+                     f"Cache-Control: no-cache\r\n{extra}\r\n".encode("latin-1"))
+        await writer.drain()
+        code, head = await asyncio.wait_for(_read_head(reader), timeout)
+        if code != 200:
+            raise ConnectionError(f"upstream answered {code}")
+        buf = ""
+        async for chunk in _body_chunks(reader, head):
+            buf += chunk.decode("utf-8", "replace").replace("\r\n", "\n")
+            *blocks, buf = buf.split("\n\n")
+            for b in blocks:
+                if b.strip():
+                    yield b
+    finally:
+        writer.close()
+
+# ---------- broker ----------
+
+class Subscriber:
+    def __init__(self, size):
+        self.queue = asyncio.Queue(size)
+        self.dropped = False
+
+class Channel:
+    """One upstream stream, many subscribers. Events get broker-assigned ids so
+    Last-Event-ID replays are exact within the ring."""
+
+    def __init__(self, broker, name, url):
+        self.broker, self.name, self.url = broker, name, url
+        self.subscribers = set()
+        self.ring = collections.deque(maxlen=broker.replay)
+        self.next_id = 1
+        self.task = None
+        self.idle_since = None
+        self.stats = {"events": 0, "dropped": 0, "upstream_connects": 0}
+
+    def publish(self, block):
+        # drop upstream ids; ours are monotonic per channel
+        lines = [l for l in block.split("\n") if not l.startswith("id:")]
+        event = (self.next_id, f"id: {self.next_id}\n" + "\n".join(lines) + "\n\n")
+        self.next_id += 1
+        self.ring.append(event)
+        self.stats["events"] += 1
+        for sub in list(self.subscribers):
+            try:
+                sub.queue.put_nowait(event[1])
+            except asyncio.QueueFull:
+                # slow consumer: cut it loose rather than buffer without bound
+                sub.dropped = True
+                self.subscribers.discard(sub)
+                self.stats["dropped"] += 1
+
+    async def pump(self):
+        backoff = 0.5
+        while True:
+            if not self.subscribers:
+                if self.idle_since and time.monotonic() - self.idle_since > self.broker.idle_close:
+                    self.broker.channels.pop(self.name, None)
+                    return
+                await asyncio.sleep(0.5)
+                continue
+            try:
+                self.stats["upstream_connects"] += 1
+                async for block in upstream_events(self.url, self.broker.upstream_headers):
+                    backoff = 0.5
+                    self.publish(block)
+                    if self.idle_since and time.monotonic() - self.idle_since > self.broker.idle_close:
+                        break
+            except (OSError, ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                pass
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 15.0)
+
+    def subscribe(self, last_id=None, replay_all=False):
+        sub = Subscriber(self.broker.buffer)
+        self.subscribers.add(sub)
+        self.idle_since = None
+        if last_id is not None or replay_all:
+            missed = [text for eid, text in self.ring if last_id is None or eid > last_id]
+            # leave half the buffer for live events so a replay alone never drops the client
+            for text in missed[-max(1, self.broker.buffer // 2):]:
+                sub.queue.put_nowait(text)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.pump())
+        return sub
+
+    def unsubscribe(self, sub):
+        self.subscribers.discard(sub)
+        if not self.subscribers:
+            self.idle_since = time.monotonic()
+
+class Broker:
+    def __init__(self, upstream, buffer=256, replay=512, idle_close=30.0, heartbeat=15.0, upstream_headers=None):
+        self.upstream, self.buffer, self.replay = upstream, buffer, replay
+        self.idle_close, self.heartbeat = idle_close, heartbeat
+        self.upstream_headers = upstream_headers or {}
+        self.channels = {}
+
+    def channel(self, name):
+        ch = self.channels.get(name)
+        if ch is None:
+            sep = "&" if "?" in self.upstream else "?"
+            url = self.upstream if name == "default" else f"{self.upstream}{sep}channel={urllib.parse.quote(name)}"
+            ch = self.channels[name] = Channel(self, name, url)
+        return ch
+
+    def stats(self):
+        return {name: dict(ch.stats, subscribers=len(ch.subscribers), buffered=len(ch.ring))
+                for name, ch in self.channels.items()}
+
+    async def handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = line.decode("latin-1").partition(":")
+                headers[k.strip().lower()] = v.strip()
+            parts = request.decode("latin-1").split()
+            if len(parts) < 2:
+                return
+            u = urllib.parse.urlsplit(parts[1])
+            q = dict(urllib.parse.parse_qsl(u.query))
+            if u.path == STREAM_PATH + "/_stats":
+                body = json.dumps(self.stats()).encode("utf-8")
+                writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: %d\r\n"
+                             b"connection: close\r\n\r\n%s" % (len(body), body))
+                return
+            if u.path != STREAM_PATH:
+                writer.write(b"HTTP/1.1 404 Not Found\r\ncontent-length: 0\r\nconnection: close\r\n\r\n")
+                return
+            await self.stream(writer, self.channel(q.get("channel", "default")),
+                              headers.get("last-event-id") or q.get("last_event_id"), q.get("replay") == "1")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def stream(self, writer, ch, last_id, replay_all):
+        sub = ch.subscribe(int(last_id) if last_id and last_id.isdigit() else None, replay_all)
+        # keep kernel buffering small so the per-client queue is what bounds a slow reader
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SNDBUF)
+        writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ncache-control: no-cache\r\n"
+                     b"connection: keep-alive\r\nx-accel-buffering: no\r\n\r\n")
+        try:
+            while not sub.dropped:
+                try:
+                    text = await asyncio.wait_for(sub.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    text = ": ping\n\n"
+                writer.write(text.encode("utf-8"))
+                await writer.drain()
+            writer.write(b": dropped (slow consumer), reconnect with Last-Event-ID\n\n")
+        finally:
+            ch.unsubscribe(sub)
+
+# ---------- fake upstream ----------
+
+async def fake_upstream(host, port, rate):
+    """SSE endpoint emitting `rate` events/sec, chunked like a real server."""
+    async def handle(reader, writer):
+        try:
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ntransfer-encoding: chunked\r\n\r\n")
+            seq = 0
+            while True:
+                seq += 1
+                ev = f"event: token\ndata: {json.dumps({'seq': seq, 'ts': time.time()})}\n\n".encode("utf-8")
+                writer.write(b"%x\r\n%s\r\n" % (len(ev), ev))
+                await writer.drain()
+                await asyncio.sleep(1 / rate)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return await asyncio.start_server(handle, host, port)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SSE fan-out broker for the D.A.D. agent stream.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="run the broker")
+    s.add_argument("--upstream", required=True, help="upstream SSE URL (?channel=<name> is appended per channel)")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8791)
+    s.add_argument("--buffer", type=int, default=256, help="events buffered per client before it is dropped")
+    s.add_argument("--replay", type=int, default=512, help="events kept per channel for late joiners")
+    s.add_argument("--idle-close", type=float, default=30.0, help="seconds a channel stays up with no subscribers")
+    s.add_argument("--header", action="append", default=[], metavar="NAME:VALUE", help="header sent upstream")
+    f = sub.add_parser("fake-upstream", help="run a local stand-in agent stream")
+    f.add_argument("--host", default="127.0.0.1")
+    f.add_argument("--port", type=int, default=8792)
+    f.add_argument("--rate", type=float, default=10.0, help="events per second (default: 10)")
+    args = ap.parse_args(argv)
+
+    async def run():
+        if args.cmd == "fake-upstream":
+            await fake_upstream(args.host, args.port, args.rate)
+            print(f"✅ fake upstream on http://{args.host}:{args.port}/", flush=True)
+        else:
+            headers = dict(h.split(":", 1) for h in args.header)
+            broker = Broker(args.upstream, args.buffer, args.replay, args.idle_close,
+                            upstream_headers={k.strip(): v.strip() for k, v in headers.items()})
+            await asyncio.start_server(broker.handle, args.host, args.port)
+            print(f"✅ SSE broker on http://{args.host}:{args.port}{STREAM_PATH}", flush=True)
+        await asyncio.Event().wait()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# stamp_build.py
+# Post-build stamping for a built dashboard dist/: writes dist/healthz.json and injects
+# build-rev/build-ts meta tags into the HTML, the in-process replacement for
+# ops/write_health.sh + ops/inject_build_meta.sh. One read of .git instead of
+# `git rev-parse` forks, one streaming pass per HTML file instead of awk. Stdlib only;
+# bundles ship it as ops/stamp_build.py and run it as their npm postbuild.
+#
+#   python3 ops/stamp_build.py dist
+#   SOURCE_DATE_EPOCH=1700000000 python3 ops/stamp_build.py dist --reproducible
+#   python3 ops/stamp_build.py dist --html dist/index.html dist/404.html
+
+import os, sys, pathlib, argparse, datetime
+
+def git_head(start="."):
+    """Full HEAD commit of the repo containing `start`, read straight from .git; None if unknown."""
+    d = pathlib.Path(start).resolve()
+    for d in (d, *d.parents):
+        git = d / ".git"
+        if git.is_file():  # worktree / submodule: "gitdir: <path>"
+            git = (d / git.read_text(encoding="utf-8").split(":", 1)[1].strip()).resolve()
+        if git.is_dir():
+            break
+    else:
+        return None
+    common = git
+    if (git / "commondir").is_file():
+        common = (git / (git / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    try:
+        head = (git / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not head.startswith("ref: "):
+        return head or None
+    ref = head[5:]
+    for base in (git, common):
+        if (base / ref).is_file():
+            return (base / ref).read_text(encoding="utf-8").strip()
+    packed = common / "packed-refs"
+    if packed.is_file():
+        for line in packed.read_text(encoding="utf-8").splitlines():
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return sha
+    return None
+
+def stamp(dist="dist", html=None, now=None, repo="."):
+    """Write <dist>/healthz.json and inject build-rev/build-ts meta tags before the first
+    </head> of each HTML file (default: <dist>/index.html), byte-for-byte as the scripts do."""
+    dist = pathlib.Path(dist)
+    now = now or datetime.datetime.now().astimezone()
+    ts = now.isoformat(timespec="seconds")
+    commit = git_head(repo)
+    dist.mkdir(parents=True, exist_ok=True)
+    (dist / "healthz.json").write_text(
+        '{"status":"ok","ts":"%s","app":{"name":"SysOps Dashboard","version":""},"git":{"short":"%s"}}\n'
+        % (ts, commit[:7] if commit else "unknown"), encoding="utf-8")
+    meta = ('  <meta name="build-rev" content="%s">\n  <meta name="build-ts" content="%s">\n'
+            % (commit[:7] if commit else "local", ts))
+    stamped = []
+    for path in (html or [dist / "index.html"]):
+        path = pathlib.Path(path)
+        tmp = path.with_name(path.name + ".stamp.tmp")
+        done = False
+        with open(path, "r", encoding="utf-8", newline="") as src, open(tmp, "w", encoding="utf-8", newline="") as dst:
+            for line in src:
+                if not done and "</head>" in line:
+                    dst.write(meta)
+                    done = True
+                dst.write(line if line.endswith("\n") else line + "\n")
+        os.replace(tmp, path)
+        stamped.append(path)
+    return stamped
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write healthz.json and inject build meta into a built dist/.")
+    ap.add_argument("dist", nargs="?", default="dist")
+    ap.add_argument("--html", nargs="+", metavar="FILE", help="HTML files to stamp (default: DIST/index.html)")
+    ap.add_argument("--reproducible", action="store_true", help="stamp SOURCE_DATE_EPOCH instead of the current time")
+    args = ap.parse_args(argv)
+
+    now = None
+    if args.reproducible:
+        now = datetime.datetime.fromtimestamp(int(os.environ.get("SOURCE_DATE_EPOCH", 0)), datetime.timezone.utc)
+    for path in stamp(args.dist, args.html, now):
+        print(f"✅ stamped {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+# status_proxy.py
+# Shared caching proxy for the SysOps dashboard's polled endpoints (status summary,
+# SLO, JIT status, cost/minute, AI spend). Per-endpoint TTL, single-flight upstream
+# fetches, stale-while-revalidate, stale-if-error and ETag/304, so N open dashboards
+# cost about one upstream call per interval. Stdlib only.
+#
+#   python status_proxy.py --port 8790
+#   UPSTREAM_SLO_STATUS_URL=https://api.example.com/_status python status_proxy.py
+#
+# Every generated bundle ships it as services/status-proxy (`make status-proxy`). The
+# dashboard reaches it same-origin under /ops/cache/*: the Vite dev server forwards that
+# prefix here, production routes it with a CloudFront behavior (see README_FIVERR.md),
+# and --with-proxy points the polled VITE_* URLs at it. getJSON's cache: "no-cache" makes
+# browsers revalidate with If-None-Match, which this proxy answers with 304.
+
+import os, re, sys, json, time, hashlib, argparse, threading, urllib.request, urllib.error, http.server
+
+# local path -> (upstream env var, default upstream, ttl seconds); TTLs match the
+# dashboard's polling: Overview every 30s, Cost every 60s
+ROUTES = {
+    "/ops/cache/status/summary": ("UPSTREAM_STATUS_SUMMARY_URL", "https://status.remimediaventures.com/api/summary", 30),
+    "/ops/cache/slo/status": ("UPSTREAM_SLO_STATUS_URL", "https://api.remimediaventures.com/_status", 30),
+    "/ops/cache/jit/status": ("UPSTREAM_JIT_STATUS_URL", "https://sysops.remimediaventures.com/ops/repo-access/status", 30),
+    "/ops/cache/cost/minute": ("UPSTREAM_OPS_COST_MIN_URL", "https://ops.remimediaventures.com/cost/minute", 60),
+    "/ops/cache/ai/spend24h": ("UPSTREAM_OPS_AI_SPEND24H_URL", "https://ops.remimediaventures.com/ai/spend24h", 60),
+}
+
+# entity-tags in an If-None-Match list (RFC 9110 8.8.3); W/ marks a weak tag
+_ETAG = re.compile(r'(?:W/)?("[^"]*")')
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of `etag` against an If-None-Match header value."""
+    if if_none_match.strip() == "*":
+        return True
+    return etag in _ETAG.findall(if_none_match)
+
+class Entry:
+    __slots__ = ("status", "body", "content_type", "etag", "fetched")
+
+    def __init__(self, status, body, content_type):
+        self.status, self.body, self.content_type = status, body, content_type
+        self.etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        self.fetched = time.monotonic()
+
+class Cache:
+    """TTL cache with single-flight refresh. A stale entry younger than ttl + swr is
+    served immediately while one background fetch refreshes it. Upstream 5xx replies
+    never replace a good copy; with none to fall back on they are kept for `error_ttl`
+    only, so concurrent pollers share one failed fetch without caching the outage."""
+
+    def __init__(self, fetch, swr=30.0, error_ttl=1.0):
+        self.fetch = fetch
+        self.swr = swr
+        self.error_ttl = error_ttl
+        self.entries = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.stats = {"hit": 0, "stale": 0, "miss": 0, "coalesced": 0, "upstream": 0, "errors": 0}
+
+    def _refresh(self, key, url):
+        try:
+            entry = self.fetch(url)
+            with self.lock:
+                self.stats["upstream"] += 1
+                # keep serving the last good copy when upstream starts failing
+                prev = self.entries.get(key)
+                if entry.status < 500 or prev is None or prev.status >= 500:
+                    self.entries[key] = entry
+        except Exception:
+            with self.lock:
+                self.stats["errors"] += 1
+        finally:
+            with self.lock:
+                self.inflight.pop(key).set()
+
+    def get(self, key, url, ttl):
+        """(Entry or None, "hit" | "stale" | "miss")."""
+        with self.lock:
+            entry = self.entries.get(key)
+            age = time.monotonic() - entry.fetched if entry else None
+            if entry and entry.status >= 500:
+                ttl, swr = min(ttl, self.error_ttl), 0
+            else:
+                swr = self.swr
+            if entry and age < ttl:
+                self.stats["hit"] += 1
+                return entry, "hit"
+            flight = self.inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.inflight[key] = threading.Event()
+            if entry and age < ttl + swr:
+                self.stats["stale"] += 1
+                if leader:
+                    threading.Thread(target=self._refresh, args=(key, url), daemon=True).start()
+                return entry, "stale"
+            self.stats["miss" if leader else "coalesced"] += 1
+        if leader:
+            self._refresh(key, url)
+        else:
+            flight.wait()
+        with self.lock:
+            # stale-if-error: an expired entry still beats a 502
+            return self.entries.get(key) or entry, "miss"
+
+def upstream_fetcher(timeout=10.0, headers=None):
+    headers = {"accept": "application/json", **(headers or {})}
+    def fetch(url):
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                return Entry(r.status, r.read(), r.headers.get("content-type", "application/json"))
+        except urllib.error.HTTPError as e:
+            return Entry(e.code, e.read(), e.headers.get("content-type", "application/json"))
+    return fetch
+
+class ProxyServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, routes, cache, cors_origin=None):
+        super().__init__(addr, ProxyHandler)
+        self.routes, self.cache, self.cors_origin = routes, cache, cors_origin
+
+class ProxyHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, body=b"", headers=()):
+        self.send_response(code)
+        for k, v in headers:
+            self.send_header(k, v)
+        if self.server.cors_origin:
+            self.send_header("access-control-allow-origin", self.server.cors_origin)
+            self.send_header("access-control-expose-headers", "etag, x-cache, age")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self._send(204, headers=[("access-control-allow-methods", "GET, HEAD"),
+                                 ("access-control-allow-headers", "*"), ("access-control-max-age", "600")])
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/ops/cache/_stats":
+            c = self.server.cache
+            with c.lock:
+                doc = dict(c.stats, entries=len(c.entries))
+            return self._send(200, json.dumps(doc).encode("utf-8"), [("content-type", "application/json")])
+        if path not in self.server.routes:
+            return self._send(404, b'{"error":"not found"}', [("content-type", "application/json")])
+        url, ttl = self.server.routes[path]
+        entry, state = self.server.cache.get(path, url, ttl)
+        if entry is None:
+            return self._send(502, b'{"error":"upstream unavailable"}', [("content-type", "application/json")])
+        headers = [("etag", entry.etag), ("cache-control", "no-cache"), ("x-cache", state.upper()),
+                   ("age", str(int(time.monotonic() - entry.fetched)))]
+        if entry.status == 200 and etag_matches(self.headers.get("if-none-match", ""), entry.etag):
+            return self._send(304, headers=headers)
+        self._send(entry.status, entry.body, headers + [("content-type", entry.content_type)])
+
+    do_HEAD = do_GET
+
+def routes_from_env(env=os.environ, ttl_scale=1.0):
+    return {path: (env.get(var, default), ttl * ttl_scale) for path, (var, default, ttl) in ROUTES.items()}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Caching/coalescing proxy for the SysOps dashboard endpoints.")
+    ap.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8790)))
+    ap.add_argument("--swr", type=float, default=30.0, help="stale-while-revalidate window in seconds (default: 30)")
+    ap.add_argument("--ttl-scale", type=float, default=1.0, help="multiply every endpoint TTL (default: 1)")
+    ap.add_argument("--error-ttl", type=float, default=1.0,
+                    help="seconds an upstream 5xx is reused when there is no good copy (default: 1)")
+    ap.add_argument("--timeout", type=float, default=10.0, help="upstream timeout in seconds (default: 10)")
+    ap.add_argument("--cors-origin", default=os.environ.get("PROXY_CORS_ORIGIN"),
+                    help="allow this origin when the dashboard is served elsewhere")
+    args = ap.parse_args(argv)
+
+    headers = {}
+    if os.environ.get("PROXY_AUTH_HEADER") and os.environ.get("PROXY_AUTH_VALUE"):
+        headers[os.environ["PROXY_AUTH_HEADER"]] = os.environ["PROXY_AUTH_VALUE"]
+    cache = Cache(upstream_fetcher(args.timeout, headers), args.swr, args.error_ttl)
+    srv = ProxyServer((args.host, args.port), routes_from_env(ttl_scale=args.ttl_scale), cache, args.cors_origin)
+    print(f"✅ status proxy on http://{args.host}:{srv.server_address[1]}/ops/cache/", flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+# The tools are standalone scripts at the repo root; make them importable from tests/.
+import sys, pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
@@ -0,0 +1,81 @@
+import json, threading
+
+import pytest
+
+import dist_upload
+import build_sysops_dashboard as gen
+
+@pytest.fixture
+def stub():
+    srv = dist_upload.StubS3(("127.0.0.1", 0))
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def _client(srv, service="s3"):
+    return dist_upload.Client(f"http://127.0.0.1:{srv.server_address[1]}", service, "us-east-1",
+                              {"key": "k", "secret": "s"}, timeout=5, retries=0)
+
+def _upload(srv, dist, **kw):
+    bucket = dist_upload.Bucket(_client(srv), "s3://dash")
+    return dist_upload.upload(dist, bucket, "E123", _client(srv, "cloudfront"), workers=4, log=lambda *a: None, **kw)
+
+@pytest.fixture
+def dist(tmp_path):
+    d = tmp_path / "dist"
+    (d / "assets").mkdir(parents=True)
+    (d / "index.html").write_text("<html><head></head><body>v1</body></html>\n")
+    (d / "healthz.json").write_text('{"status":"ok"}\n')
+    (d / "assets" / "app-Ab12Cd34.js").write_text("console.log(1)\n")
+    return d
+
+def test_unchanged_objects_are_skipped(stub, dist):
+    first = _upload(stub, dist)
+    assert first["uploaded"] == 3
+    second = _upload(stub, dist)
+    assert (second["uploaded"], second["skipped"], second["invalidated"]) == (0, 3, [])
+
+def test_invalidation_lists_only_changed_no_cache_paths(stub, dist):
+    _upload(stub, dist)
+    (dist / "index.html").write_text("<html><head></head><body>v2</body></html>\n")
+    (dist / "assets" / "app-Ef56Gh78.js").write_text("console.log(2)\n")
+    summary = _upload(stub, dist)
+    assert summary["uploaded"] == 2
+    assert summary["invalidated"] == ["/", "/index.html"]
+    assert stub.invalidations[-1] == {"distribution": "E123", "paths": ["/", "/index.html"]}
+
+def test_multipart_above_threshold(stub, dist, monkeypatch):
+    monkeypatch.setattr(dist_upload, "MULTIPART_MIN", 1 << 16)
+    monkeypatch.setattr(dist_upload, "PART_SIZE", 1 << 15)
+    big = bytes(range(256)) * 400  # 102400 bytes: 4 parts
+    (dist / "assets" / "big-Zz99Yy88.bin").write_bytes(big)
+    _upload(stub, dist)
+    data, meta = stub.objects["dash/assets/big-Zz99Yy88.bin"]
+    assert data == big
+    assert meta["etag"].endswith("-4")
+    assert not stub.uploads
+
+def test_delete_removes_stale_keys(stub, dist):
+    (dist / "old.html").write_text("gone soon\n")
+    _upload(stub, dist)
+    (dist / "old.html").unlink()
+    kept = _upload(stub, dist)
+    assert kept["deleted"] == 0 and "dash/old.html" in stub.objects
+    summary = _upload(stub, dist, delete=True)
+    assert summary["deleted"] == 1
+    assert "dash/old.html" not in stub.objects
+    assert "/old.html" in summary["invalidated"]
+    remote = json.loads(stub.objects["dash/" + dist_upload.REMOTE_MANIFEST][0])
+    assert "old.html" not in remote
+
+def test_cache_manifest_uploads_variant_and_rejects_stale_manifest(stub, dist):
+    (dist / "healthz.json").write_text(json.dumps({"status": "ok", "pad": "x" * 4096}))
+    gen.fingerprint(dist)
+    summary = _upload(stub, dist)
+    assert summary["failed"] == 0
+    assert stub.objects["dash/healthz.json"][1]["content-encoding"] == "gzip"
+    (dist / "healthz.json").write_text('{"status":"degraded"}\n')
+    with pytest.raises(dist_upload.StaleManifest):
+        _upload(stub, dist)
@@ -0,0 +1,93 @@
+import time, socket, asyncio
+
+import fleet_health
+
+def _free_ports(n):
+    socks = [socket.socket() for _ in range(n)]
+    for s in socks:
+        s.bind(("127.0.0.1", 0))
+    ports = [s.getsockname()[1] for s in socks]
+    for s in socks:
+        s.close()
+    return ports
+
+def _targets(ports):
+    return [{"name": f"app{p}", "url": f"http://127.0.0.1:{p}/healthz.json"} for p in ports]
+
+async def _raw_server(reply):
+    """Answer every request on a keep-alive connection with `reply` (None: never answer)."""
+    async def handle(reader, writer):
+        while await reader.readline():
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            if reply is None:
+                await asyncio.sleep(3600)
+            writer.write(reply)
+            await writer.drain()
+        writer.close()
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+def test_stub_fleet_is_polled_concurrently():
+    ports = _free_ports(20)
+
+    async def run():
+        servers = await fleet_health.serve_stubs(ports, delay_ms=200, down={ports[0]})
+        try:
+            t = time.perf_counter()
+            doc = await fleet_health.poll(_targets(ports), rounds=2, interval=0.01, jitter=0, timeout=2)
+            return doc, time.perf_counter() - t
+        finally:
+            for s in servers:
+                s.close()
+
+    doc, elapsed = asyncio.run(run())
+    assert elapsed < 1.5  # 20 targets x 2 rounds x 200 ms would be 8 s one at a time
+    assert doc["summary"] == {"total": 20, "up": 19, "down": 1}
+    down = doc["targets"][f"app{ports[0]}"]
+    assert (down["code"], down["checks"], down["failures"]) == (503, 2, 2)
+
+def test_hung_target_is_down_after_its_timeout():
+    async def run():
+        srv = await _raw_server(None)
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            t = time.perf_counter()
+            doc = await fleet_health.poll(_targets([port]), rounds=1, timeout=0.3)
+            return doc["targets"][f"app{port}"], time.perf_counter() - t
+        finally:
+            srv.close()
+
+    state, elapsed = asyncio.run(run())
+    assert state["status"] == "down" and state["error"] == "timeout after 0.3s"
+    assert elapsed < 1.0  # not retried on a second connection
+
+def test_bodiless_replies_do_not_wait_for_close():
+    async def run():
+        srv = await _raw_server(b"HTTP/1.1 204 No Content\r\n\r\n")
+        port = srv.sockets[0].getsockname()[1]
+        pool = fleet_health.Pool()
+        try:
+            t = time.perf_counter()
+            first = await pool.get(f"http://127.0.0.1:{port}/healthz.json", 2)
+            second = await pool.get(f"http://127.0.0.1:{port}/healthz.json", 2)
+            return first, second, time.perf_counter() - t, sum(map(len, pool.idle.values()))
+        finally:
+            pool.close()
+            srv.close()
+
+    first, second, elapsed, idle = asyncio.run(run())
+    assert first == second == (204, b"")
+    assert elapsed < 1.0 and idle == 1  # same keep-alive connection both times
+
+def test_garbage_reply_is_down_not_a_crash():
+    async def run():
+        srv = await _raw_server(b"garbage\r\n\r\n")
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            doc = await fleet_health.poll(_targets([port]), rounds=1, timeout=1)
+            return doc["targets"][f"app{port}"]
+        finally:
+            srv.close()
+
+    state = asyncio.run(run())
+    assert state["status"] == "down" and state["error"].startswith("ValueError")
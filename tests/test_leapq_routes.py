@@ -0,0 +1,48 @@
+import json
+
+import leapq_routes
+from leapq_routes import RouteTable
+
+def _rule(method, endpoint, then, source="sysops"):
+    return {"source": source, "when": {"method": method, "endpoint": endpoint}, "then": then}
+
+def test_dead_end_static_branch_falls_back_to_param_sibling():
+    t = RouteTable()
+    t.add(_rule("GET", "/api/users/me/settings", {"static": {"body": {"me": True}}}))
+    t.add(_rule("GET", "/api/users/:id/profile", {"invoke": {"service": "users", "path": "/profile/$params.id"}}))
+    # "me" matches the static child, which has no "profile" below it
+    route, params = t.match("GET", "/api/users/me/profile")
+    assert route.endpoint == "/api/users/:id/profile" and params == {"id": "me"}
+    route, params = t.match("GET", "/api/users/me/settings")
+    assert route.endpoint == "/api/users/me/settings" and params == {}
+    assert t.resolve("GET", "/api/users/a b/profile")["path"] == "/profile/a%20b"
+    assert t.match("GET", "/api/users/me/nothing") == (None, {})
+
+def test_params_only_bound_along_the_matching_path():
+    t = RouteTable()
+    t.add(_rule("GET", "/:a/x/end", {"static": {"body": 1}}))
+    t.add(_rule("GET", "/:a/:b/other", {"static": {"body": 2}}))
+    route, params = t.match("GET", "/1/x/other")
+    assert route.endpoint == "/:a/:b/other" and params == {"a": "1", "b": "x"}
+
+def test_static_route_returns_pre_serialised_bytes():
+    t = RouteTable()
+    t.add(_rule("GET", "/healthz", {"static": {"code": 203, "body": {"status": "ok", "n": [1, 2]}}}))
+    first = t.resolve("GET", "/healthz?x=1")
+    second = t.resolve("GET", "/healthz")
+    assert first == {"kind": "static", "code": 203, "body": b'{"status":"ok","n":[1,2]}'}
+    assert first["body"] is second["body"]  # serialised once at compile time, not per request
+
+def test_invoke_body_map_keeps_raw_types(tmp_path):
+    src = tmp_path / "routes.jsonl"
+    src.write_text(json.dumps(_rule("POST", "/api/upload", {"invoke": {
+        "service": "files", "path": "/v1/$actor.email",
+        "body_map": {"ref": "$request.body.file_ref", "n": "$query.n", "label": "file $request.body.file_ref"}}})) + "\n")
+    out = leapq_routes.load(src).resolve("POST", "/api/upload?n=3", {"file_ref": {"id": 7}}, {"email": "a@b.c"})
+    assert out == {"kind": "invoke", "service": "files", "path": "/v1/a%40b.c",
+                   "body": {"ref": {"id": 7}, "n": "3", "label": 'file {"id": 7}'}}
+
+def test_bench_refuses_an_empty_table(tmp_path, capsys):
+    (tmp_path / "empty.jsonl").write_text("")
+    assert leapq_routes.main(["bench", str(tmp_path / "empty.jsonl"), "-n", "10"]) == 1
+    assert "no rules loaded" in capsys.readouterr().out
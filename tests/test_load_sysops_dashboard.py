@@ -0,0 +1,52 @@
+import json, time, random, asyncio
+
+import load_sysops_dashboard as load
+
+async def _chunked_sse(events, heartbeats):
+    """Chunked SSE endpoint: each event split across two chunks with a heartbeat
+    comment between events, then a clean end of stream."""
+    async def handle(reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ntransfer-encoding: chunked\r\n\r\n")
+        for seq in range(events):
+            ev = f"id: {seq}\r\nevent: token\r\ndata: {json.dumps({'seq': seq, 'ts': time.time()})}\r\n\r\n".encode()
+            for part in (ev[:7], ev[7:]) + (b":\n\n",) * heartbeats:
+                writer.write(b"%x\r\n%s\r\n" % (len(part), part))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        writer.close()
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+def test_stream_counts_events_not_chunk_framing_or_heartbeats():
+    async def run():
+        srv = await _chunked_sse(events=5, heartbeats=3)
+        stats = load.Stats()
+        url = f"http://127.0.0.1:{srv.sockets[0].getsockname()[1]}/agent/stream"
+        task = asyncio.create_task(load.hold_stream(stats, url, {}, 2.0, random.Random(0)))
+        try:
+            while not stats.streams["dropped"]:
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            srv.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats.streams["events"] == 5
+    assert stats.stream_lag.latency.n == 5
+    assert stats.streams["failed"] == 0
+
+def test_read_body_handles_bodiless_and_chunked():
+    async def run():
+        out = []
+        for code, head, raw in [(304, {"content-length": "10"}, b""),
+                                (200, {"transfer-encoding": "chunked"}, b"3\r\nabc\r\n2;x=1\r\nde\r\n0\r\n\r\n"),
+                                (200, {"content-length": "2"}, b"okEXTRA")]:
+            reader = asyncio.StreamReader()
+            reader.feed_data(raw)
+            reader.feed_eof()
+            out.append(await load._read_body(reader, code, head))
+        return out
+
+    assert asyncio.run(run()) == [b"", b"abcde", b"ok"]
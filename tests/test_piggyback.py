@@ -0,0 +1,64 @@
+import json, random, threading
+
+import pytest
+
+import piggyback
+
+@pytest.fixture
+def stub():
+    srv = piggyback.StubDAD(("127.0.0.1", 0))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "handoff"
+    (root / "ops/handshakes").mkdir(parents=True)
+    (root / "ops/routes").mkdir()
+    for name in ("master", "sysops"):
+        (root / f"ops/handshakes/{name}.json").write_text(json.dumps({"id": name, "port": 3000}))
+    (root / "ops/routes/sysops.jsonl").write_text("".join(
+        json.dumps({"source": "sysops", "when": {"method": "GET", "endpoint": f"/api/r{n}"},
+                    "then": {"static": {"body": {"n": n}}}}) + "\n" for n in range(6)))
+    return root
+
+def _publish(srv, bundle, state, **kw):
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    client = piggyback.Client(base, timeout=5, retries=kw.pop("retries", 4), backoff=kw.pop("backoff", 0.001))
+    return piggyback.publish(bundle, base, state_path=state, client=client, log=lambda *a: None, **kw)
+
+def test_unchanged_items_are_not_republished(stub, bundle, tmp_path):
+    state = tmp_path / "state.json"
+    first = _publish(stub, bundle, state)
+    assert (first["published"], first["skipped"]) == (8, 0)
+    assert len(stub.handshakes) == 2 and len(stub.routes) == 6
+    second = _publish(stub, bundle, state)
+    assert (second["published"], second["skipped"], second["requests"]) == (0, 8, 0)
+    (bundle / "ops/handshakes/sysops.json").write_text(json.dumps({"id": "sysops", "port": 3001}))
+    third = _publish(stub, bundle, state)
+    assert (third["published"], third["skipped"]) == (1, 7)
+    assert stub.handshakes["sysops"]["port"] == 3001
+    assert _publish(stub, bundle, state, force=True)["published"] == 8
+
+def test_flaky_endpoint_is_retried(stub, bundle, tmp_path, monkeypatch):
+    stub.flaky = 0.5
+    # seeded: the stub's first draw (0.13) is a 503, so at least one retry always happens
+    monkeypatch.setattr(piggyback, "random", random.Random(1))
+    summary = _publish(stub, bundle, tmp_path / "state.json", retries=30, batch=3)
+    assert summary["failed"] == 0 and summary["published"] == 8
+    assert len(stub.routes) == 6
+    assert stub.requests == summary["requests"] > 4  # 2 handshakes + 2 route batches, plus retries
+
+def test_retries_back_off_exponentially_then_fail(stub, bundle, tmp_path, monkeypatch):
+    stub.flaky = 1.0
+    sleeps = []
+    monkeypatch.setattr(piggyback.time, "sleep", sleeps.append)
+    summary = _publish(stub, bundle, tmp_path / "state.json", workers=1, retries=3, backoff=0.1)
+    assert summary["failed"] == 8 and summary["published"] == 0
+    assert stub.requests == 8 * 4
+    for n, delay in enumerate(sleeps[:3]):
+        assert 0.1 * 2 ** n * 0.5 <= delay <= 0.1 * 2 ** n * 1.5
+    # nothing failed is recorded, so the next run retries it all
+    assert json.loads((tmp_path / "state.json").read_text())[f"http://127.0.0.1:{stub.server_address[1]}"] == {}
@@ -0,0 +1,26 @@
+import json
+
+from slo_engine import Engine
+
+def _lines(n=200, t0=1_700_000_000.0):
+    return [json.dumps({"ts": t0 + i * 0.5, "app": "sysops", "latency_ms": 10 + i % 50,
+                        "status": 503 if i % 20 == 0 else 200}) for i in range(n)]
+
+def _engine():
+    return Engine(apps={"sysops"}, window_s=300, slot_s=10, event_time=True)
+
+def test_feed_accepts_bytes_str_and_mixed_lines():
+    text = _lines()
+    results = []
+    for lines in (text, [l.encode() for l in text], [l.encode() if i % 2 else l for i, l in enumerate(text)]):
+        e = _engine()
+        e.feed(lines)
+        results.append((e.status("sysops"), e.stats["bad"]))
+    assert results[0] == results[1] == results[2]
+    assert results[0][0]["slo"]["success_rate"] == 0.95 and results[0][1] == 0
+
+def test_bad_lines_are_counted_not_fatal():
+    e = _engine()
+    e.feed(_lines(10) + ["{not json", '{"app": "sysops"}'])
+    assert e.stats["bad"] == 2
+    assert e.status("sysops")["slo"]["p95_ms"] is not None
@@ -0,0 +1,83 @@
+import asyncio
+
+import sse_broker
+
+async def _open_stream(port, last_id=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    extra = f"Last-Event-ID: {last_id}\r\n" if last_id is not None else ""
+    writer.write(f"GET {sse_broker.STREAM_PATH} HTTP/1.1\r\nHost: x\r\n{extra}\r\n".encode())
+    code, _ = await sse_broker._read_head(reader)
+    assert code == 200
+    return reader, writer
+
+async def _read_ids(reader, n):
+    """Broker-assigned ids of the next `n` events, skipping comments/heartbeats."""
+    ids = []
+    while len(ids) < n:
+        block = (await reader.readuntil(b"\n\n")).decode()
+        if not block.startswith(":"):
+            ids.append(int(block.split("\n", 1)[0][len("id: "):]))
+    return ids
+
+def test_one_upstream_connection_serves_every_subscriber():
+    async def run():
+        upstream = await sse_broker.fake_upstream("127.0.0.1", 0, rate=200)
+        url = f"http://127.0.0.1:{upstream.sockets[0].getsockname()[1]}/stream"
+        broker = sse_broker.Broker(url, heartbeat=5)
+        srv = await asyncio.start_server(broker.handle, "127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        clients = [await _open_stream(port) for _ in range(8)]
+        try:
+            got = await asyncio.wait_for(asyncio.gather(*(_read_ids(r, 20) for r, _ in clients)), 10)
+            # a reconnect carrying Last-Event-ID resumes right after it, from the ring
+            last = got[0][-1]
+            r, w = await _open_stream(port, last_id=last)
+            clients.append((r, w))
+            resumed = await asyncio.wait_for(_read_ids(r, 5), 10)
+            return got, last, resumed, broker.channels["default"].stats
+        finally:
+            for _, w in clients:
+                w.close()
+            for ch in broker.channels.values():
+                ch.task.cancel()
+            srv.close()
+            upstream.close()
+
+    got, last, resumed, stats = asyncio.run(run())
+    assert stats["upstream_connects"] == 1
+    for ids in got:
+        assert ids == list(range(ids[0], ids[0] + 20))  # contiguous, no gaps or repeats
+    assert resumed == list(range(last + 1, last + 6))
+
+def _channel(buffer=4, replay=16):
+    broker = sse_broker.Broker("http://127.0.0.1:9/stream", buffer=buffer, replay=replay)
+    return broker.channel("default")
+
+def test_slow_consumer_is_dropped_without_stalling_others():
+    async def run():
+        ch = _channel(buffer=4)
+        slow, fast = ch.subscribe(), ch.subscribe()
+        seen = []
+        for n in range(10):
+            ch.publish(f"data: {n}")
+            while not fast.queue.empty():
+                seen.append(fast.queue.get_nowait())
+        ch.task.cancel()
+        return ch, slow, fast, seen
+
+    ch, slow, fast, seen = asyncio.run(run())
+    assert slow.dropped and slow not in ch.subscribers
+    assert not fast.dropped and len(seen) == 10
+    assert ch.stats["dropped"] == 1
+
+def test_last_event_id_replay_is_exact():
+    async def run():
+        ch = _channel(buffer=64, replay=16)
+        for n in range(20):
+            ch.publish(f"id: upstream-{n}\ndata: {n}")
+        sub = ch.subscribe(last_id=15)
+        ch.task.cancel()
+        return [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+
+    replayed = asyncio.run(run())
+    assert replayed == [f"id: {n}\ndata: {n - 1}\n\n" for n in range(16, 21)]
@@ -0,0 +1,31 @@
+import time
+
+from status_proxy import Cache, Entry, etag_matches
+
+def test_cold_5xx_is_not_served_for_the_ttl():
+    replies = [Entry(503, b'{"error":"down"}', "application/json"), Entry(200, b'{"ok":true}', "application/json")]
+    calls = []
+    cache = Cache(lambda url: calls.append(url) or replies[len(calls) - 1], swr=30, error_ttl=0.05)
+    entry, state = cache.get("/k", "u", 30)
+    assert (entry.status, state) == (503, "miss")
+    assert cache.get("/k", "u", 30)[0].status == 503 and len(calls) == 1  # shared briefly
+    time.sleep(0.06)
+    entry, state = cache.get("/k", "u", 30)
+    assert (entry.status, state, len(calls)) == (200, "miss", 2)
+    assert cache.get("/k", "u", 30)[1] == "hit"
+
+def test_5xx_never_replaces_a_good_copy():
+    replies = iter([Entry(200, b"good", "application/json"), Entry(502, b"bad", "application/json")])
+    cache = Cache(lambda url: next(replies), swr=0)
+    cache.get("/k", "u", 0)
+    entry, _ = cache.get("/k", "u", 0)
+    assert entry.body == b"good"
+
+def test_if_none_match_is_parsed_not_substring_matched():
+    tag = Entry(200, b"x", "application/json").etag
+    assert etag_matches(tag, tag)
+    assert etag_matches(f'"other", W/{tag}', tag)
+    assert etag_matches(" * ", tag)
+    assert not etag_matches(tag[:-5] + '"', tag)
+    assert not etag_matches(f'"prefix{tag[1:]}', tag)
+    assert not etag_matches("", tag)
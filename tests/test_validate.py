@@ -0,0 +1,34 @@
+import pytest
+
+from build_sysops_dashboard import check_balance
+
+@pytest.mark.parametrize("src", [
+    "const a = i++ / 2;\n",
+    "const a = i-- / 2;\n",
+    "const x = ({a: 1}) / 2;\n",
+    "const y = {a: 1} / 2;\n",
+    "const r = [1][0] / 2 / s.replace(/a\\/b/g, '').length;\n",
+    "if (a) { b() } /re/.test(c);\n",
+    "x = a ? {b: 1} : /re/;\n",
+])
+def test_division_and_regex(src):
+    assert check_balance(src) is None
+
+@pytest.mark.parametrize("src", [
+    "const f = <T,>(x: T) => x;\n",
+    "const f = <T extends object>(x: T) => x;\n",
+    "const f = <T extends Array<U>, U = number>(x: T): U => x[0];\n",
+    "const el = <div title={`a ${b}`}>{x / 2}</div>;\n",
+    "const el = <T>{x}</T>;\n",
+])
+def test_tsx(src):
+    assert check_balance(src, jsx=True) is None
+
+@pytest.mark.parametrize("src, jsx, problem", [
+    ("const b = (1;\n", False, "'(' never closed"),
+    ("const a = /x;\n", False, "unterminated regex literal"),
+    ("const el = <div>;\n", True, "<div> never closed"),
+    ("const el = <a></b>;\n", True, "</b> closes <a>"),
+])
+def test_real_breakage_is_reported(src, jsx, problem):
+    assert problem in check_balance(src, jsx)
@@ -0,0 +1,288 @@
+# umbrella_rollout.py
+# Staged rollout of the Umbrella-1 apps in parallel waves instead of strictly one after
+# another in `order`. Builds a dependency graph from umbrella1_manifest.json (apps whose
+# dashboard is "master" stage into the app that hosts it) plus optional explicit deps,
+# validates ports and the graph, then deploys each wave with a concurrency cap and gates
+# the next wave on every app's /healthz.json. Status transitions
+# (staged -> deploying -> verifying -> live | failed) are written back to the manifest
+# as they happen, so an interrupted rollout resumes where it stopped. Stdlib only.
+#
+#   python umbrella_rollout.py plan                                   # validate + print waves
+#   python umbrella_rollout.py run --deploy-cmd 'make up APP={app}' --concurrency 4
+#   python fleet_health.py stub & python umbrella_rollout.py run --deploy-cmd 'sleep 1'   # local dry run
+#
+# Explicit deps: a "depends_on": [...] list on a manifest entry, or --deps FILE with
+# {"app": ["dep", ...]}. Both add to the implicit master-dashboard edges (--no-implicit drops those).
+
+import os, sys, json, time, asyncio, pathlib, argparse
+
+from fleet_health import MANIFEST, Pool, Target, probe, _now
+
+STATUSES = ("staged", "deploying", "verifying", "live", "failed")
+
+# ---------- plan ----------
+
+def load_manifest(path):
+    return json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+
+def save_manifest(path, doc):
+    """Atomic rewrite in the manifest's own layout (2-space indent, no trailing newline)."""
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+def dependency_graph(apps, extra=None, implicit=True):
+    """{app: set(deps)} and a list of problems. Implicit edges: every app whose dashboard
+    is "master" depends on the app hosting the master dashboard (the one with a numeric
+    dashboard port and "master" in its name, or the only app with a numeric port)."""
+    problems = []
+    names = [a["app"] for a in apps]
+    deps = {n: set() for n in names}
+    if implicit and any(a.get("dashboard") == "master" for a in apps):
+        hosts = [a["app"] for a in apps if isinstance(a.get("dashboard"), int)]
+        masters = [n for n in hosts if "master" in n] or hosts
+        if len(masters) != 1:
+            problems.append(f"cannot tell which app hosts the master dashboard (candidates: {masters or 'none'})")
+        else:
+            for a in apps:
+                if a.get("dashboard") == "master" and a["app"] != masters[0]:
+                    deps[a["app"]].add(masters[0])
+    for a in apps:
+        deps[a["app"]].update(a.get("depends_on", ()))
+    for name, ds in (extra or {}).items():
+        if name not in deps:
+            problems.append(f"deps file names unknown app {name!r}")
+            continue
+        deps[name].update(ds)
+    for name, ds in deps.items():
+        for d in sorted(ds):
+            if d not in deps:
+                problems.append(f"{name} depends on unknown app {d!r}")
+                ds.discard(d)
+            elif d == name:
+                problems.append(f"{name} depends on itself")
+                ds.discard(d)
+    return deps, problems
+
+def check_ports(apps):
+    """Every api_port and numeric dashboard port must be a distinct valid port."""
+    problems, seen = [], {}
+    for a in apps:
+        for field in ("api_port", "dashboard"):
+            port = a.get(field)
+            if field == "dashboard" and not isinstance(port, int):
+                if port != "master":
+                    problems.append(f"{a['app']}: dashboard must be a port or \"master\", got {port!r}")
+                continue
+            if not isinstance(port, int) or not 0 < port < 65536:
+                problems.append(f"{a['app']}: {field} {port!r} is not a valid port")
+                continue
+            if port in seen:
+                problems.append(f"port {port} used by both {seen[port]} and {a['app']}.{field}")
+            else:
+                seen[port] = f"{a['app']}.{field}"
+    return problems
+
+def waves(deps, order):
+    """Group apps into waves: each app lands one wave after its deepest dependency, so
+    the number of waves is the longest dependency chain. Within a wave, `order` decides
+    who starts first. Raises ValueError on a cycle."""
+    level, remaining = {}, dict(deps)
+    while remaining:
+        ready = [n for n, ds in remaining.items() if all(d in level for d in ds)]
+        if not ready:
+            # drop apps that are only stuck behind the cycle, leaving the cycle itself
+            stuck = set(remaining)
+            while True:
+                needed = {d for n in stuck for d in remaining[n]}
+                if needed >= stuck:
+                    break
+                stuck &= needed
+            raise ValueError("dependency cycle among: " + ", ".join(sorted(stuck)))
+        for n in ready:
+            level[n] = 1 + max((level[d] for d in deps[n]), default=-1)
+            del remaining[n]
+    out = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for n, lv in level.items():
+        out[lv].append(n)
+    return [sorted(w, key=order.get) for w in out]
+
+def plan(manifest, extra=None, implicit=True):
+    """(waves, deps, problems) for a manifest document."""
+    apps = manifest["apps"]
+    problems = check_ports(apps)
+    names = [a["app"] for a in apps]
+    problems += [f"app {n!r} is listed more than once" for n in sorted(set(names)) if names.count(n) > 1]
+    problems += [f"{a['app']}: unknown status {a.get('status')!r}" for a in apps if a.get("status") not in STATUSES]
+    deps, graph_problems = dependency_graph(apps, extra, implicit)
+    problems += graph_problems
+    try:
+        ws = waves(deps, {a["app"]: a.get("order", 0) for a in apps})
+    except ValueError as e:
+        problems.append(str(e))
+        ws = []
+    return ws, deps, problems
+
+# ---------- rollout ----------
+
+class Rollout:
+    def __init__(self, path, manifest, deps, deploy_cmd, host="127.0.0.1", concurrency=4,
+                 deploy_timeout=600.0, health_timeout=120.0, healthy_checks=2, interval=1.0,
+                 log_dir="rollout-logs", keep_going=False, force=False):
+        self.path, self.manifest, self.deps = path, manifest, deps
+        self.apps = {a["app"]: a for a in manifest["apps"]}
+        self.deploy_cmd, self.host = deploy_cmd, host
+        self.sem = asyncio.Semaphore(concurrency)
+        self.deploy_timeout, self.health_timeout = deploy_timeout, health_timeout
+        self.healthy_checks, self.interval = healthy_checks, interval
+        self.log_dir = pathlib.Path(log_dir)
+        self.keep_going, self.force = keep_going, force
+        self.pool = Pool()
+        self.timings = {}
+
+    def set_status(self, name, status, error=None):
+        a = self.apps[name]
+        a["status"] = status
+        a["status_at"] = _now()
+        if error:
+            a["error"] = error
+        else:
+            a.pop("error", None)
+        save_manifest(self.path, self.manifest)
+        icon = {"live": "✅", "failed": "❌"}.get(status, "♻️")
+        print(f"{icon} {name}: {status}" + (f" ({error})" if error else ""), flush=True)
+
+    async def deploy(self, name):
+        a = self.apps[name]
+        fields = {k: v for k, v in a.items() if isinstance(v, (str, int))}
+        cmd = self.deploy_cmd.format(**fields)
+        env = dict(os.environ, APP=name, API_PORT=str(a["api_port"]), DASHBOARD=str(a["dashboard"]))
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.log_dir / f"{name}.log", "ab") as log:
+            log.write(f"[{_now()}] $ {cmd}\n".encode("utf-8"))
+            log.flush()
+            proc = await asyncio.create_subprocess_shell(cmd, stdout=log, stderr=log, env=env)
+            try:
+                code = await asyncio.wait_for(proc.wait(), self.deploy_timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return f"deploy timed out after {self.deploy_timeout:g}s"
+        return None if code == 0 else f"deploy exited {code}, see {self.log_dir / (name + '.log')}"
+
+    async def healthy(self, name):
+        """Poll /healthz.json until `healthy_checks` consecutive "up" probes or the timeout."""
+        t = Target(name, f"http://{self.host}:{self.apps[name]['api_port']}/healthz.json")
+        deadline = time.monotonic() + self.health_timeout
+        streak = 0
+        while True:
+            await probe(self.pool, t, min(5.0, self.health_timeout))
+            streak = streak + 1 if t.state["status"] == "up" else 0
+            if streak >= self.healthy_checks:
+                return None
+            if time.monotonic() >= deadline:
+                s = t.state
+                return f"healthz not up after {self.health_timeout:g}s (last: {s['status']}, {s['error'] or s['code']})"
+            await asyncio.sleep(self.interval)
+
+    async def roll(self, name):
+        async with self.sem:
+            start = time.monotonic()
+            self.set_status(name, "deploying")
+            error = await self.deploy(name)
+            if error is None:
+                self.set_status(name, "verifying")
+                error = await self.healthy(name)
+            self.timings[name] = time.monotonic() - start
+            self.set_status(name, "failed" if error else "live", error)
+            return error is None
+
+    async def run(self, plan_waves):
+        """Deploy wave by wave; returns True when every app ends up live."""
+        started = time.monotonic()
+        try:
+            for i, wave in enumerate(plan_waves, 1):
+                todo, skipped = [], []
+                for n in wave:
+                    if not self.force and self.apps[n]["status"] == "live":
+                        continue
+                    if any(self.apps[d]["status"] != "live" for d in self.deps[n]):
+                        skipped.append(n)
+                    else:
+                        todo.append(n)
+                if skipped:
+                    print(f"⏭  wave {i}: skipping {', '.join(skipped)} (dependency not live)", flush=True)
+                if not todo:
+                    continue
+                print(f"📦 wave {i}/{len(plan_waves)}: {', '.join(todo)}", flush=True)
+                t = time.monotonic()
+                results = await asyncio.gather(*(self.roll(n) for n in todo))
+                print(f"   wave {i} done in {time.monotonic() - t:.1f}s", flush=True)
+                if not all(results) and not self.keep_going:
+                    print("❌ stopping: a wave failed (use --keep-going to continue with independent apps)")
+                    break
+        finally:
+            self.pool.close()
+        total = time.monotonic() - started
+        serial = sum(self.timings.values())
+        if self.timings:
+            print(f"🧹 {len(self.timings)} app(s) in {total:.1f}s; one after another would take ~{serial:.1f}s")
+        return all(a["status"] == "live" for a in self.apps.values())
+
+# ---------- CLI ----------
+
+def print_plan(ws, deps, apps):
+    for i, wave in enumerate(ws, 1):
+        print(f"wave {i}:")
+        for n in wave:
+            a = apps[n]
+            after = f"  after {', '.join(sorted(deps[n]))}" if deps[n] else ""
+            print(f"  {n:<24} api {a['api_port']:<6} dash {str(a['dashboard']):<7} {a['status']:<10}{after}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Wave-parallel staged rollout of the Umbrella-1 apps.")
+    ap.add_argument("--manifest", default=str(MANIFEST), help="Umbrella manifest, updated in place (default: %(default)s)")
+    ap.add_argument("--deps", help='explicit dependencies: JSON file of {"app": ["dep", ...]}')
+    ap.add_argument("--no-implicit", dest="implicit", action="store_false",
+                    help="don't make \"master\"-dashboard apps wait for the master dashboard app")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("plan", help="validate the manifest and print the waves")
+    r = sub.add_parser("run", help="deploy wave by wave, gated on /healthz.json")
+    r.add_argument("--deploy-cmd", required=True,
+                   help="shell command per app; {app}, {api_port}, {dashboard}, {order} are substituted "
+                        "and APP/API_PORT/DASHBOARD are set in its environment")
+    r.add_argument("--concurrency", type=int, default=4, help="apps deploying at once (default: 4)")
+    r.add_argument("--host", default="127.0.0.1", help="host serving the api_ports (default: %(default)s)")
+    r.add_argument("--deploy-timeout", type=float, default=600.0, help="seconds per deploy command (default: 600)")
+    r.add_argument("--health-timeout", type=float, default=120.0, help="seconds for /healthz.json to come up (default: 120)")
+    r.add_argument("--healthy-checks", type=int, default=2, help="consecutive up probes required (default: 2)")
+    r.add_argument("--interval", type=float, default=1.0, help="seconds between health probes (default: 1)")
+    r.add_argument("--log-dir", default="rollout-logs", help="per-app deploy logs (default: %(default)s)")
+    r.add_argument("--keep-going", action="store_true", help="after a failure, keep deploying apps that don't depend on it")
+    r.add_argument("--force", action="store_true", help="redeploy apps that are already live")
+    args = ap.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+    extra = json.loads(pathlib.Path(args.deps).read_text(encoding="utf-8")) if args.deps else None
+    ws, deps, problems = plan(manifest, extra, args.implicit)
+    for p in problems:
+        print(f"❌ {p}")
+    if problems:
+        return 1
+    apps = {a["app"]: a for a in manifest["apps"]}
+    if args.cmd == "plan":
+        print_plan(ws, deps, apps)
+        print(f"✅ {len(apps)} apps in {len(ws)} wave(s)")
+        return 0
+    rollout = Rollout(args.manifest, manifest, deps, args.deploy_cmd, args.host, args.concurrency,
+                      args.deploy_timeout, args.health_timeout, args.healthy_checks, args.interval,
+                      args.log_dir, args.keep_going, args.force)
+    try:
+        ok = asyncio.run(rollout.run(ws))
+    except KeyboardInterrupt:
+        return 130
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())